@@ -1,4 +1,5 @@
 from flask import Flask
+from werkzeug.middleware.proxy_fix import ProxyFix
 from modules.league.routes import league_bp
 from modules.user.routes import user_bp
 from modules.tournament.routes import tournament_bp
@@ -8,17 +9,38 @@ from modules.management.routes import management_bp
 from modules.admin.routes import health_bp
 from modules.league_picks.routes import league_picks_bp
 from modules.live_tournament.routes import live_tournament_bp
+from modules.images.routes import images_bp
 
 from utils.db_connector import db, init_db
+from utils.query_stats import init_query_stats
+from utils.metrics import init_metrics
+from utils.profiler import init_profiler
+from utils.log import configure_logging
 
-# from apscheduler.schedulers.background import BackgroundScheduler
-# from jobs.scheduler import update_database
+import logging
+import os
 
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
 
-def create_app():
+
+def create_app(config: dict = None):
+    """
+    Create the Flask app.
+
+    Args:
+        config (dict): Optional config overrides. The database is SQLALCHEMY_DATABASE_URI
+            if set here, else DATABASE_URL, else Cloud SQL (see utils.db_connector.init_db)
+    """
+    configure_logging()
     app = Flask(__name__)
+    # Cloud Run terminates TLS in front of the container; trust its X-Forwarded-Proto
+    # so request.is_secure (and the Secure cookie flag) reflect the client's scheme
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1)
+    if config:
+        app.config.update(config)
+
     init_db(app)
     
     app.register_blueprint(league_bp, url_prefix="/league")
@@ -38,6 +60,12 @@ def create_app():
     app.register_blueprint(league_picks_bp, url_prefix="/league_picks")
     
     app.register_blueprint(live_tournament_bp, url_prefix="/live_results")
+
+    app.register_blueprint(images_bp, url_prefix="/images")
+
+    init_query_stats(app)
+    init_metrics(app)
+    init_profiler(app)
     
     #   TODO: create a rate limiter for each user to prevent DDOS attacks, overuse, etc.
 
@@ -47,16 +75,40 @@ def create_app():
     
     return app
     
-def start_scheduler():
-    pass
-    # scheduler = BackgroundScheduler()
-    # scheduler.add_job(func=update_database, trigger="interval", seconds=3600)
-    # scheduler.start()
-    
+def start_scheduler(app):
+    """
+    Start the background jobs in this process if JOBS_SCHEDULER is set.
+
+    Every worker that calls this runs its own scheduler. The jobs go through
+    jobs.job_runner.run_job, whose lease in the job_lock table lets only one
+    worker or instance run each job, so it is safe to enable everywhere.
+
+    Args:
+        app: Flask app the jobs run in
+
+    Returns:
+        BackgroundScheduler or None if disabled
+    """
+    if os.getenv('JOBS_SCHEDULER', '0') != '1':
+        return None
+
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from jobs.scheduler import schedule_updates
+    from data_aggregator.manager import schedule_all_jobs
+
+    scheduler = BackgroundScheduler(timezone='UTC')
+    scheduler.start()
+    schedule_updates(scheduler, app)
+    schedule_all_jobs(scheduler, app)
+    logger.info("Started the job scheduler")
+    return scheduler
+
 
 load_dotenv()
-app = create_app()
-start_scheduler()
 
 if __name__ == "__main__":
+    # The WSGI entry point is run:app; building the app here at import time
+    # would build it twice on every start
+    app = create_app()
+    start_scheduler(app)
     app.run()
@@ -0,0 +1,186 @@
+"""
+Measurement helpers for the benchmark suite.
+
+Each scenario is a callable run repeatedly inside the app context. The harness
+records wall time per call, the number of SQL statements per call (counted with
+a cursor-execute listener on the engine), and the Python memory allocated by a
+call (a separate tracemalloc pass, so tracing overhead doesn't skew timings).
+"""
+
+import contextlib
+import io
+import math
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """
+    Counts SQL statements executed on an engine while active.
+
+    Args:
+        engine: SQLAlchemy engine to listen on
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+        return False
+
+
+@dataclass
+class ScenarioResult:
+    """Timings and counters for one scenario."""
+    name: str
+    kind: str
+    iterations: int = 0
+    timings_ms: list = field(default_factory=list)
+    queries: list = field(default_factory=list)
+    status_codes: dict = field(default_factory=dict)
+    cold_ms: float = None
+    alloc_peak_kib: float = None
+    alloc_net_kib: float = None
+
+    def summary(self) -> dict:
+        timings = sorted(self.timings_ms)
+        return {
+            'kind': self.kind,
+            'iterations': self.iterations,
+            'cold_ms': _round(self.cold_ms),
+            'p50_ms': _round(percentile(timings, 50)),
+            'p95_ms': _round(percentile(timings, 95)),
+            'mean_ms': _round(statistics.fmean(timings)) if timings else None,
+            'max_ms': _round(timings[-1]) if timings else None,
+            'queries_per_call': _round(statistics.fmean(self.queries)) if self.queries else None,
+            'queries_max': max(self.queries) if self.queries else None,
+            'alloc_peak_kib': _round(self.alloc_peak_kib),
+            'alloc_net_kib': _round(self.alloc_net_kib),
+            'status_codes': self.status_codes,
+        }
+
+
+def _round(value, digits: int = 3):
+    return round(value, digits) if value is not None else None
+
+
+def percentile(sorted_values: list, pct: float):
+    """
+    Nearest-rank percentile of an already sorted list.
+
+    Args:
+        sorted_values (list): Values in ascending order
+        pct (float): Percentile between 0 and 100
+
+    Returns:
+        float: The percentile, or None for an empty list
+    """
+    if not sorted_values:
+        return None
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+@contextlib.contextmanager
+def quiet(enabled: bool = True):
+    """Swallow stdout from the code under test (the jobs print per row)."""
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def run_scenario(name: str, kind: str, call, engine, iterations: int, warmup: int = 1,
+                 trace_allocations: bool = True, silence: bool = True) -> ScenarioResult:
+    """
+    Run a scenario and collect its timings, query counts and allocations.
+
+    Args:
+        name (str): Scenario name used in the report
+        kind (str): 'endpoint' or 'job'
+        call (callable): Takes the iteration number, returns an HTTP status code or None
+        engine: SQLAlchemy engine the scenario queries
+        iterations (int): Timed iterations
+        warmup (int): Untimed iterations after the first (cold) call
+        trace_allocations (bool): If True, run one extra call under tracemalloc
+        silence (bool): If True, discard stdout of the code under test
+
+    Returns:
+        ScenarioResult: Collected measurements
+    """
+    result = ScenarioResult(name=name, kind=kind)
+    counter = QueryCounter(engine)
+
+    with quiet(silence):
+        started = time.perf_counter()
+        call(0)
+        result.cold_ms = (time.perf_counter() - started) * 1000
+
+        for i in range(warmup):
+            call(1 + i)
+
+        for i in range(iterations):
+            with counter:
+                started = time.perf_counter()
+                status = call(1 + warmup + i)
+                elapsed = time.perf_counter() - started
+            result.timings_ms.append(elapsed * 1000)
+            result.queries.append(counter.count)
+            key = str(status) if status is not None else 'ok'
+            result.status_codes[key] = result.status_codes.get(key, 0) + 1
+            result.iterations += 1
+
+        if trace_allocations:
+            tracemalloc.start()
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            call(1 + warmup + iterations)
+            after, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            result.alloc_peak_kib = (peak - before) / 1024
+            result.alloc_net_kib = (after - before) / 1024
+
+    return result
+
+
+def compare_reports(baseline: dict, current: dict, threshold: float) -> list:
+    """
+    Find scenarios that regressed against a baseline report.
+
+    Args:
+        baseline (dict): Earlier report produced by benchmarks.run
+        current (dict): Report of this run
+        threshold (float): Allowed relative increase, e.g. 0.2 for 20%
+
+    Returns:
+        list: (scenario, metric, baseline value, current value) for every regression
+    """
+    regressions = []
+    for name, now in current.get('results', {}).items():
+        before = baseline.get('results', {}).get(name)
+        if not before:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'queries_per_call', 'alloc_peak_kib'):
+            old, new = before.get(metric), now.get(metric)
+            if old is None or new is None:
+                continue
+            # Query counts are exact, any increase is a regression
+            limit = old if metric == 'queries_per_call' else old * (1 + threshold)
+            if new > limit:
+                regressions.append((name, metric, old, new))
+    return regressions
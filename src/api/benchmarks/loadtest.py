@@ -0,0 +1,276 @@
+"""
+Load test comparing gunicorn worker models.
+
+Seeds a SQLite file database, starts gunicorn with gunicorn.conf.py once per
+worker model (sync, gthread, gevent) on the same number of worker processes,
+drives a mix of endpoints with concurrent closed-loop clients and reports
+throughput and latency for each. Statement and provider latency are simulated,
+so the I/O waits of Cloud SQL and DataGolf show up even though everything runs
+locally. The results compare throughput per container between worker models.
+
+Usage (from src/api):
+    python -m benchmarks.loadtest
+    python -m benchmarks.loadtest --models sync gthread gevent --workers 1 --concurrency 32 --duration 30
+    python -m benchmarks.loadtest --url http://127.0.0.1:8080 --league-id 7 --tokens <id token> ...  # running server
+
+gevent must be installed to load-test it.
+"""
+
+import argparse
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+from benchmarks.harness import percentile
+from benchmarks.seed import SeedConfig, seed_database, write_leaderboard_fixtures, write_live_fixtures
+
+API_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Settings per worker model. 'sync' is one request at a time per process, the
+# setup gunicorn.conf.py shipped with before the worker model became configurable.
+MODELS = {
+    'sync': {'GUNICORN_WORKER_CLASS': 'sync', 'GUNICORN_THREADS': '1'},
+    'gthread': {'GUNICORN_WORKER_CLASS': 'gthread'},
+    'gevent': {'GUNICORN_WORKER_CLASS': 'gevent'},
+}
+
+# (weight, path template) of the request mix. {league_id} and {member_id} are
+# filled per request with the ids of the authenticated member
+MIX = (
+    (4, '/league/scoreboard/{league_id}'),
+    (3, '/league_picks/{league_id}'),
+    (2, '/user/history/{league_id}'),
+    (2, '/tournament/dd/{member_id}?tournament_id={tournament_id}'),
+    (1, '/live_results/big_fetch'),
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--models', nargs='+', default=['sync', 'gthread'], choices=list(MODELS))
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes (per container)')
+    parser.add_argument('--threads', type=int, default=8, help='Threads per gthread worker')
+    parser.add_argument('--worker-connections', type=int, default=100, help='Connections per gevent worker')
+    parser.add_argument('--concurrency', type=int, default=32, help='Concurrent clients')
+    parser.add_argument('--duration', type=float, default=20, help='Seconds of load per model')
+    parser.add_argument('--warmup', type=float, default=3, help='Seconds of unmeasured load per model')
+    parser.add_argument('--db-latency-ms', type=float, default=2, help='Simulated latency per SQL statement')
+    parser.add_argument('--provider-latency-ms', type=float, default=150, help='Simulated DataGolf latency')
+    parser.add_argument('--members', type=int, default=30, help='Members per league')
+    parser.add_argument('--golfers', type=int, default=300)
+    parser.add_argument('--url', help='Load-test an already running server instead of starting gunicorn')
+    parser.add_argument('--tokens', nargs='*', help='Bearer tokens to use with --url')
+    parser.add_argument('--league-id', type=int, help='League to query with --url')
+    parser.add_argument('--output', help='Write the JSON report to this file (default: stdout)')
+    return parser.parse_args(argv)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def seed(args, database_path: str, fixtures_dir: str) -> dict:
+    """
+    Seed the SQLite file shared by all workers and write the provider fixtures.
+
+    Returns:
+        dict: Targets for the request mix
+    """
+    from app import create_app
+
+    config = SeedConfig(leagues=1, members_per_league=args.members, golfers=args.golfers,
+                        field_size=min(150, args.golfers))
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{database_path}"})
+    with app.app_context():
+        seeded = seed_database(config)
+    write_leaderboard_fixtures(seeded.leaderboards, fixtures_dir)
+    write_live_fixtures(fixtures_dir)
+    league_id = seeded.league_ids[0]
+    return {
+        'league_id': league_id,
+        'tournament_id': seeded.upcoming_tournament_id,
+        'members': [(member_id, firebase_id) for lid, member_id, firebase_id in seeded.members if lid == league_id],
+    }
+
+
+def start_server(model: str, port: int, args, env_extra: dict) -> subprocess.Popen:
+    env = dict(os.environ, **MODELS[model], **env_extra)
+    env.update({
+        'PORT': str(port),
+        'WEB_CONCURRENCY': str(args.workers),
+        'GUNICORN_WORKER_CONNECTIONS': str(args.worker_connections),
+        'GUNICORN_LOG_LEVEL': 'warning',
+        'LOG_LEVEL': 'WARNING',
+    })
+    if model == 'gthread':
+        env['GUNICORN_THREADS'] = str(args.threads)
+    command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--access-logfile', os.devnull,
+               'benchmarks.wsgi:app']
+    return subprocess.Popen(command, cwd=API_ROOT, env=env, stdout=subprocess.DEVNULL,
+                            start_new_session=True)
+
+
+def wait_until_ready(base_url: str, process: subprocess.Popen, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/health/", timeout=1).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("gunicorn did not become ready in time")
+
+
+def stop_server(process: subprocess.Popen):
+    if process.poll() is None:
+        os.killpg(process.pid, signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+
+
+def run_load(base_url: str, targets: dict, concurrency: int, duration: float, warmup: float) -> dict:
+    """
+    Drive the request mix with closed-loop clients (each sends its next request
+    as soon as the previous one completes).
+
+    Args:
+        base_url (str): Server to load
+        targets (dict): League, tournament and (member id, token) pairs to request
+        concurrency (int): Number of clients
+        duration (float): Measured seconds
+        warmup (float): Unmeasured seconds before measuring
+
+    Returns:
+        dict: Throughput, latency percentiles and status counts
+    """
+    # Without seeded ids (--url) only the league-level endpoints can be requested
+    mix = [item for item in MIX if targets['tournament_id'] is not None or '{member_id}' not in item[1]]
+    weights = [weight for weight, _ in mix]
+    templates = [template for _, template in mix]
+    started = time.monotonic()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+    lock = threading.Lock()
+    latencies = []
+    statuses = {}
+
+    def client(index):
+        rng = random.Random(index)
+        session = requests.Session()
+        member_id, token = targets['members'][index % len(targets['members'])]
+        headers = {'Authorization': f"Bearer {token}"}
+        local_latencies, local_statuses = [], {}
+        while True:
+            now = time.monotonic()
+            if now >= stop_at:
+                break
+            path = rng.choices(templates, weights)[0].format(
+                league_id=targets['league_id'], member_id=member_id, tournament_id=targets['tournament_id'])
+            try:
+                status = session.get(base_url + path, headers=headers, timeout=60).status_code
+            except requests.RequestException as e:
+                status = type(e).__name__
+            finished = time.monotonic()
+            if now >= measure_from:
+                local_latencies.append((finished - now) * 1000)
+                local_statuses[str(status)] = local_statuses.get(str(status), 0) + 1
+        with lock:
+            latencies.extend(local_latencies)
+            for key, count in local_statuses.items():
+                statuses[key] = statuses.get(key, 0) + count
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    ok = sum(count for status, count in statuses.items() if status.startswith('2'))
+    return {
+        'requests': len(latencies),
+        'throughput_rps': round(len(latencies) / duration, 2),
+        'ok_rps': round(ok / duration, 2),
+        'p50_ms': round(percentile(latencies, 50), 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 95), 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 99), 2) if latencies else None,
+        'status_codes': statuses,
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = {'config': vars(args), 'mix': [list(item) for item in MIX], 'results': {}}
+
+    if args.url:
+        if not args.tokens or args.league_id is None:
+            print("--url needs --tokens and --league-id", file=sys.stderr)
+            return 2
+        targets = {'league_id': args.league_id, 'tournament_id': None,
+                   'members': [(None, token) for token in args.tokens]}
+        report['results']['server'] = run_load(args.url.rstrip('/'), targets, args.concurrency,
+                                               args.duration, args.warmup)
+    else:
+        workdir = tempfile.mkdtemp(prefix='loadtest-')
+        database_path = os.path.join(workdir, 'bench.db')
+        fixtures_dir = os.path.join(workdir, 'fixtures')
+        # Set before the provider client is imported by seeding
+        os.environ.update({'PROVIDER_FIXTURES_DIR': fixtures_dir, 'PROVIDER_RATE_LIMIT': '0'})
+        print("Seeding...", file=sys.stderr)
+        targets = seed(args, database_path, fixtures_dir)
+
+        env_extra = {
+            'DATABASE_URL': f"sqlite:///{database_path}",
+            'LOADTEST_DB_LATENCY_MS': str(args.db_latency_ms),
+            'PROVIDER_FIXTURE_LATENCY_MS': str(args.provider_latency_ms),
+            'METRICS_DIR': os.path.join(workdir, 'metrics'),
+        }
+        for model in args.models:
+            # Every model starts with a cold live cache
+            env_extra['LIVE_CACHE_PATH'] = os.path.join(workdir, f"live-cache-{model}.json")
+            port = free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            print(f"Load testing {model} ({args.workers} workers, {args.concurrency} clients, "
+                  f"{args.duration:g}s)...", file=sys.stderr)
+            process = start_server(model, port, args, env_extra)
+            try:
+                wait_until_ready(base_url, process)
+                report['results'][model] = run_load(base_url, targets, args.concurrency, args.duration, args.warmup)
+            finally:
+                stop_server(process)
+
+        baseline = report['results'].get(args.models[0], {}).get('ok_rps')
+        for model, result in report['results'].items():
+            if baseline:
+                result['ok_rps_vs_' + args.models[0]] = round(result['ok_rps'] / baseline, 2)
+            print(f"{model:<8} {result['ok_rps']:>8.1f} ok req/s  p50 {result['p50_ms']} ms  "
+                  f"p95 {result['p95_ms']} ms  {result['status_codes']}", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
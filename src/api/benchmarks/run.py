@@ -0,0 +1,196 @@
+"""
+End-to-end benchmark suite for the API endpoints and jobs.
+
+Seeds a synthetic database (SQLite in memory by default, or any SQLAlchemy URL
+such as a local MySQL container, from --database-url or DATABASE_URL), drives
+the Flask test client against the hot endpoints and times the scoring and
+results ingestion jobs. Provider calls are served from
+generated fixtures, so no network access is needed.
+
+Usage (from src/api):
+    python -m benchmarks.run
+    python -m benchmarks.run --members 100 --golfers 1000 --iterations 100 --output bench.json
+    python -m benchmarks.run --database-url mysql+pymysql://root:pw@127.0.0.1/bench
+    python -m benchmarks.run --compare bench.json  # exit 1 if p50/p95/queries/allocations regressed
+
+Authentication is bypassed: the bearer token is taken as the Firebase uid.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from unittest import mock
+
+from benchmarks.harness import compare_reports, run_scenario
+from benchmarks.seed import SeedConfig, seed_database, write_leaderboard_fixtures
+
+ENDPOINTS = ('league_scoreboard', 'user_history', 'league_picks', 'tournament_dd', 'pick_submit')
+JOBS = ('calculate_tournament_scores', 'update_tournament_entries_and_results')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default=os.getenv('DATABASE_URL', 'sqlite://'),
+                        help='SQLAlchemy URL of an empty database (default: DATABASE_URL, else in-memory SQLite)')
+    parser.add_argument('--leagues', type=int, default=SeedConfig.leagues)
+    parser.add_argument('--members', type=int, default=SeedConfig.members_per_league, help='Members per league')
+    parser.add_argument('--seasons', type=int, default=SeedConfig.seasons)
+    parser.add_argument('--tournaments', type=int, default=SeedConfig.tournaments_per_season, help='Tournaments per season')
+    parser.add_argument('--golfers', type=int, default=SeedConfig.golfers)
+    parser.add_argument('--field-size', type=int, default=SeedConfig.field_size)
+    parser.add_argument('--seed', type=int, default=SeedConfig.seed)
+    parser.add_argument('--iterations', type=int, default=50, help='Timed iterations per endpoint')
+    parser.add_argument('--job-iterations', type=int, default=5, help='Timed iterations per job')
+    parser.add_argument('--only', nargs='*', choices=ENDPOINTS + JOBS, help='Run only these scenarios')
+    parser.add_argument('--no-alloc', action='store_true', help='Skip the tracemalloc pass')
+    parser.add_argument('--verbose', action='store_true', help="Don't silence output of the code under test")
+    parser.add_argument('--output', help='Write the JSON report to this file (default: stdout)')
+    parser.add_argument('--compare', help='Baseline JSON report to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed relative slowdown when comparing')
+    return parser.parse_args(argv)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_scenarios(app, seeded):
+    """
+    Create the scenario callables.
+
+    Args:
+        app: Flask app under test
+        seeded (SeedResult): Ids of the seeded data
+
+    Returns:
+        dict: Scenario name -> (kind, callable taking the iteration number)
+    """
+    from jobs.calculate_points.calculate_points import update_tournament_entries_and_results
+    from jobs.calculate_week_scores.calculate_week_scores import calculate_tournament_scores
+
+    client = app.test_client()
+    league_id = seeded.league_ids[0]
+    members = [member for member in seeded.members if member[0] == league_id]
+
+    def auth(i):
+        _, league_member_id, firebase_id = members[i % len(members)]
+        return league_member_id, {'Authorization': f"Bearer {firebase_id}"}
+
+    def get(path_for):
+        def call(i):
+            league_member_id, headers = auth(i)
+            return client.get(path_for(league_member_id), headers=headers).status_code
+        return call
+
+    def submit_pick(i):
+        league_member_id, headers = auth(i)
+        golfer_id = seeded.upcoming_field[i % len(seeded.upcoming_field)]
+        return client.post('/pick/submit', headers=headers, json={
+            'league_member_id': league_member_id,
+            'tournament_id': seeded.upcoming_tournament_id,
+            'golfer_id': golfer_id,
+        }).status_code
+
+    past = seeded.past_tournament_ids
+
+    def score_tournament(i):
+        calculate_tournament_scores(past[-1 - i % len(past)], league_id)
+
+    def ingest_results(i):
+        update_tournament_entries_and_results(past[-1 - i % len(past)], force=True)
+
+    return {
+        'league_scoreboard': ('endpoint', get(lambda _: f"/league/scoreboard/{league_id}")),
+        'user_history': ('endpoint', get(lambda _: f"/user/history/{league_id}")),
+        'league_picks': ('endpoint', get(lambda _: f"/league_picks/{league_id}")),
+        'tournament_dd': ('endpoint', get(
+            lambda member_id: f"/tournament/dd/{member_id}?tournament_id={seeded.upcoming_tournament_id}"
+        )),
+        'pick_submit': ('endpoint', submit_pick),
+        'calculate_tournament_scores': ('job', score_tournament),
+        'update_tournament_entries_and_results': ('job', ingest_results),
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = SeedConfig(
+        leagues=args.leagues,
+        members_per_league=args.members,
+        seasons=args.seasons,
+        tournaments_per_season=args.tournaments,
+        golfers=args.golfers,
+        field_size=args.field_size,
+        seed=args.seed,
+    )
+
+    # Provider calls are replayed from fixtures written after seeding. Must be set
+    # before the provider client is imported.
+    fixtures_dir = tempfile.mkdtemp(prefix='bench-fixtures-')
+    os.environ['PROVIDER_FIXTURES_DIR'] = fixtures_dir
+    os.environ['PROVIDER_RATE_LIMIT'] = '0'
+
+    from app import create_app
+    from modules.authentication import auth
+    from utils.db_connector import db
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': args.database_url, 'TESTING': True})
+
+    with app.app_context(), mock.patch.object(auth, 'verify_id_token', lambda token: token):
+        seeded = seed_database(config)
+        write_leaderboard_fixtures(seeded.leaderboards, fixtures_dir)
+
+        scenarios = build_scenarios(app, seeded)
+        selected = args.only or list(scenarios)
+        results = {}
+        for name in selected:
+            kind, call = scenarios[name]
+            iterations = args.iterations if kind == 'endpoint' else args.job_iterations
+            print(f"Running {name} ({iterations} iterations)...", file=sys.stderr)
+            results[name] = run_scenario(
+                name, kind, call, db.engine, iterations,
+                trace_allocations=not args.no_alloc, silence=not args.verbose,
+            ).summary()
+
+        report = {
+            'meta': {
+                'timestamp_utc': datetime.utcnow().isoformat(),
+                'git_commit': git_commit(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'database': db.engine.dialect.name,
+                'config': config.to_dict(),
+                'rows': seeded.rows,
+            },
+            'results': results,
+        }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_reports(baseline, report, args.threshold)
+        for name, metric, old, new in regressions:
+            print(f"REGRESSION {name} {metric}: {old} -> {new}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regressions against baseline", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
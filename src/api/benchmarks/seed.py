@@ -0,0 +1,418 @@
+"""
+Synthetic data for the benchmark harness.
+
+Builds a league database of configurable size: golfers, one schedule per season,
+weekly tournaments with fields and results, leagues with members, a pick per
+member per week and the league scores for every finished tournament. The
+current season is centred on today, so roughly half of its tournaments are in
+the past and the next one is open for picks.
+
+Rows are bulk inserted with explicit ids, so seeding a few hundred thousand
+rows takes seconds on SQLite.
+"""
+
+import json
+import os
+import random
+from dataclasses import dataclass, asdict
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import insert
+
+from models import (
+    Golfer, League, LeagueMember, LeagueMemberTournamentScore, Pick, Role, Schedule,
+    ScheduleTournament, Tournament, TournamentGolfer, TournamentGolferResult, User
+)
+from utils.db_connector import db
+
+FIRST_NAMES = [
+    'Scottie', 'Rory', 'Xander', 'Ludvig', 'Collin', 'Patrick', 'Viktor', 'Wyndham',
+    'Tommy', 'Hideki', 'Jordan', 'Max', 'Sam', 'Tony', 'Russell', 'Sahith', 'Keegan',
+    'Shane', 'Matt', 'Justin', 'Cameron', 'Brian', 'Sungjae', 'Tom', 'Jason',
+]
+LAST_NAMES = [
+    'Scheffler', 'McIlroy', 'Schauffele', 'Åberg', 'Morikawa', 'Cantlay', 'Hovland',
+    'Clark', 'Fleetwood', 'Matsuyama', 'Spieth', 'Homa', 'Burns', 'Finau', 'Henley',
+    'Theegala', 'Bradley', 'Lowry', 'Fitzpatrick', 'Thomas', 'Young', 'Harman', 'Im',
+    'Kim', 'Day', 'Højgaard', 'Straka', 'Pavon', 'Bhatia', 'Hoge',
+]
+
+MEMBER_ROLE_ID = 3
+CUT_RATE = 0.35  # Share of each field that misses the cut
+WD_RATE = 0.02
+
+
+@dataclass
+class SeedConfig:
+    """
+    Size of the synthetic database.
+
+    Attributes:
+        leagues (int): Number of leagues, all on the current season's schedule
+        members_per_league (int): League members (each a separate user)
+        seasons (int): Seasons of history, the last one is the current season
+        tournaments_per_season (int): Weekly tournaments per season
+        golfers (int): Golfers in the database
+        field_size (int): Golfers entered in each tournament
+        pick_rate (float): Chance that a member picked in a finished week
+        seed (int): Random seed, so runs with the same config get the same data
+    """
+    leagues: int = 2
+    members_per_league: int = 30
+    seasons: int = 1
+    tournaments_per_season: int = 40
+    golfers: int = 500
+    field_size: int = 150
+    pick_rate: float = 0.95
+    seed: int = 42
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class SeedResult:
+    """
+    Ids the benchmark scenarios need to drive the endpoints and jobs.
+
+    Attributes:
+        league_ids (list): Seeded league ids
+        members (list): (league_id, league_member_id, firebase_id) for every member
+        past_tournament_ids (list): Finished tournaments of the current season, oldest first
+        upcoming_tournament_id (int): Next tournament of the current season, open for picks
+        upcoming_field (list): Golfer ids entered in the upcoming tournament
+        leaderboards (dict): SportContent API id -> leaderboard JSON for finished tournaments
+        rows (dict): Number of rows inserted per table
+    """
+    league_ids: list
+    members: list
+    past_tournament_ids: list
+    upcoming_tournament_id: int
+    upcoming_field: list
+    leaderboards: dict
+    rows: dict
+
+
+def _bulk(model, rows: list, counts: dict, chunk: int = 5000):
+    for start in range(0, len(rows), chunk):
+        db.session.execute(insert(model), rows[start:start + chunk])
+    counts[model.__tablename__] = counts.get(model.__tablename__, 0) + len(rows)
+
+
+def _finishing_order(rng: random.Random, field: list) -> list:
+    """Leaderboard rows for a field: (golfer_id, position, status, score_to_par), best first."""
+    order = field[:]
+    rng.shuffle(order)
+    made_cut = len(order) - int(len(order) * CUT_RATE)
+    rows = []
+    score = -20
+    for i, golfer_id in enumerate(order):
+        if i < made_cut:
+            if i == 0 or rng.random() > 0.3:
+                score += rng.randint(0, 1)
+                position = i + 1
+            else:
+                position = rows[-1][1]  # Tied with the player ahead
+            status = 'wd' if rng.random() < WD_RATE else 'complete'
+            rows.append((golfer_id, position, status, score))
+        else:
+            rows.append((golfer_id, None, 'cut', score + rng.randint(2, 8)))
+    return rows
+
+
+def _position_label(rows: list, index: int) -> str:
+    golfer_id, position, status, _ = rows[index]
+    if status == 'cut':
+        return 'CUT'
+    if status == 'wd':
+        return 'WD'
+    tied = sum(1 for row in rows if row[1] == position) > 1
+    return f"T{position}" if tied else str(position)
+
+
+def seed_database(config: SeedConfig) -> SeedResult:
+    """
+    Create the schema and fill it with synthetic data.
+
+    Args:
+        config (SeedConfig): Size of the database
+
+    Returns:
+        SeedResult: Ids and leaderboards for the benchmark scenarios
+    """
+    rng = random.Random(config.seed)
+    counts = {}
+    db.create_all()
+
+    db.session.execute(insert(Role), [{'id': MEMBER_ROLE_ID, 'name': 'member'}])
+
+    golfers = []
+    for i in range(config.golfers):
+        first_name = FIRST_NAMES[i % len(FIRST_NAMES)]
+        last_name = LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        if i >= len(FIRST_NAMES) * len(LAST_NAMES):
+            last_name = f"{last_name}-{i}"
+        golfers.append({
+            'id': f"bg{i:06d}",
+            'sportcontent_api_id': 10000 + i,
+            'datagolf_id': 20000 + i,
+            'first_name': first_name,
+            'last_name': last_name,
+            'full_name': f"{first_name} {last_name}",
+        })
+    _bulk(Golfer, golfers, counts)
+    golfer_ids = [golfer['id'] for golfer in golfers]
+    golfers_by_id = {golfer['id']: golfer for golfer in golfers}
+
+    today = date.today()
+    current_year = today.year
+    first_year = current_year - config.seasons + 1
+    tournaments, schedules, schedule_tournaments = [], [], []
+    season_tournaments = {}
+    tournament_id = 0
+    for season, year in enumerate(range(first_year, current_year + 1), start=1):
+        schedules.append({'id': season, 'year': year, 'schedule_name': f"Benchmark {year}"})
+        if year == current_year:
+            first_start = today - timedelta(weeks=config.tournaments_per_season // 2, days=today.weekday() - 3)
+        else:
+            first_start = date(year, 1, 4)
+        season_tournaments[year] = []
+        for week in range(1, config.tournaments_per_season + 1):
+            tournament_id += 1
+            start_date = first_start + timedelta(weeks=week - 1)
+            tournaments.append({
+                'id': tournament_id,
+                'sportcontent_api_id': 50000 + tournament_id,
+                'year': year,
+                'tournament_name': f"Benchmark Open {year} #{week}",
+                'start_date': start_date,
+                'end_date': start_date + timedelta(days=3),
+                'start_time': time(7, 0),
+                'time_zone': 'America/New_York',
+                'is_major': week % 10 == 0,
+                'has_cut': True,
+            })
+            schedule_tournaments.append({
+                'id': tournament_id,
+                'schedule_id': season,
+                'tournament_id': tournament_id,
+                'week_number': week,
+                'allow_duplicate_picks': False,
+            })
+            season_tournaments[year].append(tournaments[-1])
+    _bulk(Schedule, schedules, counts)
+    _bulk(Tournament, tournaments, counts)
+    _bulk(ScheduleTournament, schedule_tournaments, counts)
+
+    # Fields and results. Finished tournaments get results, the next one only a field.
+    now = datetime.utcnow()
+    entries, results = [], []
+    leaderboards = {}
+    finishing = {}  # tournament id -> {golfer_id: (result id, position, status)}
+    past_ids, upcoming_id, upcoming_field = [], None, []
+    entry_id = result_id = 0
+    for tournament in tournaments:
+        is_past = tournament['start_date'] <= today
+        is_upcoming = not is_past and upcoming_id is None and tournament['year'] == current_year
+        if not (is_past or is_upcoming):
+            continue
+
+        field = rng.sample(golfer_ids, min(config.field_size, len(golfer_ids)))
+        entry_ids = {}
+        for golfer_id in field:
+            entry_id += 1
+            entry_ids[golfer_id] = entry_id
+            entries.append({
+                'id': entry_id,
+                'tournament_id': tournament['id'],
+                'golfer_id': golfer_id,
+                'year': tournament['year'],
+                'is_active': True,
+                'is_alternate': False,
+                'is_injured': False,
+                'timestamp_utc': now,
+                'is_most_recent': True,
+            })
+
+        if is_upcoming:
+            upcoming_id = tournament['id']
+            upcoming_field = field
+            continue
+
+        if tournament['year'] == current_year:
+            past_ids.append(tournament['id'])
+
+        order = _finishing_order(rng, field)
+        finishing[tournament['id']] = {}
+        leaderboard = []
+        for index, (golfer_id, position, status, score_to_par) in enumerate(order):
+            label = _position_label(order, index)
+            result_id += 1
+            results.append({
+                'id': result_id,
+                'tournament_golfer_id': entry_ids[golfer_id],
+                'result': label,
+                'status': status,
+                'score_to_par': score_to_par,
+            })
+            finishing[tournament['id']][golfer_id] = (result_id, position, status)
+            golfer = golfers_by_id[golfer_id]
+            leaderboard.append({
+                'player_id': golfer['sportcontent_api_id'],
+                'first_name': golfer['first_name'],
+                'last_name': golfer['last_name'],
+                'position': label,
+                'status': {'cut': 'missed cut', 'wd': 'withdrawn'}.get(status, 'complete'),
+                'total_to_par': score_to_par,
+            })
+        leaderboards[tournament['sportcontent_api_id']] = {'results': {'leaderboard': leaderboard}}
+    _bulk(TournamentGolfer, entries, counts)
+    _bulk(TournamentGolferResult, results, counts)
+
+    # Leagues, members, picks and scores
+    current_schedule_id = len(schedules)
+    leagues, users, members, picks, scores = [], [], [], [], []
+    member_refs = []
+    user_id = member_id = pick_id = score_id = 0
+    for league_id in range(1, config.leagues + 1):
+        leagues.append({'id': league_id, 'name': f"Benchmark League {league_id}", 'schedule_id': current_schedule_id})
+        for _ in range(config.members_per_league):
+            user_id += 1
+            member_id += 1
+            firebase_id = f"bench-user-{user_id}"
+            users.append({
+                'id': user_id,
+                'firebase_id': firebase_id,
+                'display_name': f"player{user_id}",
+                'first_name': rng.choice(FIRST_NAMES),
+                'last_name': rng.choice(LAST_NAMES),
+                'email': f"player{user_id}@example.com",
+            })
+            members.append({'id': member_id, 'league_id': league_id, 'user_id': user_id, 'role_id': MEMBER_ROLE_ID})
+            member_refs.append((league_id, member_id, firebase_id))
+
+            for year, season in season_tournaments.items():
+                used = set()  # Golfers already picked this season
+                for tournament in season:
+                    field_results = finishing.get(tournament['id'])
+                    if field_results is None:
+                        continue
+                    if rng.random() > config.pick_rate:
+                        if year == current_year:
+                            score_id += 1
+                            scores.append({
+                                'id': score_id, 'league_member_id': member_id, 'tournament_id': tournament['id'],
+                                'tournament_golfer_result_id': None, 'score': -1000,
+                                'is_no_pick': True, 'is_duplicate_pick': False,
+                            })
+                        continue
+
+                    choices = [golfer_id for golfer_id in field_results if golfer_id not in used] or list(field_results)
+                    golfer_id = rng.choice(choices)
+                    used.add(golfer_id)
+                    pick_id += 1
+                    picks.append({
+                        'id': pick_id,
+                        'league_member_id': member_id,
+                        'timestamp_utc': datetime.combine(tournament['start_date'], time(6, 0)) - timedelta(days=1),
+                        'golfer_id': golfer_id,
+                        'year': year,
+                        'tournament_id': tournament['id'],
+                        'is_most_recent': True,
+                    })
+                    if year == current_year:
+                        result_ref, position, status = field_results[golfer_id]
+                        points = max(5, 100 - 2 * position) if status == 'complete' else 0
+                        score_id += 1
+                        scores.append({
+                            'id': score_id, 'league_member_id': member_id, 'tournament_id': tournament['id'],
+                            'tournament_golfer_result_id': result_ref, 'score': points * 100,
+                            'is_no_pick': False, 'is_duplicate_pick': False,
+                        })
+    _bulk(League, leagues, counts)
+    _bulk(User, users, counts)
+    _bulk(LeagueMember, members, counts)
+    _bulk(Pick, picks, counts)
+    _bulk(LeagueMemberTournamentScore, scores, counts)
+    db.session.commit()
+
+    return SeedResult(
+        league_ids=[league['id'] for league in leagues],
+        members=member_refs,
+        past_tournament_ids=past_ids,
+        upcoming_tournament_id=upcoming_id,
+        upcoming_field=upcoming_field,
+        leaderboards=leaderboards,
+        rows=counts,
+    )
+
+
+def write_leaderboard_fixtures(leaderboards: dict, directory: str):
+    """
+    Save leaderboards as SportContent fixtures for the fixture transport.
+
+    Args:
+        leaderboards (dict): SportContent API id -> leaderboard JSON
+        directory (str): Fixture root (PROVIDER_FIXTURES_DIR)
+    """
+    folder = os.path.join(directory, 'sportcontent', 'leaderboard')
+    os.makedirs(folder, exist_ok=True)
+    for api_id, leaderboard in leaderboards.items():
+        with open(os.path.join(folder, f"{api_id}.json"), 'w') as f:
+            json.dump(leaderboard, f)
+
+
+def write_live_fixtures(directory: str, players: int = 150, seed: int = 42):
+    """
+    Save synthetic DataGolf live feeds (in-play predictions, live stats, hole
+    stats) as fixtures, so the live endpoints can be exercised offline.
+
+    Args:
+        directory (str): Fixture root (PROVIDER_FIXTURES_DIR)
+        players (int): Players in the live field
+        seed (int): Random seed
+    """
+    rng = random.Random(seed)
+    stats = ('sg_putt', 'sg_arg', 'sg_app', 'sg_ott', 'sg_t2g', 'sg_bs', 'sg_total',
+             'distance', 'accuracy', 'gir', 'prox_fw', 'prox_rgh', 'scrambling')
+    names = [f"{rng.choice(LAST_NAMES)}, {rng.choice(FIRST_NAMES)}" for _ in range(players)]
+    updated = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+
+    live_stats = [{
+        'dg_id': 10000 + i,
+        'player_name': name,
+        'position': f"T{i + 1}" if i < players * (1 - CUT_RATE) else 'CUT',
+        'thru': rng.randint(0, 18),
+        'round': rng.randint(-6, 4),
+        'total': rng.randint(-15, 8),
+        **{stat: round(rng.uniform(-2, 2), 3) for stat in stats},
+    } for i, name in enumerate(names)]
+    in_play = [{
+        'dg_id': 10000 + i,
+        'player_name': name,
+        'current_pos': f"T{i + 1}",
+        'win': round(rng.random() / 10, 4),
+        'top_5': round(rng.random() / 3, 4),
+        'top_10': round(rng.random() / 2, 4),
+        'make_cut': round(rng.random(), 4),
+    } for i, name in enumerate(names)]
+    holes = [{
+        'hole': hole,
+        'par': rng.choice((3, 4, 4, 5)),
+        'birdies': round(rng.uniform(0.05, 0.3), 3),
+        'pars': round(rng.uniform(0.5, 0.7), 3),
+        'bogeys': round(rng.uniform(0.05, 0.2), 3),
+    } for hole in range(1, 19)]
+
+    feeds = {
+        'live-tournament-stats.json': {'event_name': 'Benchmark Open', 'course_name': 'Benchmark National',
+                                       'last_updated': updated, 'live_stats': live_stats},
+        'in-play.json': {'info': {'event_name': 'Benchmark Open', 'last_update': updated}, 'data': in_play},
+        'live-hole-stats.json': {'event_name': 'Benchmark Open', 'last_update': updated,
+                                 'courses': [{'course_code': 'BN', 'rounds': [{'round_num': 1, 'holes': holes}]}]},
+    }
+    folder = os.path.join(directory, 'datagolf', 'preds')
+    os.makedirs(folder, exist_ok=True)
+    for name, payload in feeds.items():
+        with open(os.path.join(folder, name), 'w') as f:
+            json.dump(payload, f)
@@ -0,0 +1,165 @@
+"""
+Startup-time benchmark: what a cold start (a new Cloud Run instance or gunicorn
+worker) pays before it can answer.
+
+Each run starts a fresh interpreter that imports the app, builds it and serves
+its first requests, and reports:
+
+    import_ms            Importing the app module and everything it pulls in
+    create_app_ms        create_app(): blueprints, extensions, engine setup
+    first_request_ms     The first /health/ request, including any lazy initialization it triggers
+    first_db_request_ms  The first request that queries the database (SQLite by default)
+    total_ms             Interpreter start to first DB response
+
+With --importtime the slowest imports (cumulative, from python -X importtime) are
+listed too, to see which dependency a regression comes from.
+
+Usage (from src/api):
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --importtime --output startup.json
+    python -m benchmarks.startup --compare startup.json  # exit 1 if a median regressed
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+API_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the fresh interpreter. Flask, SQLAlchemy and the app are imported only
+# here, so their import cost is measured.
+CHILD = r'''
+import json, os, sys, time
+started = time.perf_counter()
+sys.path.insert(0, os.getcwd())
+import app as app_module
+imported = time.perf_counter()
+app = app_module.create_app()
+created = time.perf_counter()
+client = app.test_client()
+status = client.get('/health/').status_code
+first = time.perf_counter()
+from utils.db_connector import db
+with app.app_context():
+    db.create_all()
+db_status = client.get('/health/db-health').status_code
+first_db = time.perf_counter()
+print(json.dumps({
+    'interpreter_ms': (started - float(os.environ['STARTUP_T0'])) * 1000,
+    'import_ms': (imported - started) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_request_ms': (first - created) * 1000,
+    'first_db_request_ms': (first_db - first) * 1000,
+    'total_ms': (first_db - float(os.environ['STARTUP_T0'])) * 1000,
+    'status': [status, db_status],
+}))
+'''
+
+METRICS = ('import_ms', 'create_app_ms', 'first_request_ms', 'first_db_request_ms', 'total_ms')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='Cold starts to measure')
+    parser.add_argument('--database-url', default='sqlite://', help='Database the app is built against')
+    parser.add_argument('--importtime', action='store_true', help='List the slowest imports')
+    parser.add_argument('--top', type=int, default=15, help='Imports to list with --importtime')
+    parser.add_argument('--output', help='Write the JSON report to this file (default: stdout)')
+    parser.add_argument('--compare', help='Baseline JSON report to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed relative slowdown when comparing')
+    return parser.parse_args(argv)
+
+
+def child_env(database_url: str) -> dict:
+    env = dict(os.environ)
+    env.setdefault('FIREBASE_ADMIN_SDK_KEY', '{}')
+    env.update({
+        'DATABASE_URL': database_url,
+        'METRICS_ENABLED': '0',
+        'LOG_LEVEL': 'WARNING',
+    })
+    return env
+
+
+def cold_start(env: dict) -> dict:
+    env = dict(env, STARTUP_T0=repr(time.perf_counter()))
+    output = subprocess.run([sys.executable, '-c', CHILD], cwd=API_ROOT, env=env,
+                            capture_output=True, text=True)
+    if output.returncode != 0:
+        raise RuntimeError(f"Cold start failed:\n{output.stderr[-3000:]}")
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(env: dict, top: int) -> list:
+    """
+    Cumulative import time of each top-level package while importing the app.
+    A package's cost includes the packages it imports first, so the numbers overlap.
+
+    Returns:
+        list: (package, cumulative ms) of the slowest packages
+    """
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=API_ROOT,
+                            env=env, capture_output=True, text=True)
+    packages = {}
+    for line in output.stderr.splitlines():
+        if not line.startswith('import time:') or line.count('|') != 2:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        if not cumulative.strip().isdigit() or '.' in name or name == 'app':
+            continue  # Header, submodule or the app module itself
+        packages[name] = max(packages.get(name, 0), int(cumulative) / 1000)
+    return sorted(((name, round(ms, 1)) for name, ms in packages.items()), key=lambda item: -item[1])[:top]
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    env = child_env(args.database_url)
+
+    # perf_counter is system-wide on Linux/macOS, so the child can measure interpreter start
+    runs = []
+    for i in range(args.runs):
+        print(f"Cold start {i + 1}/{args.runs}...", file=sys.stderr)
+        runs.append(cold_start(env))
+
+    summary = {
+        metric: {
+            'median': round(statistics.median(run[metric] for run in runs), 2),
+            'min': round(min(run[metric] for run in runs), 2),
+            'max': round(max(run[metric] for run in runs), 2),
+        }
+        for metric in METRICS
+    }
+    report = {'python': sys.version.split()[0], 'runs': args.runs, 'results': summary}
+    if args.importtime:
+        report['slowest_imports_ms'] = slowest_imports(env, args.top)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = [
+            (metric, baseline[metric]['median'], summary[metric]['median'])
+            for metric in METRICS
+            if metric in baseline and summary[metric]['median'] > baseline[metric]['median'] * (1 + args.threshold)
+        ]
+        for metric, old, new in regressions:
+            print(f"REGRESSION {metric}: {old} -> {new} ms", file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regressions against baseline", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,31 @@
+"""
+WSGI entry point for the load test (benchmarks.loadtest starts gunicorn on it).
+
+Serves the app against the database in DATABASE_URL with authentication
+bypassed (the bearer token is taken as the Firebase uid), like benchmarks.run.
+LOADTEST_DB_LATENCY_MS adds a delay to every statement, standing in for the
+network round trip to Cloud SQL that a local SQLite file doesn't have.
+"""
+
+import os
+import time
+
+from sqlalchemy import event
+
+from app import create_app
+from modules.authentication import auth
+from utils.db_connector import db
+
+DB_LATENCY_SECONDS = float(os.getenv('LOADTEST_DB_LATENCY_MS', '0')) / 1000.0
+
+app = create_app()
+auth.verify_id_token = lambda token: token
+
+
+def _simulate_round_trip(conn, cursor, statement, parameters, context, executemany):
+    time.sleep(DB_LATENCY_SECONDS)
+
+
+if DB_LATENCY_SECONDS:
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', _simulate_round_trip)
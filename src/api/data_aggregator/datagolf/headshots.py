@@ -0,0 +1,325 @@
+"""
+Golfer headshot pipeline.
+
+Refreshes the headshot of every ranked player with a bounded pool of workers.
+All requests go through the provider client, so the whole pool shares the
+datagolf_web request budget (see data_aggregator.provider_client) no matter how
+many workers there are. Each image is handled like this:
+
+- The image URL comes from the manifest kept next to the images. The profile
+  page is only scraped for new players, or when a remembered URL stops working
+- Known images are requested conditionally (If-None-Match / If-Modified-Since),
+  and a body whose SHA-256 matches the stored image is not rewritten
+- New or changed images are saved as {dg_id}_headshot.png, and put in the local
+  image store (utils/image_store.py) with their resized variants
+
+When every player has been handled, Golfer.photo_url is updated with a single
+executemany UPDATE for the players whose URL changed, and golfer_photo gets the
+store names of the changed headshots in one upsert.
+
+    python -m data_aggregator.datagolf.headshots
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urljoin
+
+import requests
+from sqlalchemy import bindparam, select, update
+
+from data_aggregator.provider_client import provider_get
+from models import Golfer, GolferPhoto
+from utils.db_connector import db, upsert_statement
+from utils.functions.golfer_index import invalidate_golfer_index
+from utils.image_store import store_image
+
+logger = logging.getLogger(__name__)
+
+HEADSHOT_DIR = Path(os.getenv('HEADSHOT_DIR', Path(__file__).parents[3] / 'headshots'))
+HEADSHOT_BASE_URL = os.getenv('HEADSHOT_BASE_URL', 'https://storage.googleapis.com/golf-pickem.appspot.com/headshots')
+HEADSHOT_WORKERS = int(os.getenv('HEADSHOT_WORKERS', '8'))
+MANIFEST_NAME = 'manifest.json'
+
+_PLAYER_PIC = re.compile(r'<img\b[^>]*\bclass="[^"]*\bplayer-pic\b[^"]*"[^>]*>', re.IGNORECASE)
+_SRC = re.compile(r'\bsrc="([^"]+)"', re.IGNORECASE)
+
+
+def image_filename(dg_id) -> str:
+    """File name of a player's headshot."""
+    return f"{dg_id}_headshot.png"
+
+
+def parse_player_image_url(html: str, page_url: str = 'https://datagolf.com/player-profiles') -> str:
+    """
+    Find the headshot URL in a DataGolf profile page.
+
+    Only the player-pic <img> tag is looked at, so the page is not parsed as a
+    whole; BeautifulSoup is the fallback for markup the pattern doesn't match.
+
+    Args:
+        html (str): Profile page
+        page_url (str): URL of the page, relative image URLs are resolved against it
+
+    Returns:
+        str: Absolute image URL, or None if the page has no headshot
+    """
+    image_url = None
+    tag = _PLAYER_PIC.search(html)
+    src = _SRC.search(tag.group(0)) if tag else None
+    if src:
+        image_url = src.group(1)
+    else:
+        from bs4 import BeautifulSoup
+
+        img_element = BeautifulSoup(html, 'html.parser').find('img', class_='player-pic')
+        if img_element is not None:
+            image_url = img_element.attrs.get('src')
+
+    return urljoin(page_url, image_url) if image_url else None
+
+
+def load_manifest(output_dir: Path) -> dict:
+    """
+    What is known about each stored headshot.
+
+    Returns:
+        dict: str(dg_id) -> {'image_url', 'etag', 'last_modified', 'sha256', 'variants'},
+            variants being the image store names from store_image
+    """
+    try:
+        with open(output_dir / MANIFEST_NAME) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError:
+        logger.warning("Headshot manifest in %s is unreadable, rebuilding it", output_dir)
+        return {}
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _fetch_image(image_url: str, known: dict):
+    headers = {}
+    if known.get('image_url') == image_url:
+        if known.get('etag'):
+            headers['If-None-Match'] = known['etag']
+        if known.get('last_modified'):
+            headers['If-Modified-Since'] = known['last_modified']
+    return provider_get('datagolf_web', image_url, headers=headers)
+
+
+def refresh_headshot(dg_id, known: dict, output_dir: Path, force: bool = False):
+    """
+    Bring one player's headshot up to date.
+
+    Args:
+        dg_id: DataGolf player id
+        known (dict): The player's manifest entry ({} if new)
+        output_dir (Path): Where images are stored
+        force (bool): Download and rewrite even if unchanged
+
+    Returns:
+        tuple: (status, manifest entry) with status 'downloaded', 'unchanged' or 'missing'
+    """
+    known = {} if force else known
+    image_url = known.get('image_url')
+    scraped = False
+    if image_url is None:
+        image_url = get_player_image_url(dg_id)
+        scraped = True
+    if image_url is None:
+        return 'missing', known
+
+    response = _fetch_image(image_url, known)
+    if response.status_code == 404 and not scraped:
+        # The remembered URL is gone, look the headshot up again
+        image_url = get_player_image_url(dg_id)
+        if image_url is None:
+            return 'missing', known
+        response = _fetch_image(image_url, known)
+
+    path = output_dir / image_filename(dg_id)
+    files_exist = path.exists()
+    if response.status_code == 304:
+        if files_exist:
+            return 'unchanged', _with_variants(known, path)
+        response = _fetch_image(image_url, {})
+    response.raise_for_status()
+
+    content = response.content
+    entry = {
+        'image_url': image_url,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'sha256': hashlib.sha256(content).hexdigest(),
+    }
+    if entry['sha256'] == known.get('sha256') and files_exist:
+        return 'unchanged', _with_variants({**known, **entry}, path)
+
+    _write_atomic(path, content)
+    entry['variants'] = store_image(content)
+    return 'downloaded', entry
+
+
+def _with_variants(entry: dict, path: Path) -> dict:
+    # Headshots downloaded before the image store existed are added to it once
+    if entry.get('variants'):
+        return entry
+    return {**entry, 'variants': store_image(path.read_bytes())}
+
+
+def update_photo_urls(dg_ids, base_url: str = HEADSHOT_BASE_URL) -> int:
+    """
+    Point Golfer.photo_url at the stored headshots, in one executemany UPDATE.
+    Needs an app context.
+
+    Args:
+        dg_ids (iterable): DataGolf ids of players with a headshot
+        base_url (str): Where the headshots are served from
+
+    Returns:
+        int: Golfers updated
+    """
+    dg_ids = list(dg_ids)
+    if not dg_ids:
+        return 0
+    golfer = Golfer.__table__
+    current = dict(db.session.execute(
+        select(golfer.c.datagolf_id, golfer.c.photo_url).where(golfer.c.datagolf_id.in_(dg_ids))).all())
+    rows = [{'dg_id': dg_id, 'url': f"{base_url}/{image_filename(dg_id)}"} for dg_id in current]
+    rows = [row for row in rows if current[row['dg_id']] != row['url']]
+    if rows:
+        db.session.execute(
+            update(golfer).where(golfer.c.datagolf_id == bindparam('dg_id')).values(photo_url=bindparam('url')),
+            rows)
+        db.session.commit()
+        invalidate_golfer_index()
+    return len(rows)
+
+
+def record_golfer_photos(variants_by_dg_id: dict) -> int:
+    """
+    Save the image store names of headshots in golfer_photo, in one upsert for
+    the golfers whose headshot changed. Needs an app context.
+
+    Args:
+        variants_by_dg_id (dict): DataGolf id -> names from store_image
+
+    Returns:
+        int: Golfers whose photo changed
+    """
+    if not variants_by_dg_id:
+        return 0
+    golfer, photo = Golfer.__table__, GolferPhoto.__table__
+    golfer_ids = dict(db.session.execute(
+        select(golfer.c.datagolf_id, golfer.c.id).where(golfer.c.datagolf_id.in_(list(variants_by_dg_id)))).all())
+    current = {row.golfer_id: (row.original, row.small, row.medium) for row in db.session.execute(
+        select(photo).where(photo.c.golfer_id.in_(list(golfer_ids.values()))))}
+
+    now = datetime.utcnow()
+    rows = []
+    for dg_id, golfer_id in golfer_ids.items():
+        variants = variants_by_dg_id[dg_id]
+        names = (variants['original'], variants.get('small'), variants.get('medium'))
+        if current.get(golfer_id) != names:
+            rows.append({'golfer_id': golfer_id, 'original': names[0], 'small': names[1], 'medium': names[2],
+                         'updated_at': now})
+    if rows:
+        db.session.execute(
+            upsert_statement(photo, db.engine.dialect.name, ['golfer_id'],
+                             ['original', 'small', 'medium', 'updated_at']),
+            rows)
+        db.session.commit()
+        invalidate_golfer_index()
+    return len(rows)
+
+
+def refresh_headshots(players=None, output_dir=None, workers: int = HEADSHOT_WORKERS, force: bool = False,
+                      update_db: bool = True) -> dict:
+    """
+    Refresh the headshots of many players concurrently.
+
+    Args:
+        players (list): DataGolf ids, defaults to every player in the DataGolf rankings
+        output_dir (str): Where images are stored, defaults to HEADSHOT_DIR
+        workers (int): Concurrent downloads (requests still share the provider's budget)
+        force (bool): Download and rewrite every image
+        update_db (bool): Update Golfer.photo_url afterwards (needs an app context)
+
+    Returns:
+        dict: Counts of 'downloaded', 'unchanged', 'missing', 'failed', 'photo_urls_updated'
+            and 'photos_recorded'
+
+    Raises:
+        requests.RequestException: If players is None and the rankings can't be fetched
+        ValueError: If players is None and the rankings list no players
+    """
+    output_dir = Path(output_dir or HEADSHOT_DIR)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if players is None:
+        from data_aggregator.datagolf.scrape_images import get_datagolf_rankings_with_names
+        players = [player['id'] for player in get_datagolf_rankings_with_names(raise_errors=True)]
+        if not players:
+            # A refresh of nobody would look like a successful run
+            raise ValueError("The DataGolf rankings returned no players to refresh")
+    manifest = load_manifest(output_dir)
+
+    def process(dg_id):
+        try:
+            return dg_id, *refresh_headshot(dg_id, manifest.get(str(dg_id), {}), output_dir, force)
+        except Exception as e:
+            logger.warning("Failed to refresh the headshot of %s: %s", dg_id, e)
+            return dg_id, 'failed', None
+
+    counts = {'downloaded': 0, 'unchanged': 0, 'missing': 0, 'failed': 0}
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='headshots') as pool:
+        for dg_id, status, entry in pool.map(process, players):
+            counts[status] += 1
+            if entry:
+                manifest[str(dg_id)] = entry
+    _write_atomic(output_dir / MANIFEST_NAME, json.dumps(manifest, indent=1, sort_keys=True).encode())
+
+    if update_db:
+        have_image = [int(dg_id) for dg_id in manifest if (output_dir / image_filename(dg_id)).exists()]
+        counts['photo_urls_updated'] = update_photo_urls(have_image)
+        counts['photos_recorded'] = record_golfer_photos(
+            {int(dg_id): entry['variants'] for dg_id, entry in manifest.items() if entry.get('variants')})
+    logger.info("Refreshed headshots in %s: %s", output_dir, counts)
+    return counts
+
+
+def get_player_image_url(player_id):
+    """
+    Scrapes a player's profile page to get their headshot image URL.
+
+    Args:
+        player_id (str): The DataGolf ID of the player
+
+    Returns:
+        str: URL of the player's headshot image, or None if not found
+    """
+    try:
+        response = provider_get('datagolf_web', '/player-profiles', params={'dg_id': player_id})
+        response.raise_for_status()
+        return parse_player_image_url(response.text, response.url)
+    except requests.RequestException as e:
+        logger.warning("Error fetching profile page for player %s: %s", player_id, e)
+    return None
+
+
+if __name__ == "__main__":
+    from app import create_app
+
+    with create_app().app_context():
+        print(refresh_headshots())
@@ -1,8 +1,10 @@
 import os
 import json
+import logging
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-import firebase_admin
-from firebase_admin import credentials, firestore
 from dotenv import load_dotenv
 
 # Import the endpoint functions
@@ -10,102 +12,115 @@ from data_aggregator.datagolf.live_results.endpoints.live_hole_scoring_distribut
 from data_aggregator.datagolf.live_results.endpoints.live_model_predictions import fetch_model_predictions
 from data_aggregator.datagolf.live_results.endpoints.live_tournament_stats import fetch_live_stats
 from data_aggregator.datagolf.live_results.endpoints.live_cutline import fetch_cutline
+from data_aggregator.datagolf.live_results.archive import archive_snapshot
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Parse the Firebase Admin SDK key from the environment variable
-firebase_admin_sdk_key = os.getenv('FIREBASE_ADMIN_SDK_KEY')
-firebase_admin_sdk_key_dict = json.loads(firebase_admin_sdk_key)
-
-# Initialize Firebase Admin SDK if not already initialized
-if not firebase_admin._apps:
-    cred = credentials.Certificate(firebase_admin_sdk_key_dict)
-    firebase_admin.initialize_app(cred)
-
-db = firestore.client()
+logger = logging.getLogger(__name__)
 
 CACHE_EXPIRY_MINUTES = 10  # Define cache expiry time
-CACHE_FILE_PATH = 'data_aggregator/datagolf/cache/mega_cache.json'  # Path to cache file
+CACHE_FILE_PATH = os.getenv('LIVE_CACHE_PATH', 'data_aggregator/datagolf/cache/mega_cache.json')  # Path to cache file
+
+# The feeds are independent and each call mostly waits on DataGolf, so they are
+# fetched side by side. One refresh runs at a time; concurrent requests that find
+# the cache stale wait for it instead of all fetching the same feeds.
+_fetch_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='live-fetch')
+_refresh_lock = threading.Lock()
 
 def is_cache_stale(last_updated):
     """Check if the cache is stale based on the last updated timestamp."""
-    print("Checking if cache is stale:")
     last_updated_time = datetime.fromisoformat(last_updated)
     is_stale = datetime.utcnow() - last_updated_time > timedelta(minutes=CACHE_EXPIRY_MINUTES)
-    
-    if is_stale:
-        print("Cache is stale, last updated:", last_updated_time)
-    else:
-        print("Cache is not stale, last updated:", last_updated_time)
+    logger.debug("Live cache last updated %s, stale: %s", last_updated_time, is_stale)
     return is_stale
 
 def load_cache():
     """Load cache from a local JSON file."""
-    print("Loading cache from:", CACHE_FILE_PATH)
     if os.path.exists(CACHE_FILE_PATH):
         try:
             with open(CACHE_FILE_PATH, 'r') as cache_file:
-                # Add debug logging
                 content = cache_file.read()
-                print(f"Cache file size: {len(content)} bytes")
+                logger.debug("Loaded live cache %s (%d bytes)", CACHE_FILE_PATH, len(content))
                 try:
                     return json.loads(content)
                 except json.JSONDecodeError as e:
-                    print(f"Error parsing cache JSON at position {e.pos}: {e.msg}")
-                    print(f"Context: {content[max(0, e.pos-50):min(len(content), e.pos+50)]}")
+                    logger.warning("Corrupt live cache at position %d: %s (context: %r)", e.pos, e.msg,
+                                   content[max(0, e.pos-50):e.pos+50])
                     # If cache is corrupted, delete it
                     os.remove(CACHE_FILE_PATH)
                     return None
         except Exception as e:
-            print(f"Error reading cache file: {e}")
+            logger.warning("Error reading live cache file: %s", e)
             return None
     return None
 
 def save_cache(data):
     """Save cache to a local JSON file."""
+    os.makedirs(os.path.dirname(CACHE_FILE_PATH), exist_ok=True)
     with open(CACHE_FILE_PATH, 'w') as cache_file:
         json.dump(data, cache_file)
 
-def fetch_combined_data():
-    # Load cache with fallback to fresh data
+def _fresh_cache():
+    """The cached combined data if it is still fresh, else None."""
     try:
         cache = load_cache()
         if cache and not is_cache_stale(cache['last_updated']):
-            print("Using cached data.")
             return cache
     except Exception as e:
-        print(f"Cache error: {e}, fetching fresh data...")
-        cache = None
-
-    # Fetch fresh data from endpoints
-    print("Fetching new data from endpoints.")
-    hole_scoring_distributions = fetch_hole_scoring_distributions()
-    model_predictions = fetch_model_predictions()
-    tournament_stats = fetch_live_stats()
-    cutline_predictions = fetch_cutline()  # Now synchronous
-    
-    combined_data = {
-        'last_updated': datetime.utcnow().isoformat(),
-        'hole_scoring_distributions': hole_scoring_distributions,
-        'model_predictions': model_predictions,
-        'tournament_stats': tournament_stats,
-        'cutline_predictions': cutline_predictions
+        logger.warning("Live cache error: %s, fetching fresh data", e)
+    return None
+
+def _fetch_concurrently(fetchers: dict) -> dict:
+    """Run the fetchers in the pool, each in a copy of the caller's context (request metrics)."""
+    futures = {
+        key: _fetch_pool.submit(contextvars.copy_context().run, fetcher)
+        for key, fetcher in fetchers.items()
     }
+    return {key: future.result() for key, future in futures.items()}
 
-    # Try to save cache, but don't fail if we can't
-    try:
-        save_cache(combined_data)
-    except Exception as e:
-        print(f"Error saving cache: {e}")
+def _record_history(data):
+    # Imported here so numpy stays out of app startup
+    from data_aggregator.datagolf.live_results.history import record_snapshot
+    record_snapshot(data)
+
+def fetch_combined_data():
+    # Load cache with fallback to fresh data
+    cache = _fresh_cache()
+    if cache:
+        return cache
+
+    with _refresh_lock:
+        # Another request may have refreshed it while we waited
+        cache = _fresh_cache()
+        if cache:
+            return cache
+
+        # Fetch fresh data from endpoints
+        logger.info("Live cache stale, fetching from endpoints")
+        results = _fetch_concurrently({
+            'hole_scoring_distributions': fetch_hole_scoring_distributions,
+            'model_predictions': fetch_model_predictions,
+            'tournament_stats': fetch_live_stats,
+            'cutline_predictions': fetch_cutline,
+        })
+        combined_data = {'last_updated': datetime.utcnow().isoformat(), **results}
+
+        # Try to save cache, but don't fail if we can't
+        try:
+            save_cache(combined_data)
+        except Exception as e:
+            logger.warning("Error saving live cache: %s", e)
+
+        # Queued for the background archive writer and history store, off the request path
+        archive_snapshot(combined_data)
+        _fetch_pool.submit(_record_history, combined_data)
 
     return combined_data
 
 
 def archive_data_to_firebase(data):
-    """Archive data to Firebase for historical records."""
-    timestamp = datetime.utcnow().isoformat()
-    doc_ref = db.collection('datagolf_archive').document(timestamp)
-    doc_ref.set(data)
+    """Queue data for the historical archive (see archive.py). Returns immediately."""
+    return archive_snapshot(data)
 
 # This module is intended to be imported and used by API endpoints until we implement serverless functions that schedule this process
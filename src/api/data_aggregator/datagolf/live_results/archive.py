@@ -0,0 +1,511 @@
+"""
+Background archive of live tournament snapshots.
+
+Each refresh of the combined live bundle is queued with `archive_snapshot` and
+written by a background thread, so archiving never blocks a request. The thread
+batches snapshots and stores them as:
+
+- keyframes: the full bundle, every LIVE_ARCHIVE_KEYFRAME_EVERY snapshots
+- deltas: only what changed since the previous snapshot. Golfer tables (live
+  stats, in-play predictions) are diffed per golfer, other sections whole
+
+Payloads are zlib-compressed JSON. `restore` rebuilds full bundles from a
+keyframe and the deltas after it.
+
+Every gunicorn worker and instance runs its own writer, each with its own chain of
+keyframes and deltas, all in the same sink. Records carry the writer (host:pid)
+in their id and a `keyframe` field naming the keyframe of their chain, and
+`restore` only applies a delta to the state of its own chain.
+
+The sink is chosen with LIVE_ARCHIVE_SINK:
+
+    none (default)           Archiving off
+    firestore                Firestore collection 'datagolf_archive' (production)
+    file:<directory>         JSON lines, one file per day (local runs and tests)
+    sqlite:<path>            Table in a SQLite file (local runs and tests)
+"""
+
+import atexit
+import base64
+import copy
+import json
+import logging
+import os
+import queue
+import socket
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+ENCODING = 'zlib+json'
+
+# Sections of the bundle holding one row per golfer, and the key in each that
+# holds the rows (a list of dicts with dg_id, or a dict keyed by dg_id)
+GOLFER_TABLES = {
+    'model_predictions': 'data',
+    'tournament_stats': 'live_stats',
+}
+
+KEYFRAME_EVERY = int(os.getenv('LIVE_ARCHIVE_KEYFRAME_EVERY', '12'))
+BATCH_SIZE = int(os.getenv('LIVE_ARCHIVE_BATCH_SIZE', '20'))
+FLUSH_SECONDS = float(os.getenv('LIVE_ARCHIVE_FLUSH_SECONDS', '5'))
+MAX_QUEUE = int(os.getenv('LIVE_ARCHIVE_MAX_QUEUE', '100'))
+
+metrics.HELP.setdefault('live_archive_records_total', ('counter', 'Live archive snapshots by kind and result'))
+metrics.HELP.setdefault('live_archive_bytes_total', ('counter', 'Compressed bytes written to the live archive'))
+
+
+#------------------------------------------------------------------------------
+# Snapshot encoding
+#------------------------------------------------------------------------------
+
+def _normalize(bundle: dict) -> dict:
+    """
+    Split a bundle into golfer rows and everything else.
+
+    Returns:
+        dict: {'sections': {name: value without golfer rows},
+               'tables': {name: {'kind': 'list'|'dict', 'rows': {dg_id: row}, 'order': [dg_id, ...]}}}
+    """
+    sections, tables = {}, {}
+    for name, value in bundle.items():
+        rows_key = GOLFER_TABLES.get(name)
+        rows = value.get(rows_key) if rows_key and isinstance(value, dict) else None
+        if isinstance(rows, list) and all(isinstance(row, dict) and 'dg_id' in row for row in rows):
+            table = {'kind': 'list', 'rows': {str(row['dg_id']): row for row in rows}}
+        elif isinstance(rows, dict):
+            table = {'kind': 'dict', 'rows': {str(key): row for key, row in rows.items()}}
+        else:
+            sections[name] = value
+            continue
+        table['order'] = list(table['rows'])
+        tables[name] = table
+        sections[name] = {key: item for key, item in value.items() if key != rows_key}
+    return {'sections': sections, 'tables': tables}
+
+
+def _denormalize(state: dict) -> dict:
+    bundle = copy.deepcopy(state['sections'])
+    for name, table in state['tables'].items():
+        rows = [table['rows'][key] for key in table['order']]
+        rows_key = GOLFER_TABLES[name]
+        bundle.setdefault(name, {})[rows_key] = (
+            copy.deepcopy(rows) if table['kind'] == 'list'
+            else {key: copy.deepcopy(table['rows'][key]) for key in table['order']}
+        )
+    return bundle
+
+
+def diff_states(previous: dict, current: dict) -> dict:
+    """
+    The changes from one normalized snapshot to the next.
+
+    Args:
+        previous (dict): Normalized previous snapshot
+        current (dict): Normalized current snapshot
+
+    Returns:
+        dict: Changed sections, removed sections and per golfer table the
+            upserted rows, removed dg_ids and the new order if it changed
+    """
+    delta = {
+        'sections': {name: value for name, value in current['sections'].items()
+                     if previous['sections'].get(name) != value},
+        'removed_sections': [name for name in previous['sections'] if name not in current['sections']],
+        'tables': {},
+    }
+    for name, table in current['tables'].items():
+        before = previous['tables'].get(name, {'kind': table['kind'], 'rows': {}, 'order': []})
+        changes = {
+            'kind': table['kind'],
+            'upsert': {key: row for key, row in table['rows'].items() if before['rows'].get(key) != row},
+            'remove': [key for key in before['rows'] if key not in table['rows']],
+        }
+        if table['order'] != before['order']:
+            changes['order'] = table['order']
+        if changes['upsert'] or changes['remove'] or 'order' in changes or table['kind'] != before['kind']:
+            delta['tables'][name] = changes
+    delta['removed_tables'] = [name for name in previous['tables'] if name not in current['tables']]
+    return delta
+
+
+def apply_delta(state: dict, delta: dict) -> dict:
+    """
+    Apply a delta from diff_states to a normalized snapshot.
+
+    Args:
+        state (dict): Normalized snapshot the delta was taken against (not modified)
+        delta (dict): The delta
+
+    Returns:
+        dict: The next normalized snapshot
+    """
+    sections = {name: value for name, value in state['sections'].items() if name not in delta['removed_sections']}
+    sections.update(delta['sections'])
+    tables = {name: table for name, table in state['tables'].items() if name not in delta['removed_tables']}
+    for name, changes in delta['tables'].items():
+        before = tables.get(name, {'rows': {}, 'order': []})
+        rows = {key: row for key, row in before['rows'].items() if key not in set(changes['remove'])}
+        rows.update(changes['upsert'])
+        order = changes.get('order') or [key for key in before['order'] if key in rows]
+        tables[name] = {'kind': changes['kind'], 'rows': rows, 'order': order}
+    return {'sections': sections, 'tables': tables}
+
+
+def _decompress(payload: bytes):
+    return json.loads(zlib.decompress(payload))
+
+
+def restore(records) -> list:
+    """
+    Rebuild full bundles from archive records.
+
+    Each delta is applied to the latest state of its own chain (the records
+    sharing its `keyframe`), so the interleaved chains of several writers
+    rebuild independently.
+
+    Args:
+        records (iterable): Records as returned by a sink's `records()`, in id order
+
+    Returns:
+        list: (record id, bundle) for every record that follows a keyframe
+    """
+    snapshots = []
+    states = {}  # Keyframe id -> latest state of its chain
+    current_chain = {}  # Writer -> keyframe id of its open chain, to let go of finished ones
+    for record in records:
+        payload = _decompress(record['payload'])
+        chain = record.get('keyframe') or record['id']
+        if record['kind'] == 'keyframe':
+            writer = record.get('writer')
+            states.pop(current_chain.get(writer), None)
+            current_chain[writer] = record['id']
+            state = payload
+        elif chain not in states:
+            continue  # Delta without its keyframe (archive started mid-chain, or a lost batch)
+        else:
+            state = apply_delta(states[chain], payload)
+        states[chain] = state
+        snapshots.append((record['id'], _denormalize(state)))
+    return snapshots
+
+
+#------------------------------------------------------------------------------
+# Sinks
+#------------------------------------------------------------------------------
+
+class FirestoreSink:
+    """Archive records as documents of a Firestore collection, written in batched commits."""
+
+    MAX_BATCH = 500  # Firestore limit per batched write
+
+    def __init__(self, collection: str = 'datagolf_archive'):
+        self.collection = collection
+
+    def write(self, records: list):
+        from utils.firebase import get_firestore
+
+        client = get_firestore()
+        collection = client.collection(self.collection)
+        for start in range(0, len(records), self.MAX_BATCH):
+            batch = client.batch()
+            for record in records[start:start + self.MAX_BATCH]:
+                batch.set(collection.document(record['id']), record)
+            batch.commit()
+
+    def records(self) -> list:
+        from utils.firebase import get_firestore
+
+        documents = get_firestore().collection(self.collection).order_by('id').stream()
+        return [document.to_dict() for document in documents]
+
+
+class FileSink:
+    """Archive records as JSON lines, one file per UTC day, payloads base64 encoded."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def write(self, records: list):
+        os.makedirs(self.directory, exist_ok=True)
+        by_day = {}
+        for record in records:
+            by_day.setdefault(record['id'][:8], []).append(record)
+        for day, day_records in by_day.items():
+            with open(os.path.join(self.directory, f"archive-{day}.jsonl"), 'a') as f:
+                for record in day_records:
+                    f.write(json.dumps({**record, 'payload': base64.b64encode(record['payload']).decode()}) + '\n')
+
+    def records(self) -> list:
+        if not os.path.isdir(self.directory):
+            return []
+        records = []
+        for name in sorted(os.listdir(self.directory)):
+            if name.startswith('archive-') and name.endswith('.jsonl'):
+                with open(os.path.join(self.directory, name)) as f:
+                    for line in f:
+                        record = json.loads(line)
+                        record['payload'] = base64.b64decode(record['payload'])
+                        records.append(record)
+        return sorted(records, key=lambda record: record['id'])
+
+
+class SQLiteSink:
+    """Archive records in a table of a SQLite file."""
+
+    COLUMNS = ('id', 'kind', 'keyframe', 'writer', 'created', 'encoding', 'raw_size', 'payload')
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS live_archive (id TEXT PRIMARY KEY, kind TEXT NOT NULL, "
+                "keyframe TEXT, writer TEXT, created TEXT NOT NULL, encoding TEXT NOT NULL, raw_size INTEGER, "
+                "payload BLOB NOT NULL)")
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(live_archive)")}
+            if 'writer' not in columns:
+                # Archives written before records named their writer
+                connection.execute("ALTER TABLE live_archive ADD COLUMN writer TEXT")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def write(self, records: list):
+        with self._connect() as connection:
+            connection.executemany(
+                f"INSERT OR REPLACE INTO live_archive ({', '.join(self.COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(self.COLUMNS))})",
+                [tuple(record.get(column) for column in self.COLUMNS) for record in records])
+
+    def records(self) -> list:
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM live_archive ORDER BY id").fetchall()
+        return [dict(zip(self.COLUMNS, row)) for row in rows]
+
+
+def sink_from_spec(spec: str):
+    """
+    Build a sink from a LIVE_ARCHIVE_SINK value.
+
+    Args:
+        spec (str): 'none', 'firestore', 'file:<directory>' or 'sqlite:<path>'
+
+    Returns:
+        The sink, or None when archiving is off
+
+    Raises:
+        ValueError: If the spec is not recognised
+    """
+    spec = (spec or 'none').strip()
+    kind, _, target = spec.partition(':')
+    if kind in ('', 'none', 'off'):
+        return None
+    if kind == 'firestore':
+        return FirestoreSink(target or 'datagolf_archive')
+    if kind == 'file' and target:
+        return FileSink(target)
+    if kind == 'sqlite' and target:
+        return SQLiteSink(target)
+    raise ValueError(f"Unknown LIVE_ARCHIVE_SINK: {spec!r}")
+
+
+#------------------------------------------------------------------------------
+# Background writer
+#------------------------------------------------------------------------------
+
+class ArchiveWriter:
+    """
+    Queue of snapshots drained by a daemon thread that encodes them as keyframes
+    and deltas and writes them to the sink in batches. `submit` never blocks: when
+    the queue is full the snapshot is dropped (the next delta is still taken
+    against the last snapshot written, so the chain stays intact).
+
+    Args:
+        sink: Object with a `write(records)` method
+        keyframe_every (int): Store a full snapshot after this many deltas
+        batch_size (int): Most records per sink write
+        flush_seconds (float): Longest time a snapshot waits for its batch to fill
+        max_queue (int): Snapshots waiting to be encoded before new ones are dropped
+        compression_level (int): zlib level
+        writer_id (str): Identifies this writer's records, defaults to host:pid
+    """
+
+    def __init__(self, sink, keyframe_every: int = KEYFRAME_EVERY, batch_size: int = BATCH_SIZE,
+                 flush_seconds: float = FLUSH_SECONDS, max_queue: int = MAX_QUEUE, compression_level: int = 6,
+                 writer_id: str = None):
+        self.sink = sink
+        self.writer_id = writer_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.keyframe_every = max(int(keyframe_every), 1)
+        self.batch_size = max(int(batch_size), 1)
+        self.flush_seconds = flush_seconds
+        self.compression_level = compression_level
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._previous = None  # Normalized last snapshot written
+        self._keyframe_id = None
+        self._since_keyframe = 0
+        self._last_created = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='live-archive', daemon=True)
+        self._thread.start()
+
+    def submit(self, bundle: dict, created: datetime = None) -> bool:
+        """
+        Queue a snapshot. The bundle must not be modified afterwards.
+
+        Args:
+            bundle (dict): Combined live data
+            created (datetime): Snapshot time (UTC), defaults to now
+
+        Returns:
+            bool: False if the snapshot was dropped
+        """
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait((created or datetime.utcnow(), bundle))
+            return True
+        except queue.Full:
+            logger.warning("Live archive queue full, dropping snapshot")
+            metrics.inc('live_archive_records_total', kind='snapshot', result='dropped')
+            return False
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Wait until everything submitted so far is written.
+
+        Returns:
+            bool: False if the timeout expired first
+        """
+        done = threading.Event()
+        self._queue.put((None, done))
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 10):
+        """Write what is queued and stop the thread."""
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        self._queue.put((None, None))
+        self._thread.join(timeout)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            created, item = self._queue.get()
+            if item is None:
+                return
+            batch, waiters = [], []
+            deadline = time.monotonic() + self.flush_seconds
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                try:
+                    batch.append(self._encode(created, item))
+                except Exception as e:
+                    logger.error("Error encoding live snapshot: %s", e, exc_info=True)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    created, item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True  # Stop after writing this batch
+                    break
+            self._write(batch)
+            for waiter in waiters:
+                waiter.set()
+
+    def _encode(self, created: datetime, bundle: dict) -> dict:
+        state = _normalize(bundle)
+        if self._last_created is not None and created <= self._last_created:
+            created = self._last_created + timedelta(microseconds=1)  # Keep ids unique and in order
+        self._last_created = created
+        record_id = f"{created.strftime('%Y%m%dT%H%M%S.%fZ')}-{self.writer_id}"
+
+        if self._previous is None or self._since_keyframe >= self.keyframe_every:
+            kind, payload = 'keyframe', state
+            self._keyframe_id = record_id
+            self._since_keyframe = 0
+        else:
+            kind, payload = 'delta', diff_states(self._previous, state)
+            self._since_keyframe += 1
+        self._previous = state
+
+        raw = json.dumps(payload, separators=(',', ':'), default=str).encode()
+        return {
+            'id': record_id,
+            'kind': kind,
+            'keyframe': self._keyframe_id,
+            'writer': self.writer_id,
+            'created': created.isoformat(),
+            'encoding': ENCODING,
+            'raw_size': len(raw),
+            'payload': zlib.compress(raw, self.compression_level),
+        }
+
+    def _write(self, batch: list):
+        if not batch:
+            return
+        try:
+            self.sink.write(batch)
+        except Exception as e:
+            logger.error("Error writing %d live archive records: %s", len(batch), e)
+            for record in batch:
+                metrics.inc('live_archive_records_total', kind=record['kind'], result='failed')
+            self._previous = None  # Later deltas would reference the lost records
+            return
+        for record in batch:
+            metrics.inc('live_archive_records_total', kind=record['kind'], result='written')
+            metrics.inc('live_archive_bytes_total', len(record['payload']), kind=record['kind'])
+        logger.debug("Wrote %d live archive records", len(batch))
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_archive_writer():
+    """
+    The process-wide writer for LIVE_ARCHIVE_SINK, started on first use.
+
+    Returns:
+        ArchiveWriter: The writer, or None when archiving is off
+    """
+    global _writer
+    if _writer is not None:
+        return _writer
+    with _writer_lock:
+        if _writer is None:
+            sink = sink_from_spec(os.getenv('LIVE_ARCHIVE_SINK'))
+            if sink is None:
+                return None
+            _writer = ArchiveWriter(sink)
+            atexit.register(_writer.close)
+            logger.info("Archiving live snapshots to %s", type(sink).__name__)
+    return _writer
+
+
+def archive_snapshot(bundle: dict) -> bool:
+    """
+    Queue a live bundle for archiving, if archiving is on. Never blocks.
+
+    Args:
+        bundle (dict): Combined live data
+
+    Returns:
+        bool: True if queued
+    """
+    writer = get_archive_writer()
+    return writer.submit(bundle) if writer else False
@@ -74,7 +74,7 @@ def fetch_cutline():
         if not result['predictions']:
             logger.warning("No cut line predictions found")
         else:
-            logger.debug(f"Successfully fetched {len(result['predictions'])} cut line predictions")
+            logger.debug("Successfully fetched %s cut line predictions", len(result['predictions']))
             
         return result
         
@@ -1,12 +1,14 @@
-import requests
 import os
+from data_aggregator.provider_client import fetch_feed
 
 DATAGOLF_API_KEY = os.getenv('DATAGOLFAPI_KEY')
-DATAGOLF_API_URL = f"https://feeds.datagolf.com/preds/live-hole-stats?tour=pga&file_format=json&key={DATAGOLF_API_KEY}"
+DATAGOLF_API_PATH = "/preds/live-hole-stats"
 
 def fetch_hole_scoring_distributions():
     """Fetch the latest tournament state from the DataGolf API."""
-    response = requests.get(DATAGOLF_API_URL)
-    response.raise_for_status()
-    return response.json()
+    return fetch_feed('datagolf', DATAGOLF_API_PATH, params={
+        'tour': 'pga',
+        'file_format': 'json',
+        'key': DATAGOLF_API_KEY
+    }).data
 
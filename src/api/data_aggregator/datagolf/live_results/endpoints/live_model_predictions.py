@@ -1,13 +1,17 @@
-import requests
 import os
+from data_aggregator.provider_client import fetch_feed
 
 
 
 DATAGOLF_API_KEY = os.getenv('DATAGOLFAPI_KEY')
-DATAGOLF_API_URL = f"https://feeds.datagolf.com/preds/in-play?tour=pga&dead_heat=no&odds_format=decimal&file_format=json&key={DATAGOLF_API_KEY}"
+DATAGOLF_API_PATH = "/preds/in-play"
 
 def fetch_model_predictions():
     """Fetch the latest tournament state from the DataGolf API."""
-    response = requests.get(DATAGOLF_API_URL)
-    response.raise_for_status()
-    return response.json()
+    return fetch_feed('datagolf', DATAGOLF_API_PATH, params={
+        'tour': 'pga',
+        'dead_heat': 'no',
+        'odds_format': 'decimal',
+        'file_format': 'json',
+        'key': DATAGOLF_API_KEY
+    }).data
@@ -1,24 +1,37 @@
 import requests
 import os
+import logging
+from data_aggregator.provider_client import fetch_feed
+
+logger = logging.getLogger(__name__)
 
 DATAGOLF_API_KEY = os.getenv('DATAGOLFAPI_KEY')
 STATS = 'sg_putt,sg_arg,sg_app,sg_ott,sg_t2g,sg_bs,sg_total,distance,accuracy,gir,prox_fw,prox_rgh,scrambling'
 
-DATAGOLF_LIVE_STATS_URL_VALUE = f"https://feeds.datagolf.com/preds/live-tournament-stats?stats={STATS}&round=event_avg&display=value&key={DATAGOLF_API_KEY}"
-DATAGOLF_LIVE_STATS_URL_RANK = f"https://feeds.datagolf.com/preds/live-tournament-stats?stats={STATS}&round=event_avg&display=rank&key={DATAGOLF_API_KEY}"
+DATAGOLF_LIVE_STATS_PATH = "/preds/live-tournament-stats"
+
+
+# Last combined result and the content hashes of the two feeds it was built from
+_last_combined = {'hashes': None, 'stats': None}
+
+
+def _live_stats_params(display):
+    return {'stats': STATS, 'round': 'event_avg', 'display': display, 'key': DATAGOLF_API_KEY}
 
 def fetch_live_stats():
     """Fetch and combine value and rank stats from the DataGolf API."""
     try:
         # Fetch both endpoints
-        value_response = requests.get(DATAGOLF_LIVE_STATS_URL_VALUE)
-        rank_response = requests.get(DATAGOLF_LIVE_STATS_URL_RANK)
-        
-        value_response.raise_for_status()
-        rank_response.raise_for_status()
+        value_feed = fetch_feed('datagolf', DATAGOLF_LIVE_STATS_PATH, params=_live_stats_params('value'))
+        rank_feed = fetch_feed('datagolf', DATAGOLF_LIVE_STATS_PATH, params=_live_stats_params('rank'))
+
+        # Neither feed changed since the last call, so the combined stats are the same too
+        hashes = (value_feed.content_hash, rank_feed.content_hash)
+        if hashes == _last_combined['hashes']:
+            return _last_combined['stats']
         
-        value_data = value_response.json()
-        rank_data = rank_response.json()
+        value_data = value_feed.data
+        rank_data = rank_feed.data
         
         # Initialize combined stats dictionary
         combined_stats = {
@@ -67,9 +80,10 @@ def fetch_live_stats():
         )
         
         combined_stats['field_size'] = active_players
+        _last_combined.update(hashes=hashes, stats=combined_stats)
         return combined_stats
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching live stats: {e}")
+        logger.warning("Error fetching live stats: %s", e)
         raise
 
 
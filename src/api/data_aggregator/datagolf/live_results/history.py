@@ -0,0 +1,318 @@
+"""
+Columnar time-series store of live tournament data.
+
+Every refresh of the combined live bundle appends one row per golfer to two
+tables, `live_stats` and `model_predictions`. Each tournament has its own
+directory, and each table stores every column as a raw array in its own file:
+
+    <LIVE_HISTORY_DIR>/<event-slug>-<year>/<table>/<column>.bin + meta.json
+
+Rows are appended in time order, so a time range is two binary searches over the
+memory-mapped `ts` column. Filtering by golfer is one vectorized pass over the
+`dg_id` column of that range. A golfer's whole week is read without parsing any
+JSON, for charts and for backtesting the projection logic.
+
+Appends from several workers are serialized with a file lock. A snapshot whose
+feed timestamp was already stored is skipped, so workers refreshing the same
+feed do not duplicate rows. Rows are committed by rewriting meta.json after the
+column files are appended, so an interrupted append is discarded on the next one.
+"""
+
+import fcntl
+import json
+import logging
+import math
+import os
+import re
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+HISTORY_DIR = os.getenv('LIVE_HISTORY_DIR', 'data_aggregator/datagolf/cache/history')
+
+LIVE_STATS = ('sg_putt', 'sg_arg', 'sg_app', 'sg_ott', 'sg_t2g', 'sg_bs', 'sg_total',
+              'distance', 'accuracy', 'gir', 'prox_fw', 'prox_rgh', 'scrambling')
+PREDICTIONS = ('current_score', 'today', 'thru', 'win', 'top_5', 'top_10', 'top_20', 'make_cut')
+
+# Column name -> numpy dtype. ts is milliseconds since the epoch (UTC); position
+# is the raw label ('T5', 'CUT') and position_num its number (-1 when not placed)
+SCHEMAS = {
+    'live_stats': {
+        'ts': '<i8', 'dg_id': '<i4', 'position': 'S8', 'position_num': '<i2',
+        'thru': '<f4', 'today': '<f4', 'total': '<f4',
+        **{column: '<f4' for stat in LIVE_STATS for column in (stat, f"{stat}_rank")},
+    },
+    'model_predictions': {
+        'ts': '<i8', 'dg_id': '<i4', 'position': 'S8', 'position_num': '<i2',
+        **{column: '<f4' for column in PREDICTIONS},
+    },
+}
+
+
+def _float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _position_num(position) -> int:
+    match = re.match(r'^T?(\d+)$', str(position or '').strip())
+    return int(match.group(1)) if match else -1
+
+
+def timestamp_ms(value: str) -> int:
+    """Milliseconds since the epoch of an ISO time (naive times are UTC)."""
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+def tournament_key(event_name: str, ts_ms: int) -> str:
+    """
+    Directory name of a tournament: slugified event name and year.
+
+    Args:
+        event_name (str): Event name from the feed
+        ts_ms (int): Snapshot time, for the year
+
+    Returns:
+        str: e.g. 'the-memorial-tournament-2024'
+    """
+    year = datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).year
+    slug = re.sub(r'[^a-z0-9]+', '-', (event_name or 'unknown').lower()).strip('-') or 'unknown'
+    return f"{slug}-{year}"
+
+
+def live_stats_columns(tournament_stats: dict, ts_ms: int) -> dict:
+    """Column arrays of the combined live stats (see fetch_live_stats)."""
+    rows = list((tournament_stats or {}).get('live_stats', {}).items())
+    schema = SCHEMAS['live_stats']
+    info = [golfer.get('info', {}) for _, golfer in rows]
+    columns = {
+        'ts': np.full(len(rows), ts_ms, dtype=schema['ts']),
+        'dg_id': np.array([int(dg_id) for dg_id, _ in rows], dtype=schema['dg_id']),
+        'position': np.array([str(item.get('position') or '') for item in info], dtype=schema['position']),
+        'position_num': np.array([_position_num(item.get('position')) for item in info], dtype=schema['position_num']),
+        'thru': np.array([_float(item.get('thru')) for item in info], dtype=schema['thru']),
+        'today': np.array([_float(item.get('today')) for item in info], dtype=schema['today']),
+        'total': np.array([_float(item.get('total')) for item in info], dtype=schema['total']),
+    }
+    for stat in LIVE_STATS:
+        values = [golfer.get(stat) or {} for _, golfer in rows]
+        columns[stat] = np.array([_float(value.get('value')) for value in values], dtype=schema[stat])
+        columns[f"{stat}_rank"] = np.array([_float(value.get('rank')) for value in values],
+                                           dtype=schema[f"{stat}_rank"])
+    return columns
+
+
+def model_predictions_columns(model_predictions: dict, ts_ms: int) -> dict:
+    """Column arrays of the in-play predictions feed."""
+    rows = [row for row in (model_predictions or {}).get('data', []) if row.get('dg_id')]
+    schema = SCHEMAS['model_predictions']
+    columns = {
+        'ts': np.full(len(rows), ts_ms, dtype=schema['ts']),
+        'dg_id': np.array([int(row['dg_id']) for row in rows], dtype=schema['dg_id']),
+        'position': np.array([str(row.get('current_pos') or '') for row in rows], dtype=schema['position']),
+        'position_num': np.array([_position_num(row.get('current_pos')) for row in rows],
+                                 dtype=schema['position_num']),
+    }
+    for column in PREDICTIONS:
+        columns[column] = np.array([_float(row.get(column)) for row in rows], dtype=schema[column])
+    return columns
+
+
+class ColumnTable:
+    """
+    Append-only table of fixed-width columns, one file per column.
+
+    Args:
+        directory (str): Table directory
+        schema (dict): Column name -> numpy dtype string
+    """
+
+    def __init__(self, directory: str, schema: dict):
+        self.directory = directory
+        self.schema = {name: np.dtype(dtype) for name, dtype in schema.items()}
+        self.meta = self._load_meta()
+
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, 'meta.json')
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.bin")
+
+    def _load_meta(self) -> dict:
+        try:
+            with open(self._meta_path()) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'rows': 0, 'last_ts': None, 'last_source': None}
+
+    @property
+    def rows(self) -> int:
+        return self.meta['rows']
+
+    def append(self, columns: dict, source: str = None) -> int:
+        """
+        Append rows. Call with the table's lock held (see LiveHistoryStore).
+
+        Args:
+            columns (dict): Column name -> array, all the same length, ts constant or ascending
+            source (str): Feed timestamp of the snapshot; a repeat of the last one is skipped
+
+        Returns:
+            int: Rows appended
+        """
+        self.meta = self._load_meta()  # Another worker may have appended
+        count = len(columns['ts'])
+        if not count or (source is not None and source == self.meta['last_source']):
+            return 0
+        if self.meta['last_ts'] is not None and int(columns['ts'][0]) < self.meta['last_ts']:
+            logger.debug("Skipping out of order snapshot for %s", self.directory)
+            return 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        committed = self.rows
+        for name, dtype in self.schema.items():
+            values = np.ascontiguousarray(columns[name], dtype=dtype)
+            with open(self._column_path(name), 'ab') as f:
+                # Drop anything past the committed rows left by an interrupted append
+                f.truncate(committed * dtype.itemsize)
+                f.write(values.tobytes())
+
+        self.meta = {'rows': committed + count, 'last_ts': int(columns['ts'][-1]), 'last_source': source}
+        temp_path = self._meta_path() + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.meta, f)
+        os.replace(temp_path, self._meta_path())
+        return count
+
+    def column(self, name: str):
+        """A read-only memory map of a column (committed rows only)."""
+        if not self.rows:
+            return np.empty(0, dtype=self.schema[name])
+        return np.memmap(self._column_path(name), dtype=self.schema[name], mode='r', shape=(self.rows,))
+
+    def read(self, start_ms: int = None, end_ms: int = None, dg_ids=None, columns=None) -> dict:
+        """
+        Read a time range, optionally for some golfers and columns only.
+
+        Args:
+            start_ms (int): Inclusive start (ms since the epoch), None for the beginning
+            end_ms (int): Inclusive end, None for the latest
+            dg_ids (iterable): Golfers to keep, None for all
+            columns (iterable): Columns to return, None for all (ts and dg_id are always included)
+
+        Returns:
+            dict: Column name -> numpy array
+        """
+        ts = self.column('ts')
+        lo = 0 if start_ms is None else int(np.searchsorted(ts, start_ms, side='left'))
+        hi = len(ts) if end_ms is None else int(np.searchsorted(ts, end_ms, side='right'))
+        names = ['ts', 'dg_id'] + [name for name in (columns or self.schema) if name not in ('ts', 'dg_id')]
+        unknown = [name for name in names if name not in self.schema]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+
+        mask = None
+        if dg_ids is not None:
+            mask = np.isin(self.column('dg_id')[lo:hi], np.fromiter(dg_ids, dtype=self.schema['dg_id']))
+        result = {}
+        for name in names:
+            values = self.column(name)[lo:hi]
+            result[name] = np.array(values[mask] if mask is not None else values)
+        return result
+
+
+class LiveHistoryStore:
+    """
+    Time series of live stats and in-play predictions, one directory per tournament.
+
+    Args:
+        root (str): Store directory
+    """
+
+    def __init__(self, root: str = HISTORY_DIR):
+        self.root = root
+
+    def table(self, tournament: str, name: str) -> ColumnTable:
+        if not re.fullmatch(r'[a-z0-9-]+', tournament or ''):
+            raise ValueError(f"Invalid tournament key: {tournament!r}")
+        return ColumnTable(os.path.join(self.root, tournament, name), SCHEMAS[name])
+
+    @contextmanager
+    def _locked(self, tournament: str):
+        directory = os.path.join(self.root, tournament)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, '.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def append_snapshot(self, bundle: dict) -> dict:
+        """
+        Append the golfers of a combined live bundle (see fetch_combined_data).
+
+        Args:
+            bundle (dict): Combined live data with 'last_updated', 'tournament_stats'
+                and 'model_predictions'
+
+        Returns:
+            dict: Rows appended per table, and the tournament key
+        """
+        ts_ms = timestamp_ms(bundle['last_updated'])
+        stats = bundle.get('tournament_stats') or {}
+        predictions = bundle.get('model_predictions') or {}
+        event_name = stats.get('event_name') or (predictions.get('info') or {}).get('event_name')
+        tournament = tournament_key(event_name, ts_ms)
+
+        tables = {
+            'live_stats': (live_stats_columns(stats, ts_ms), stats.get('last_updated')),
+            'model_predictions': (model_predictions_columns(predictions, ts_ms),
+                                  (predictions.get('info') or {}).get('last_update')),
+        }
+        counts = {'tournament': tournament}
+        with self._locked(tournament):
+            for name, (columns, source) in tables.items():
+                counts[name] = self.table(tournament, name).append(columns, source=source)
+        return counts
+
+    def tournaments(self) -> list:
+        """Keys of the stored tournaments, most recently updated first."""
+        if not os.path.isdir(self.root):
+            return []
+        keys = [name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name))]
+        return sorted(keys, key=lambda key: os.path.getmtime(os.path.join(self.root, key)), reverse=True)
+
+    def read(self, tournament: str, table: str, start_ms: int = None, end_ms: int = None,
+             dg_ids=None, columns=None) -> dict:
+        """
+        Read a range of a table. See ColumnTable.read.
+
+        Raises:
+            KeyError: If the table name is unknown
+        """
+        if table not in SCHEMAS:
+            raise KeyError(table)
+        return self.table(tournament, table).read(start_ms, end_ms, dg_ids=dg_ids, columns=columns)
+
+
+def record_snapshot(bundle: dict, store: LiveHistoryStore = None):
+    """
+    Append a bundle to the store in LIVE_HISTORY_DIR ('none' turns this off).
+    Errors are logged, not raised, so it can run in the background.
+    """
+    if store is None and HISTORY_DIR.lower() in ('', 'none', 'off'):
+        return
+    try:
+        counts = (store or LiveHistoryStore()).append_snapshot(bundle)
+        logger.debug("Recorded live history: %s", counts)
+    except Exception as e:
+        logger.warning("Error recording live history: %s", e, exc_info=True)
@@ -13,6 +13,7 @@ def load_cache():
 
 def save_cache(data):
     """Save cache to a file."""
+    os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
     with open(CACHE_FILE, 'w') as f:
         json.dump(data, f)
 
@@ -0,0 +1,175 @@
+"""
+Recorded-fixture transport for the provider client.
+
+Lets the jobs and live endpoints run against recorded provider responses instead
+of DataGolf, SportContent and OWGR, so ingestion and the live paths can be
+benchmarked and load-tested offline. It is plugged into the shared client's
+sessions as a requests transport adapter, so fetchers don't change at all.
+
+Configured through the environment:
+    PROVIDER_FIXTURES_DIR         Directory of fixtures, enables the adapter when set
+    PROVIDER_FIXTURE_MODE         'replay' (default) or 'record' (pass through and save responses)
+    PROVIDER_FIXTURE_LATENCY_MS   Simulated latency per request (default 0)
+    PROVIDER_FIXTURE_JITTER_MS    Random extra latency, 0..jitter (default 0)
+    PROVIDER_FIXTURE_ERROR_RATE   Fraction of requests that fail (default 0)
+    PROVIDER_FIXTURE_ERROR        Injected failure: an HTTP status such as '503', or 'timeout'
+    PROVIDER_FIXTURE_SEED         Seed for latency jitter and error injection, for repeatable runs
+
+Fixtures are stored as <dir>/<provider>/<path>.json, for example
+fixtures/sportcontent/leaderboard/651.json or fixtures/datagolf/preds/in-play.json.
+A fixture specific to a query string can be saved next to it as
+<path>@<param>=<value>&....json (the API key is never part of the name) and is
+preferred over the plain one when present.
+"""
+
+import hashlib
+import logging
+import os
+import random
+import threading
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+SECRET_PARAMS = frozenset({'key', 'api_key'})
+
+
+class FixtureAdapter(BaseAdapter):
+    """
+    Transport adapter that replays (or records) provider responses from disk.
+
+    Args:
+        directory (str): Root directory of the fixtures
+        hosts (dict): Host -> provider name, used as the fixture subdirectory
+        mode (str): 'replay' or 'record'
+        latency_ms (float): Simulated latency per request
+        jitter_ms (float): Random extra latency, 0..jitter_ms
+        error_rate (float): Fraction of requests that fail
+        error (str): Injected failure, an HTTP status code or 'timeout'
+        seed (int): Seed for jitter and error injection
+    """
+
+    def __init__(self, directory: str, hosts: dict = None, mode: str = 'replay',
+                 latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0,
+                 error: str = '503', seed: int = None):
+        super().__init__()
+        if mode not in ('replay', 'record'):
+            raise ValueError(f"Unknown fixture mode: {mode}")
+        self.directory = directory
+        self.hosts = hosts or {}
+        self.mode = mode
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error = error
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._upstream = HTTPAdapter() if mode == 'record' else None
+
+    @classmethod
+    def from_env(cls, hosts: dict = None):
+        """Build the adapter from the PROVIDER_FIXTURE_* environment variables."""
+        seed = os.getenv('PROVIDER_FIXTURE_SEED')
+        return cls(
+            directory=os.getenv('PROVIDER_FIXTURES_DIR'),
+            hosts=hosts,
+            mode=os.getenv('PROVIDER_FIXTURE_MODE', 'replay'),
+            latency_ms=float(os.getenv('PROVIDER_FIXTURE_LATENCY_MS', '0')),
+            jitter_ms=float(os.getenv('PROVIDER_FIXTURE_JITTER_MS', '0')),
+            error_rate=float(os.getenv('PROVIDER_FIXTURE_ERROR_RATE', '0')),
+            error=os.getenv('PROVIDER_FIXTURE_ERROR', '503'),
+            seed=int(seed) if seed else None,
+        )
+
+    def fixture_paths(self, url: str) -> list:
+        """
+        Candidate fixture files for a URL, most specific first.
+
+        Args:
+            url (str): Request URL including the query string
+
+        Returns:
+            list: The query-specific path (if the URL has a query) and the plain path
+        """
+        parts = urlsplit(url)
+        folder = self.hosts.get(parts.netloc, parts.netloc)
+        name = parts.path.strip('/') or 'index'
+        base = os.path.join(self.directory, folder, *name.split('/'))
+
+        params = sorted((k, v) for k, v in parse_qsl(parts.query) if k not in SECRET_PARAMS)
+        paths = []
+        if params:
+            query = '&'.join(f"{k}={v}" for k, v in params).replace('/', '_')
+            paths.append(f"{base}@{query}.json")
+        paths.append(f"{base}.json")
+        return paths
+
+    def _roll(self):
+        with self._random_lock:
+            delay = self.latency_ms + (self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+        return delay / 1000.0, fail
+
+    def _build_response(self, request, status: int, content: bytes, headers: dict = None):
+        response = requests.Response()
+        response.status_code = status
+        response.reason = {200: 'OK', 304: 'Not Modified', 404: 'Not Found'}.get(status, 'Injected Error')
+        response._content = content
+        response.headers = CaseInsensitiveDict(headers or {})
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        delay, fail = self._roll()
+        if delay:
+            time.sleep(delay)
+
+        if fail:
+            if self.error == 'timeout':
+                raise requests.ReadTimeout(f"Injected timeout for {request.url}", request=request)
+            return self._build_response(request, int(self.error), b'{"error": "injected"}')
+
+        if self.mode == 'record':
+            return self._record(request, stream, timeout, verify, cert, proxies)
+
+        for path in self.fixture_paths(request.url):
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    content = f.read()
+                etag = '"%s"' % hashlib.sha256(content).hexdigest()[:32]
+                if request.headers.get('If-None-Match') == etag:
+                    return self._build_response(request, 304, b'', {'ETag': etag})
+                return self._build_response(request, 200, content, {
+                    'Content-Type': 'application/json',
+                    'Content-Length': str(len(content)),
+                    'ETag': etag,
+                })
+
+        logger.warning("No fixture for %s", urlsplit(request.url).path)
+        return self._build_response(request, 404, b'{"error": "no fixture"}')
+
+    def _record(self, request, stream, timeout, verify, cert, proxies):
+        # Conditional requests would record empty 304 bodies
+        request.headers.pop('If-None-Match', None)
+        request.headers.pop('If-Modified-Since', None)
+        response = self._upstream.send(request, stream=False, timeout=timeout, verify=verify,
+                                       cert=cert, proxies=proxies)
+        if response.status_code == 200:
+            path = self.fixture_paths(request.url)[0]
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(response.content)
+            logger.info("Recorded fixture %s", path)
+        return response
+
+    def close(self):
+        if self._upstream is not None:
+            self._upstream.close()
@@ -1,23 +1,195 @@
-import requests
+"""
+Official World Golf Ranking ingestion.
+
+The rankings are read page by page (iter_owgr_rankings) and written in batches:
+each entry is matched to a golfer in memory (known OWGR player ids first, then
+the golfer index by name), golfer_current_ranking is upserted in one statement
+per batch, and a GolferRanking history row is appended only for golfers whose
+rank changed. Golfers that dropped out of the rankings get an unranked history
+row and leave the current table.
+"""
+
+import logging
+import os
+from datetime import datetime
+
 from pytz import timezone
+from sqlalchemy import delete, insert, select, update
+
+from data_aggregator.provider_client import provider_get
+from models import GolferCurrentRanking, GolferRanking
+from utils.db_connector import db, upsert_statement
+from utils.functions.golfer_index import get_golfer_index
+
+logger = logging.getLogger(__name__)
+
+RANKINGS_PATH = "/api/owgr/rankings/getRankings"
+RANKINGS_PARAMS = {"pageNumber": 1, "regionId": 0, "countryId": 0, "sortString": "Rank ASC"}
+PAGE_SIZE = int(os.getenv('OWGR_PAGE_SIZE', '500'))
+BATCH_SIZE = 500
+
+
+def iter_owgr_rankings(page_size: int = PAGE_SIZE):
+    """
+    Yield ranking entries in rank order, one page of the rankings API at a time,
+    so the whole list is never held in memory.
+
+    Args:
+        page_size (int): Entries per request
+
+    Yields:
+        dict: Ranking entry as returned by OWGR ('rank', 'pointsAverage', 'player', ...)
+    """
+    page, seen = 1, 0
+    while True:
+        response = provider_get('owgr', RANKINGS_PATH,
+                                params={**RANKINGS_PARAMS, "pageNumber": page, "pageSize": page_size})
+        response.raise_for_status()
+        body = response.json()
+        entries = body.get('rankingsList') or []
+        yield from entries
+        seen += len(entries)
+        if not entries or seen >= (body.get('totalNumberOfRankings') or 0):
+            return
+        page += 1
+
 
 def fetch_owgr_rankings():
-    first_url = "https://apiweb.owgr.com/api/owgr/rankings/getRankings?pageNumber=1&regionId=0&countryId=0&sortString=Rank+ASC"
-    response = requests.get(first_url)
-    
-    numberOfRankings = response.json()['totalNumberOfRankings']
-    second_url = f"https://apiweb.owgr.com/api/owgr/rankings/getRankings?pageSize={numberOfRankings}&pageNumber=1&regionId=0&countryId=0&sortString=Rank+ASC"
-    
-    response = requests.get(second_url)
-    data = response.json()['rankingsList']
-    return (data)
-
-def schedule_owgr_rankings_fetch(scheduler):
-    # Schedule the function to run every Monday at 8:00 AM EST
-    scheduler.add_job(fetch_owgr_rankings, 'cron', day_of_week='mon', hour=8, timezone=timezone('America/New_York'))
-    
-    
+    """
+    Download the full rankings list.
+
+    Returns:
+        list[dict]: Ranking entries in rank order
+    """
+    return list(iter_owgr_rankings())
+
+
+def _parse_entry(entry: dict):
+    # (OWGR player id, full name, rank, points average); player fields may be nested or flat
+    player = entry.get('player') or entry
+    name = player.get('fullName') or ' '.join(
+        part for part in (player.get('firstName'), player.get('lastName')) if part)
+    if ',' in name:
+        last, first = (part.strip() for part in name.split(',', 1))
+        name = f"{first} {last}"
+    return player.get('id'), name, entry.get('rank'), entry.get('pointsAverage')
+
+
+def _append_history(connection, rows: list, now: datetime):
+    # New most-recent GolferRanking rows, retiring the previous ones
+    history = GolferRanking.__table__
+    connection.execute(
+        update(history)
+        .where(history.c.golfer_id.in_([row['golfer_id'] for row in rows]), history.c.is_most_recent == True)
+        .values(is_most_recent=False))
+    connection.execute(insert(history), [
+        {'golfer_id': row['golfer_id'], 'has_owgr': row['owgr'] is not None, 'owgr': row['owgr'],
+         'is_most_recent': True, 'timestamp_utc': now}
+        for row in rows])
+
+
+def _write_batch(connection, batch: list, now: datetime) -> int:
+    """
+    Upsert a batch of current rankings and append history for the changed ones.
+
+    Args:
+        connection: Connection in a transaction
+        batch (list): Row dicts for golfer_current_ranking
+        now (datetime): Ingestion time (UTC)
+
+    Returns:
+        int: Golfers whose rank changed
+    """
+    current = GolferCurrentRanking.__table__
+    previous = dict(connection.execute(
+        select(current.c.golfer_id, current.c.owgr)
+        .where(current.c.golfer_id.in_([row['golfer_id'] for row in batch]))).all())
+    changed = [row for row in batch if previous.get(row['golfer_id']) != row['owgr']]
+
+    connection.execute(
+        upsert_statement(current, connection.dialect.name, ['golfer_id'],
+                         ['owgr_player_id', 'owgr', 'points_average', 'updated_at']),
+        batch)
+    if changed:
+        _append_history(connection, changed, now)
+    return len(changed)
+
+
+def ingest_owgr_rankings(entries=None, batch_size: int = BATCH_SIZE) -> dict:
+    """
+    Store the current OWGR rankings. Needs an app context.
+
+    Args:
+        entries (iterable): Ranking entries, defaults to streaming them from OWGR
+        batch_size (int): Golfers per upsert
+
+    Returns:
+        dict: Counts of 'ranked', 'changed', 'dropped' and 'unmatched' golfers
+    """
+    now = datetime.utcnow()
+    index = get_golfer_index()
+    current = GolferCurrentRanking.__table__
+    engine = db.engine
+    with engine.connect() as connection:
+        by_owgr_id = dict(connection.execute(
+            select(current.c.owgr_player_id, current.c.golfer_id)
+            .where(current.c.owgr_player_id.isnot(None))).all())
+        previously_ranked = set(connection.execute(select(current.c.golfer_id)).scalars())
+
+    counts = {'ranked': 0, 'changed': 0, 'dropped': 0, 'unmatched': 0}
+    seen = set()
+    batch = []
+
+    def flush():
+        with engine.begin() as connection:
+            counts['changed'] += _write_batch(connection, batch, now)
+        counts['ranked'] += len(batch)
+        batch.clear()
+
+    for entry in (iter_owgr_rankings() if entries is None else entries):
+        owgr_player_id, name, rank, points_average = _parse_entry(entry)
+        golfer_id = by_owgr_id.get(owgr_player_id) or index.find_by_name(name)
+        if golfer_id is None or rank is None:
+            counts['unmatched'] += 1
+            logger.debug("No golfer for OWGR entry %s (%s)", name, owgr_player_id)
+            continue
+        if golfer_id in seen:
+            continue
+        seen.add(golfer_id)
+        batch.append({'golfer_id': golfer_id, 'owgr_player_id': owgr_player_id, 'owgr': int(rank),
+                      'points_average': points_average, 'updated_at': now})
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    # An empty or failed download must not unrank everyone
+    dropped = sorted(previously_ranked - seen) if seen else []
+    for start in range(0, len(dropped), batch_size):
+        chunk = dropped[start:start + batch_size]
+        with engine.begin() as connection:
+            _append_history(connection, [{'golfer_id': golfer_id, 'owgr': None} for golfer_id in chunk], now)
+            connection.execute(delete(current).where(current.c.golfer_id.in_(chunk)))
+    counts['dropped'] = len(dropped)
+
+    logger.info("Ingested OWGR rankings: %s", counts)
+    return counts
+
+
+def schedule_owgr_rankings_fetch(scheduler, app):
+    # Schedule the ingestion to run every Monday at 8:00 AM EST, once across all workers
+    def run():
+        from jobs.job_runner import run_job
+        with app.app_context():
+            run_job('owgr_rankings', ingest_owgr_rankings, min_interval=6 * 24 * 3600)
+
+    scheduler.add_job(run, 'cron', day_of_week='mon', hour=8, timezone=timezone('America/New_York'),
+                      id='owgr_rankings', replace_existing=True)
+
 
 # Call the function
 if __name__=='__main__':
-    fetch_owgr_rankings()
\ No newline at end of file
+    from app import create_app
+
+    with create_app().app_context():
+        print(ingest_owgr_rankings())
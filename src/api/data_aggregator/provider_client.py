@@ -0,0 +1,406 @@
+"""
+Shared HTTP client for external data providers (DataGolf, SportContent/RapidAPI, OWGR).
+
+Every fetcher in data_aggregator and the jobs goes through provider_get() so that:
+- connections are kept alive and reused (one pooled requests.Session per host)
+- every request has a connect and read timeout
+- 429 and 5xx responses, timeouts and dropped connections are retried with
+  jittered exponential backoff (honouring Retry-After)
+- each provider has a request budget (token bucket), so a backfill or a burst
+  of live refreshes can't blow through the provider's rate limit
+- request counts and latency are recorded per provider (see get_provider_stats)
+
+Feeds that are polled repeatedly (leaderboards, entry lists, live DataGolf
+feeds) should use fetch_feed() instead of provider_get(). It remembers the
+last response for each URL, revalidates it with If-None-Match/If-Modified-Since
+when the provider sends validators, and reports whether the body actually
+changed (by content hash) so callers can skip re-parsing and re-ingesting it.
+
+Base URLs can be overridden per provider (DATAGOLF_BASE_URL, DATAGOLF_WEB_BASE_URL,
+SPORTCONTENT_BASE_URL, OWGR_BASE_URL), and setting PROVIDER_FIXTURES_DIR swaps the
+network for recorded fixtures (see data_aggregator.fixture_transport). PROVIDER_RATE_LIMIT=0
+disables the request budgets, e.g. when replaying fixtures in a benchmark.
+"""
+
+import hashlib
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+import requests
+from cachetools import LRUCache
+from requests.adapters import HTTPAdapter
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = float(os.getenv('PROVIDER_CONNECT_TIMEOUT', '3.05'))
+READ_TIMEOUT = float(os.getenv('PROVIDER_READ_TIMEOUT', '30'))
+MAX_RETRIES = int(os.getenv('PROVIDER_MAX_RETRIES', '3'))
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 20.0
+POOL_MAXSIZE = 10
+RATE_LIMIT_ENABLED = os.getenv('PROVIDER_RATE_LIMIT', '1') != '0'
+FIXTURES_DIR = os.getenv('PROVIDER_FIXTURES_DIR')
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+FEED_CACHE_SIZE = int(os.getenv('PROVIDER_FEED_CACHE_SIZE', '256'))
+
+
+@dataclass
+class ProviderConfig:
+    """
+    Connection settings for a data provider.
+
+    Attributes:
+        base_url (str): Base URL that relative request paths are joined to
+        rate_per_second (float): Sustained request budget
+        burst (int): Number of requests that may be made back to back
+        headers (callable): Returns default headers for the provider (read lazily so keys can come from .env)
+    """
+    base_url: str
+    rate_per_second: float
+    burst: int
+    headers: callable = field(default=lambda: {})
+
+
+def _sportcontent_headers():
+    from data_aggregator.sportcontentapi.headers import sportcontentapi_headers
+    return sportcontentapi_headers
+
+
+PROVIDERS = {
+    'datagolf': ProviderConfig(
+        os.getenv('DATAGOLF_BASE_URL', 'https://feeds.datagolf.com'), rate_per_second=2, burst=5
+    ),
+    'datagolf_web': ProviderConfig(
+        os.getenv('DATAGOLF_WEB_BASE_URL', 'https://datagolf.com'), rate_per_second=1, burst=2
+    ),
+    'sportcontent': ProviderConfig(
+        os.getenv('SPORTCONTENT_BASE_URL', 'https://golf-leaderboard-data.p.rapidapi.com'),
+        rate_per_second=1, burst=3, headers=_sportcontent_headers
+    ),
+    'owgr': ProviderConfig(
+        os.getenv('OWGR_BASE_URL', 'https://apiweb.owgr.com'), rate_per_second=1, burst=2
+    ),
+}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used as a per-provider request budget.
+
+    Args:
+        rate (float): Tokens added per second
+        capacity (int): Maximum number of stored tokens
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass
+class ProviderStats:
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    latency_seconds: float = 0.0
+    not_modified: int = 0
+    unchanged: int = 0
+
+
+@dataclass
+class CachedFeed:
+    """Last response seen for a feed URL."""
+    data: object
+    content_hash: str
+    etag: str = None
+    last_modified: str = None
+    fetched_at: float = 0.0
+
+
+@dataclass
+class FeedResponse:
+    """
+    Result of fetch_feed().
+
+    Attributes:
+        data: Parsed JSON body (the cached copy when the feed didn't change)
+        content_hash (str): SHA-256 of the response body
+        changed (bool): False if the provider answered 304 or sent a byte-identical body
+        not_modified (bool): True if the provider answered 304 Not Modified
+        fetched_at (float): Epoch seconds when the body was last downloaded
+    """
+    data: object
+    content_hash: str
+    changed: bool
+    not_modified: bool = False
+    fetched_at: float = 0.0
+
+
+class ProviderClient:
+    """
+    Pooled, retrying, rate-limited HTTP client shared by all provider fetchers.
+
+    Args:
+        providers (dict): ProviderConfig for each provider name
+    """
+
+    def __init__(self, providers: dict):
+        self.providers = providers
+        self._sessions = {}
+        self._buckets = {
+            name: TokenBucket(config.rate_per_second, config.burst)
+            for name, config in providers.items()
+        }
+        self._stats = {name: ProviderStats() for name in providers}
+        self._feeds = LRUCache(maxsize=FEED_CACHE_SIZE)
+        self._lock = threading.Lock()
+
+    def url_for(self, provider: str, path: str) -> str:
+        """Join a relative path to the provider's base URL, absolute URLs are returned as is."""
+        if path.startswith('http://') or path.startswith('https://'):
+            return path
+        return f"{self.providers[provider].base_url.rstrip('/')}/{path.lstrip('/')}"
+
+    def session_for(self, url: str) -> requests.Session:
+        """Get the keep-alive session for the URL's host, creating it on first use."""
+        host = urlsplit(url).netloc
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    session = requests.Session()
+                    adapter = self._make_adapter()
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._sessions[host] = session
+        return session
+
+    def _make_adapter(self):
+        if FIXTURES_DIR:
+            from data_aggregator.fixture_transport import FixtureAdapter
+            hosts = {urlsplit(config.base_url).netloc: name for name, config in self.providers.items()}
+            return FixtureAdapter.from_env(hosts)
+        return HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE)
+
+    def _backoff(self, attempt: int, response=None) -> float:
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), BACKOFF_MAX_SECONDS)
+        # Full jitter: random delay up to the exponential cap
+        return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+    def _record(self, provider: str, elapsed: float, error: bool = False, retry: bool = False, status='error'):
+        metrics.observe_provider(provider, elapsed, status)
+        with self._lock:
+            stats = self._stats[provider]
+            stats.requests += 1
+            stats.latency_seconds += elapsed
+            stats.errors += int(error)
+            stats.retries += int(retry)
+
+    def request(self, provider: str, method: str, path: str, params=None, headers=None,
+                timeout=None, max_retries: int = None, **kwargs) -> requests.Response:
+        """
+        Make a request to a provider.
+
+        Args:
+            provider (str): Name of the provider in PROVIDERS
+            method (str): HTTP method
+            path (str): Path relative to the provider's base URL, or an absolute URL
+            params (dict): Query string parameters
+            headers (dict): Extra headers, merged over the provider's default headers
+            timeout (tuple): (connect, read) timeout in seconds
+            max_retries (int): Retries for retryable failures, defaults to PROVIDER_MAX_RETRIES
+
+        Returns:
+            requests.Response: The final response. Non-retryable error statuses, and
+                retryable ones once retries are exhausted, are returned for the caller
+                to handle (e.g. with raise_for_status()).
+
+        Raises:
+            requests.RequestException: If the request still fails to connect or times
+                out after all retries.
+        """
+        config = self.providers[provider]
+        url = self.url_for(provider, path)
+        request_headers = {**config.headers(), **(headers or {})}
+        timeout = timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+        max_retries = MAX_RETRIES if max_retries is None else max_retries
+        session = self.session_for(url)
+
+        attempt = 0
+        while True:
+            if RATE_LIMIT_ENABLED:
+                self._buckets[provider].acquire()
+            started = time.monotonic()
+            try:
+                response = session.request(
+                    method, url, params=params, headers=request_headers, timeout=timeout, **kwargs
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                retry = attempt < max_retries
+                self._record(provider, time.monotonic() - started, error=True, retry=retry)
+                if not retry:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning("%s request to %s failed (%s), retrying in %.1fs", provider, urlsplit(url).path, e, delay)
+            else:
+                retry = response.status_code in RETRY_STATUSES and attempt < max_retries
+                self._record(provider, time.monotonic() - started, error=response.status_code >= 400, retry=retry,
+                             status=response.status_code)
+                if not retry:
+                    return response
+                delay = self._backoff(attempt, response)
+                logger.warning("%s request to %s returned %s, retrying in %.1fs", provider, urlsplit(url).path, response.status_code, delay)
+                response.close()
+
+            attempt += 1
+            time.sleep(delay)
+
+    def get(self, provider: str, path: str, **kwargs) -> requests.Response:
+        return self.request(provider, 'GET', path, **kwargs)
+
+    def fetch_feed(self, provider: str, path: str, params=None, **kwargs) -> FeedResponse:
+        """
+        GET a JSON feed, revalidating and deduplicating against the last response.
+
+        Args:
+            provider (str): Name of the provider in PROVIDERS
+            path (str): Path relative to the provider's base URL, or an absolute URL
+            params (dict): Query string parameters, part of the cache key
+            **kwargs: Passed to request()
+
+        Returns:
+            FeedResponse: Parsed body and whether it changed since the last fetch
+
+        Raises:
+            requests.HTTPError: If the provider returns an error status
+        """
+        url = self.url_for(provider, path)
+        key = (provider, url, tuple(sorted((params or {}).items())))
+        with self._lock:
+            cached = self._feeds.get(key)
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if cached is not None:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+
+        response = self.request(provider, 'GET', url, params=params, headers=headers, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            metrics.count_cache(f"feed:{provider}", hit=True)
+            with self._lock:
+                self._stats[provider].not_modified += 1
+            return FeedResponse(cached.data, cached.content_hash, changed=False,
+                                not_modified=True, fetched_at=cached.fetched_at)
+
+        response.raise_for_status()
+        content_hash = hashlib.sha256(response.content).hexdigest()
+
+        if cached is not None and cached.content_hash == content_hash:
+            # Providers without validators: same bytes, so skip parsing and keep the cached copy
+            metrics.count_cache(f"feed:{provider}", hit=True)
+            with self._lock:
+                self._stats[provider].unchanged += 1
+            cached.etag = response.headers.get('ETag') or cached.etag
+            cached.last_modified = response.headers.get('Last-Modified') or cached.last_modified
+            return FeedResponse(cached.data, content_hash, changed=False, fetched_at=cached.fetched_at)
+
+        metrics.count_cache(f"feed:{provider}", hit=False)
+        entry = CachedFeed(
+            data=response.json(),
+            content_hash=content_hash,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            fetched_at=time.time(),
+        )
+        with self._lock:
+            self._feeds[key] = entry
+        return FeedResponse(entry.data, content_hash, changed=True, fetched_at=entry.fetched_at)
+
+    def clear_feeds(self):
+        """Forget every cached feed so the next fetch downloads it in full."""
+        with self._lock:
+            self._feeds.clear()
+
+    def stats(self) -> dict:
+        """Snapshot of request counters and latency per provider."""
+        with self._lock:
+            return {
+                name: {
+                    'requests': stats.requests,
+                    'errors': stats.errors,
+                    'retries': stats.retries,
+                    'latency_seconds': round(stats.latency_seconds, 6),
+                    'not_modified': stats.not_modified,
+                    'unchanged': stats.unchanged,
+                }
+                for name, stats in self._stats.items()
+            }
+
+
+client = ProviderClient(PROVIDERS)
+
+
+def provider_get(provider: str, path: str, **kwargs) -> requests.Response:
+    """
+    GET a provider resource through the shared client.
+
+    Args:
+        provider (str): 'datagolf', 'datagolf_web', 'sportcontent' or 'owgr'
+        path (str): Path relative to the provider's base URL, or an absolute URL
+        **kwargs: Passed to ProviderClient.request (params, headers, timeout, ...)
+
+    Returns:
+        requests.Response: The response
+    """
+    return client.get(provider, path, **kwargs)
+
+
+def fetch_feed(provider: str, path: str, **kwargs) -> FeedResponse:
+    """
+    GET a JSON feed through the shared client's feed cache.
+
+    Args:
+        provider (str): 'datagolf', 'datagolf_web', 'sportcontent' or 'owgr'
+        path (str): Path relative to the provider's base URL, or an absolute URL
+        **kwargs: Passed to ProviderClient.fetch_feed (params, headers, timeout, ...)
+
+    Returns:
+        FeedResponse: Parsed body, content hash and whether it changed
+    """
+    return client.fetch_feed(provider, path, **kwargs)
+
+
+def get_provider_stats() -> dict:
+    """Request counts, errors, retries and total latency for each provider."""
+    return client.stats()
@@ -1,13 +1,11 @@
-import requests
-from pytz import timezone
-from data_aggregator.sportcontentapi.headers import sportcontentapi_headers
-from modules.tournament.functions import get_upcoming_tournament
+from data_aggregator.provider_client import fetch_feed
 
 
-url = "https://golf-leaderboard-data.p.rapidapi.com/entry-list/"
-
-# TODO: This needs to be updated every friday for the following week, and then more frequently  as the tournament approaches, ideally monday, tuesday, and wednesday.  Perhaps both wednesday morning and night.
+path = "/entry-list/"
 
+# Content hash of the last entry list stored per tournament, recorded after the
+# commit so a failed write is retried on the next poll
+_stored_entry_hashes = {}
 
 def get_entry_list(tournament_id):
     """
@@ -19,79 +17,63 @@ def get_entry_list(tournament_id):
     Returns:
         dict: The JSON response containing the list of entries.
     """
-    response = requests.get(f"{url}{tournament_id}", headers=sportcontentapi_headers)
-    return response.json()
+    return fetch_feed('sportcontent', f"{path}{tournament_id}").data
 
 
-def schedule_entry_list_update(scheduler):
+def update_entry_list(tournament_id: int):
     """
-    Schedules the entry list update to occur at the appropriate times with appropriate values.
+    Fetches the entry list of a tournament and adds its new entries to the field.
+
+    Args:
+        tournament_id (int): Database ID of the tournament
 
     Returns:
-        None
+        int: Number of entries added, or None if the tournament or its entry list is missing
     """
-    
-    scheduler.add_job(
-        get_entry_list,
-        "cron",
-        day_of_week="fri",
-        hour=12,
-        timezone=timezone("America/New_York"),
-        args=[get_upcoming_tournament()["sportcontent_api_id"]],
-    )
-    
-    scheduler.add_job(
-        get_entry_list,
-        "cron",
-        day_of_week="mon",
-        hour=8,
-        timezone=timezone("America/New_York"),
-        args=[get_upcoming_tournament()["sportcontent_api_id"]],
-    )
-    
-    scheduler.add_job(
-        get_entry_list,
-        "cron",
-        day_of_week="tue",
-        hour=8,
-        timezone=timezone("America/New_York"),
-        args=[get_upcoming_tournament()["sportcontent_api_id"]],
-    )
-   
-    scheduler.add_job(
-        get_entry_list,
-        "cron",
-        day_of_week="wed",
-        hour=6,
-        timezone=timezone("America/New_York"),
-        args=[get_upcoming_tournament()["sportcontent_api_id"]],
-    )
-    
-    scheduler.add_job(
-        get_entry_list,
-        "cron",
-        day_of_week="wed",
-        hour=12,
-        timezone=timezone("America/New_York"),
-        args=[get_upcoming_tournament()["sportcontent_api_id"]],
-    )
-    
-    scheduler.add_job(
-        get_entry_list,
-        "cron",
-        day_of_week="wed",
-        hour=8,
-        timezone=timezone("America/New_York"),
-        args=[get_upcoming_tournament()["sportcontent_api_id"]],
-    )
-    
-    scheduler.add_job(
-        get_entry_list,
-        "cron",
-        day_of_week="thur",
-        hour=0,
-        timezone=timezone("America/New_York"),
-        args=[get_upcoming_tournament()["sportcontent_api_id"]],
-    )
+    from jobs.calculate_points.calculate_points import add_entry_list
+    from models import Tournament
+    from utils.db_connector import db
+
+    tournament = db.session.get(Tournament, tournament_id)
+    if not tournament or not tournament.sportcontent_api_id:
+        return None
+
+    feed = fetch_feed('sportcontent', f"{path}{tournament.sportcontent_api_id}")
+    if _stored_entry_hashes.get(tournament_id) == feed.content_hash:
+        return 0
+    entry_list = ((feed.data or {}).get('results') or {}).get('entry_list')
+    if not entry_list:
+        return None
+
+    try:
+        added = add_entry_list(tournament, entry_list)
+        db.session.commit()
+        _stored_entry_hashes[tournament_id] = feed.content_hash
+        return added
+    except Exception:
+        db.session.rollback()
+        raise
+
 
+def schedule_entry_list_update(scheduler, app):
+    """
+    Schedules the entry list update for the upcoming tournament, adding new
+    entries to its field (see update_entry_list). Polls get more
+    frequent as the tournament approaches (see jobs/adaptive_poller.py), and the
+    tournament is looked up on every run rather than once at registration.
+
+    Args:
+        scheduler: APScheduler scheduler
+        app: Flask app for the calendar query
+
+    Returns:
+        AdaptivePoller: The started poller
+    """
+    from jobs.adaptive_poller import AdaptivePoller, PollTask, field_cadence
 
+    poller = AdaptivePoller(scheduler, app, [
+        PollTask('entry_list', ('upcoming',), field_cadence,
+                 lambda tournament: update_entry_list(tournament['id'])),
+    ], job_id='entry_list_update')
+    poller.start()
+    return poller
@@ -1,7 +1,23 @@
 import requests
-from data_aggregator.sportcontentapi.headers import sportcontentapi_headers
+from data_aggregator.provider_client import fetch_feed
 
-url = "https://golf-leaderboard-data.p.rapidapi.com/leaderboard/"
+path = "/leaderboard/"
+
+def get_tournament_leaderboard_feed(tournament_id:int):
+    """
+    Retrieves the leaderboard feed for a specific tournament, revalidated against the last fetch.
+
+    Args:
+        tournament_id (int): The ID of the tournament. This is the id used by SPORTCONTENTAPI.
+
+    Returns:
+        FeedResponse: The leaderboard JSON with its content hash and changed flag, or None if request fails.
+    """
+    try:
+        return fetch_feed('sportcontent', f"{path}{tournament_id}")
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching tournament leaderboard: {e}")
+        return None
 
 def get_tournament_leaderboard_raw(tournament_id:int):
     """
@@ -14,15 +30,8 @@ def get_tournament_leaderboard_raw(tournament_id:int):
     Returns:
         dict: The leaderboard data in JSON format or None if request fails.
     """
-    try:
-        query_url = f"{url}{tournament_id}"
-        response = requests.get(query_url, headers=sportcontentapi_headers)
-        response.raise_for_status()
-        raw_data = response.json()
-        return raw_data
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching tournament leaderboard: {e}")
-        return None
+    feed = get_tournament_leaderboard_feed(tournament_id)
+    return feed.data if feed else None
 
 def get_tournament_leaderboard_clean(tournament_id:int):
     """
@@ -35,6 +44,18 @@ def get_tournament_leaderboard_clean(tournament_id:int):
         list: The cleaned leaderboard results or None if no data available.
     """
     raw_data = get_tournament_leaderboard_raw(tournament_id)
+    return extract_leaderboard(raw_data)
+
+def extract_leaderboard(raw_data):
+    """
+    Extracts the leaderboard array from the nested leaderboard response.
+
+    Args:
+        raw_data (dict): Leaderboard JSON as returned by the API
+
+    Returns:
+        list: The leaderboard results or None if no data available.
+    """
     if not raw_data or 'results' not in raw_data:
         return None
     
@@ -1,7 +1,6 @@
-import requests
-from data_aggregator.sportcontentapi.headers import sportcontentapi_headers
+from data_aggregator.provider_client import provider_get
 
-url = "https://golf-leaderboard-data.p.rapidapi.com/scorecard/"
+path = "/scorecard/"
 
 def get_player_scorecard_raw(golfer_id:int, tournament_id:int):
     """
@@ -15,8 +14,7 @@ def get_player_scorecard_raw(golfer_id:int, tournament_id:int):
         dict: The scorecard information in JSON format.
     """
     
-    query_url = f"{url} + {tournament_id}/{golfer_id}"
-    response = requests.get(query_url, headers=sportcontentapi_headers)
+    response = provider_get('sportcontent', f"{path}{tournament_id}/{golfer_id}")
     return response.json()
 
 if __name__ == "__main__":
@@ -1,7 +1,6 @@
-import requests
-from data_aggregator.sportcontentapi.headers import sportcontentapi_headers
+from data_aggregator.provider_client import fetch_feed
 
-url = "https://golf-leaderboard-data.p.rapidapi.com/world-rankings"
+path = "/world-rankings"
 
 def get_world_rankings():
     """
@@ -11,8 +10,7 @@ def get_world_rankings():
         dict: The world rankings data in JSON format.
     """
     
-    response = requests.get(url, headers=sportcontentapi_headers)
-    return response.json()
+    return fetch_feed('sportcontent', path).data
 
 if __name__ == "__main__":
     print (get_world_rankings())
\ No newline at end of file
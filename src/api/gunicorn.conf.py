@@ -1,16 +1,54 @@
-import multiprocessing
+"""
+Gunicorn configuration. This file is the single source of truth for how the API
+is served: the Dockerfile runs `gunicorn -c gunicorn.conf.py` and only the
+environment variables below change the worker model.
+
+Most request time is spent waiting on Cloud SQL and DataGolf, so the default is
+threaded workers (gthread): each worker process serves GUNICORN_THREADS requests
+concurrently while others are blocked on I/O. gevent is supported for higher
+concurrency per process (gevent is pinned in requirements.txt; the worker
+monkey-patches sockets so the database driver and requests yield while waiting).
+
+    GUNICORN_WORKER_CLASS         gthread (default), gevent or sync
+    WEB_CONCURRENCY               Worker processes (default: one per available CPU)
+    GUNICORN_THREADS              Threads per gthread worker (default 8)
+    GUNICORN_WORKER_CONNECTIONS   Concurrent requests per gevent worker (default 100)
+    GUNICORN_TIMEOUT              Worker timeout in seconds, 0 disables (default 120)
+    GUNICORN_KEEPALIVE            Keep-alive seconds (default 5)
+    GUNICORN_MAX_REQUESTS         Recycle workers after this many requests, 0 disables (default 0)
+    GUNICORN_LOG_LEVEL            Log level (default info)
+"""
+
 import os
+
 from dotenv import load_dotenv
 
 # Load environment variables at config time
 load_dotenv()
 
+
+def _cpu_count() -> int:
+    # Honour CPU affinity / container limits where the platform exposes them
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
 # Server socket
 port = os.getenv("PORT", "8080")
 bind = f"0.0.0.0:{port}"
-workers = multiprocessing.cpu_count() * 2 + 1
-threads = 2
-timeout = 120
+
+# Worker model
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(os.getenv("WEB_CONCURRENCY", _cpu_count()))
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "100"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
 
 # Logging
 accesslog = "-"
@@ -30,9 +68,29 @@ reload = os.getenv("FLASK_ENV") == "development"
 # Process naming
 proc_name = "golf_pickem_api"
 
-# Worker class
-worker_class = "sync"
+
+def on_starting(server):
+    # Drop metrics snapshots left by workers of a previous run
+    from utils.metrics import clear_snapshots
+    clear_snapshots()
+
+
+def child_exit(server, worker):
+    # A dead worker's metrics snapshot would otherwise be merged into every scrape
+    from utils.metrics import remove_snapshot
+    remove_snapshot(worker.pid)
+
+
+def post_fork(server, worker):
+    if worker_class == "gevent":
+        # Firestore talks gRPC, which needs its own hook to cooperate with gevent
+        try:
+            from grpc.experimental import gevent as grpc_gevent
+            grpc_gevent.init_gevent()
+        except ImportError:
+            pass
+
 
 # SSL (uncomment for production with SSL)
 # keyfile = "/path/to/keyfile"
-# certfile = "/path/to/certfile"
\ No newline at end of file
+# certfile = "/path/to/certfile"
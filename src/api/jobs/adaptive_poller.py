@@ -0,0 +1,236 @@
+"""
+Tournament-phase-aware polling.
+
+Instead of fixed cron times, one self-rescheduling APScheduler job looks at the
+tournament calendar on every run and decides what to poll and when to wake up
+next. Targets (which tournament) and cadences are recomputed at each run, so
+nothing is frozen at registration time.
+
+Phases of a tournament, relative to now:
+
+    upcoming     Starts within the next FIELD_WINDOW. Field polls get more frequent
+                 as the first tee time approaches (daily, 6-hourly, hourly, then
+                 every 15 minutes in the last few hours)
+    live         Between the first tee time and the end of the final day. Results
+                 every 10 minutes during playing hours, every 3 hours overnight
+    finalizing   Up to FINALIZING after the end, for playoffs and official results.
+                 Results hourly
+    (none)       Nothing to poll; the poller sleeps until the next tournament
+                 comes into the field window, at most IDLE
+
+    poller = AdaptivePoller(scheduler, app, [
+        PollTask('field', ('upcoming',), field_cadence, lambda t: update_tournament_entries(tournament_id=t['id'])),
+    ])
+    poller.start()
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+from typing import Callable
+
+import pytz
+
+from jobs.job_runner import run_job
+from models import Tournament
+from modules.tournament.functions import tournament_start_utc
+from utils.db_routing import read_replica
+
+logger = logging.getLogger(__name__)
+
+FIELD_WINDOW = timedelta(days=7)
+FINALIZING = timedelta(hours=36)
+IDLE = timedelta(hours=12)
+MIN_SLEEP = timedelta(minutes=1)
+PLAYING_HOURS = (6, 21)  # Local hours with play on course
+
+
+@dataclass
+class PollTask:
+    """
+    Something to poll for tournaments in some phases.
+
+    Attributes:
+        name (str): Task name, for logs and run bookkeeping
+        phases (tuple): Phases the task runs in
+        cadence (callable): (tournament, now) -> timedelta between runs
+        run (callable): (tournament) -> result, called with an app context
+    """
+    name: str
+    phases: tuple
+    cadence: Callable
+    run: Callable
+
+
+@dataclass
+class Plan:
+    """What to run now and when to wake up next."""
+    due: list = field(default_factory=list)  # (task, tournament) pairs
+    next_run: datetime = None
+
+
+def tournament_end_utc(tournament: dict) -> datetime:
+    """End of the last day of a tournament (local midnight) in UTC."""
+    tz = pytz.timezone(tournament['time_zone'] or 'America/New_York')
+    end_date = tournament['end_date'] or (tournament['start_utc'].astimezone(tz).date() + timedelta(days=3))
+    return tz.localize(datetime.combine(end_date + timedelta(days=1), time.min)).astimezone(pytz.UTC)
+
+
+def tournament_phase(tournament: dict, now: datetime) -> str:
+    """
+    The phase of a tournament at a time.
+
+    Returns:
+        str: 'upcoming', 'live', 'finalizing' or None
+    """
+    if now < tournament['start_utc']:
+        return 'upcoming' if tournament['start_utc'] - now <= FIELD_WINDOW else None
+    if now < tournament['end_utc']:
+        return 'live'
+    if now < tournament['end_utc'] + FINALIZING:
+        return 'finalizing'
+    return None
+
+
+def field_cadence(tournament: dict, now: datetime) -> timedelta:
+    """Field and entry-list polling: rare early in the week, frequent near the first tee time."""
+    until_start = tournament['start_utc'] - now
+    if until_start > timedelta(hours=72):
+        return timedelta(hours=24)
+    if until_start > timedelta(hours=24):
+        return timedelta(hours=6)
+    if until_start > timedelta(hours=3):
+        return timedelta(hours=1)
+    return timedelta(minutes=15)
+
+
+def results_cadence(tournament: dict, now: datetime) -> timedelta:
+    """Results polling: fast while players are on the course, slow overnight and after the event."""
+    if tournament_phase(tournament, now) == 'finalizing':
+        return timedelta(hours=1)
+    local_hour = now.astimezone(pytz.timezone(tournament['time_zone'] or 'America/New_York')).hour
+    if PLAYING_HOURS[0] <= local_hour < PLAYING_HOURS[1]:
+        return timedelta(minutes=10)
+    return timedelta(hours=3)
+
+
+def _boundaries(tournament: dict) -> list:
+    # Times at which a tournament changes phase, so the poller wakes up for them
+    return [tournament['start_utc'] - FIELD_WINDOW, tournament['start_utc'] - timedelta(hours=72),
+            tournament['start_utc'] - timedelta(hours=24), tournament['start_utc'] - timedelta(hours=3),
+            tournament['start_utc'], tournament['end_utc'], tournament['end_utc'] + FINALIZING]
+
+
+def plan(tasks: list, tournaments: list, last_runs: dict, now: datetime) -> Plan:
+    """
+    Decide which tasks are due and when to look again.
+
+    Args:
+        tasks (list): PollTasks
+        tournaments (list): Calendar entries (see load_calendar)
+        last_runs (dict): (task name, tournament id) -> last run time
+        now (datetime): Current time (UTC, aware)
+
+    Returns:
+        Plan: Due (task, tournament) pairs and the next wake-up time
+    """
+    result = Plan()
+    wake_times = [now + IDLE]
+    for tournament in tournaments:
+        phase = tournament_phase(tournament, now)
+        wake_times.extend(boundary for boundary in _boundaries(tournament) if boundary > now)
+        for task in tasks:
+            if phase not in task.phases:
+                continue
+            interval = task.cadence(tournament, now)
+            last_run = last_runs.get((task.name, tournament['id']))
+            if last_run is None or now - last_run >= interval:
+                result.due.append((task, tournament))
+                wake_times.append(now + interval)
+            else:
+                wake_times.append(last_run + interval)
+    result.next_run = max(min(wake_times), now + MIN_SLEEP)
+    return result
+
+
+def load_calendar(now: datetime) -> list:
+    """
+    Tournaments that can be in a phase around now, with start and end in UTC.
+
+    Returns:
+        list[dict]: id, sportcontent_api_id, tournament_name, time_zone, end_date, start_utc, end_utc
+    """
+    today = now.date()
+    with read_replica():
+        rows = (Tournament.query
+            .filter(Tournament.start_date >= today - timedelta(days=7),
+                    Tournament.start_date <= today + FIELD_WINDOW + timedelta(days=1))
+            .order_by(Tournament.start_date)
+            .all())
+    calendar = []
+    for row in rows:
+        tournament = {
+            'id': row.id,
+            'sportcontent_api_id': row.sportcontent_api_id,
+            'tournament_name': row.tournament_name,
+            'time_zone': row.time_zone,
+            'end_date': row.end_date,
+            'start_utc': tournament_start_utc(row.start_date, row.start_time, row.time_zone),
+        }
+        tournament['end_utc'] = tournament_end_utc(tournament)
+        calendar.append(tournament)
+    return calendar
+
+
+class AdaptivePoller:
+    """
+    A single APScheduler 'date' job that runs the due tasks and re-adds itself for
+    the next wake-up time computed by plan(). Tasks run through run_job, so
+    pollers in several workers or instances run each poll once.
+
+    Args:
+        scheduler: APScheduler scheduler
+        app: Flask app whose context the calendar query and tasks run in
+        tasks (list): PollTasks
+        job_id (str): Id of the scheduler job
+    """
+
+    def __init__(self, scheduler, app, tasks: list, job_id: str = 'adaptive_poller'):
+        self.scheduler = scheduler
+        self.app = app
+        self.tasks = tasks
+        self.job_id = job_id
+        self.last_runs = {}
+
+    def start(self):
+        """Run once right away; every run schedules the next one."""
+        self._schedule(datetime.now(pytz.UTC))
+
+    def _schedule(self, run_date: datetime):
+        self.scheduler.add_job(self.run, 'date', run_date=run_date, id=self.job_id, replace_existing=True)
+
+    def run(self):
+        """Poll what is due, then schedule the next run."""
+        now = datetime.now(pytz.UTC)
+        next_run = now + IDLE
+        try:
+            with self.app.app_context():
+                current = plan(self.tasks, load_calendar(now), self.last_runs, now)
+                next_run = current.next_run
+                for task, tournament in current.due:
+                    logger.info("Polling %s for %s (%s)", task.name, tournament['tournament_name'],
+                                tournament_phase(tournament, now))
+                    try:
+                        # Every worker runs a poller; the lease lets one of them run each poll
+                        interval = task.cadence(tournament, now)
+                        run_job(f"{task.name}:{tournament['id']}", task.run, tournament,
+                                min_interval=interval.total_seconds() * 0.9)
+                    except Exception as e:
+                        logger.error("Poll task %s failed for tournament %s: %s", task.name, tournament['id'], e,
+                                     exc_info=True)
+                    self.last_runs[(task.name, tournament['id'])] = now
+        except Exception as e:
+            logger.error("Adaptive poller run failed: %s", e, exc_info=True)
+        finally:
+            logger.info("Next poll at %s", next_run.isoformat())
+            self._schedule(next_run)
@@ -2,27 +2,23 @@ from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 from models import (
     League, ScoringRuleset, ScoringRule, Tournament, 
-    Golfer, TournamentGolfer, TournamentGolferResult
+    Golfer, TournamentGolfer, TournamentGolferResult, LeagueMemberTournamentScore
+)
+from sqlalchemy import delete, insert, update
+from data_aggregator.sportcontentapi.leaderboard import (
+    get_tournament_leaderboard_clean, get_tournament_leaderboard_feed, extract_leaderboard
 )
-from data_aggregator.sportcontentapi.leaderboard import get_tournament_leaderboard_clean
 from utils.db_connector import db, init_db
 from flask import Flask
-import json
-import os
-
-STATUS_MAP_PATH = os.path.join(os.path.dirname(__file__), 'status_map.json')
-
-def load_status_map():
-    """Load status mappings from JSON file, creating if doesn't exist"""
-    if os.path.exists(STATUS_MAP_PATH):
-        with open(STATUS_MAP_PATH, 'r') as f:
-            return json.load(f)
-    return {}
+from utils.query_stats import track_queries
+from utils.db_routing import read_replica
+from jobs.calculate_points.status_normalizer import (
+    KNOWN_STATUSES, record_status_mappings, normalize_status
+)
 
-def save_status_map(mappings):
-    """Save status mappings to JSON file"""
-    with open(STATUS_MAP_PATH, 'w') as f:
-        json.dump(mappings, f, indent=4)
+# Content hash of the last leaderboard successfully ingested per tournament, so an
+# unchanged feed can be skipped without rebuilding and diffing the results
+_ingested_leaderboard_hashes = {}
 
 def get_tournament_results(tournament_id: int):
     """
@@ -43,7 +39,7 @@ def get_tournament_results(tournament_id: int):
     # Get results using the SportContent API ID
     return get_tournament_leaderboard_clean(tournament.sportcontent_api_id)
 
-def process_team_event(tournament_id: int, result: dict, year: str):
+def process_team_event(tournament_id: int, result: dict, year: str, entries: list = None):
     """
     Process results for team events where names are stored with slashes
     
@@ -51,9 +47,12 @@ def process_team_event(tournament_id: int, result: dict, year: str):
         tournament_id (int): Tournament ID
         result (dict): Result data from API
         year (str): Tournament year
+        entries (list): Optional preloaded (TournamentGolfer, Golfer) pairs for the
+            tournament, one per golfer. Avoids a query per team when processing a
+            whole leaderboard
     
     Returns:
-        tuple: (tournament_golfer_id, cleaned_position, status)
+        list: The TournamentGolfer entries of the team members, or None
     """
     # Extract last names from the slash-formatted name
     first_name = result.get('first_name', '').strip()
@@ -69,13 +68,19 @@ def process_team_event(tournament_id: int, result: dict, year: str):
     print(f"\nProcessing team entry with last names: {team_last_names}")
     
     # Find matching golfers from tournament entries
-    matching_entries = (db.session.query(TournamentGolfer, Golfer)
-        .join(Golfer)
-        .filter(
-            TournamentGolfer.tournament_id == tournament_id,
-            TournamentGolfer.year == year,
-            Golfer.last_name.in_(team_last_names)
-        ).all())
+    if entries is not None:
+        matching_entries = [
+            (tg, golfer) for tg, golfer in entries
+            if golfer.last_name in team_last_names
+        ]
+    else:
+        matching_entries = (db.session.query(TournamentGolfer, Golfer)
+            .join(Golfer)
+            .filter(
+                TournamentGolfer.tournament_id == tournament_id,
+                TournamentGolfer.year == year,
+                Golfer.last_name.in_(team_last_names)
+            ).all())
     
     if not matching_entries:
         print(f"No matching entries found for team: {team_last_names}")
@@ -174,179 +179,339 @@ def process_tour_championship_results(results: list) -> list:
         print(f"Error processing TOUR Championship results: {e}")
         return results
 
-def update_tournament_entries_and_results(tournament_id: int, interactive: bool = False):
+def resolve_golfers(results: list) -> dict:
+    """
+    Resolves the golfers of a leaderboard in bulk.
+
+    Golfers are matched by SportContent API ID first, then by exact (case-insensitive)
+    first and last name, using two queries for the whole leaderboard.
+
+    Args:
+        results (list): Leaderboard rows from the API
+
+    Returns:
+        dict: Golfer for each resolvable player_id
+    """
+    with read_replica():
+        return _resolve_golfers(results)
+
+def _resolve_golfers(results: list) -> dict:
+    player_ids = {result.get('player_id') for result in results if result.get('player_id')}
+    golfers = {}
+    if player_ids:
+        golfers = {
+            golfer.sportcontent_api_id: golfer
+            for golfer in Golfer.query.filter(Golfer.sportcontent_api_id.in_(player_ids))
+        }
+
+    # Fallback to name matching for players without a sportcontent_api_id match
+    unresolved = {}
+    for result in results:
+        player_id = result.get('player_id')
+        first_name = result.get('first_name', '').strip()
+        last_name = result.get('last_name', '').strip()
+        if player_id and player_id not in golfers and first_name and last_name:
+            unresolved[player_id] = (first_name.lower(), last_name.lower())
+
+    if unresolved:
+        last_names = {last_name for _, last_name in unresolved.values()}
+        by_name = {}
+        for golfer in Golfer.query.filter(db.func.lower(Golfer.last_name).in_(last_names)):
+            by_name.setdefault((golfer.first_name.lower(), golfer.last_name.lower()), golfer)
+
+        for player_id, name in unresolved.items():
+            golfer = by_name.get(name)
+            if golfer:
+                print(f"Found golfer by name match: {golfer.full_name} "
+                      f"(API ID: {player_id} -> DB ID: {golfer.sportcontent_api_id})")
+                golfers[player_id] = golfer
+
+    return golfers
+
+def add_entry_list(tournament: Tournament, entry_list: list) -> int:
+    """
+    Adds the missing field entries of a tournament in bulk, without committing.
+
+    Golfers are resolved for the whole entry list at once (see resolve_golfers) and
+    compared with the entries already in the database, so a tournament costs a
+    few queries however large its field is.
+
+    Args:
+        tournament (Tournament): The tournament
+        entry_list (list): Entries from the SportContent entry list
+
+    Returns:
+        int: Number of entries added
+    """
+    golfers = resolve_golfers(entry_list)
+    for entry in entry_list:
+        if entry.get('player_id') not in golfers:
+            print(f"No match found for: {entry.get('first_name', '')} {entry.get('last_name', '')} "
+                  f"(API ID: {entry.get('player_id')})")
+
+    year = str(tournament.year)
+    existing = {golfer_id for (golfer_id,) in db.session.query(TournamentGolfer.golfer_id)
+                .filter_by(tournament_id=tournament.id, year=year)}
+    rows = []
+    for golfer in golfers.values():
+        if golfer.id in existing:
+            continue
+        existing.add(golfer.id)
+        rows.append({
+            'tournament_id': tournament.id,
+            'golfer_id': golfer.id,
+            'year': year,
+            'is_active': True,
+            'is_most_recent': True
+        })
+
+    if rows:
+        db.session.execute(insert(TournamentGolfer.__table__), rows)
+    return len(rows)
+
+def build_result_rows(tournament: Tournament, results: list, interactive: bool = False) -> dict:
+    """
+    Computes the full result set for a tournament in memory.
+
+    Resolves every leaderboard row to a TournamentGolfer entry (creating missing
+    entries) using bulk lookups, without touching TournamentGolferResult.
+
+    Args:
+        tournament (Tournament): The tournament being updated
+        results (list): Leaderboard rows from the API
+        interactive (bool): If True, prompts for unknown statuses and ambiguous team members
+
+    Returns:
+        dict: Result values ({'result', 'status', 'score_to_par'}) keyed by tournament_golfer_id
+    """
+    unknown_statuses = {}  # Answers given for unknown statuses during this run
+
+    year = str(tournament.year)
+
+    # All field entries for the tournament, most recent entry last so it wins below
+    entries = (db.session.query(TournamentGolfer, Golfer)
+        .join(Golfer, TournamentGolfer.golfer_id == Golfer.id)
+        .filter(TournamentGolfer.tournament_id == tournament.id)
+        .order_by(TournamentGolfer.is_most_recent, TournamentGolfer.id)
+        .all())
+    latest_entries = {golfer.id: (tg, golfer) for tg, golfer in entries}
+    entry_by_golfer = {golfer_id: tg for golfer_id, (tg, _) in latest_entries.items()}
+
+    golfers = resolve_golfers(results)
+
+    rows = {}
+    new_entries = []
+    for result in results:
+        position = result.get('position', '')
+        raw_status = result.get('status', 'unknown').lower()
+        score_to_par = result.get('total_to_par')
+
+        # Normalize the status, asking for (or defaulting) unknown ones
+        clean_status = normalize_status(raw_status) or unknown_statuses.get(raw_status)
+        if clean_status is None:
+            if interactive:
+                print(f"\nUnknown status '{raw_status}'")
+                print(f"Known statuses: {', '.join(KNOWN_STATUSES)}")
+                clean_status = input("Enter correct status: ").lower().strip()
+                unknown_statuses[raw_status] = clean_status
+                print(f"Added new status mapping: {raw_status} -> {clean_status}")
+            else:
+                print(f"Unknown status '{raw_status}' defaulting to 'complete'")
+                clean_status = 'complete'
+
+        values = {
+            'result': position,
+            'status': clean_status,
+            'score_to_par': score_to_par
+        }
+
+        # Check for team event
+        first_name = result.get('first_name', '').strip()
+        if first_name.endswith('/'):
+            tournament_golfers = process_team_event(tournament.id, result, year, entries=list(latest_entries.values()))
+            if not tournament_golfers:
+                print("Failed to process team entry")
+                continue
+
+            # Create result entries for both team members
+            for tournament_golfer in tournament_golfers:
+                rows[tournament_golfer.id] = values
+            continue
+
+        # Not a team event - proceed with normal player_id lookup
+        player_id = result.get('player_id')
+        if not player_id:
+            print(f"Missing player_id in result: {result}")
+            continue
+
+        # TODO: Create new golfer entry when not found
+        golfer = golfers.get(player_id)
+        if not golfer:
+            print(f"No match found for: {result.get('first_name', '')} {result.get('last_name', '')} (API ID: {player_id})")
+            continue
+
+        tournament_golfer = entry_by_golfer.get(golfer.id)
+        if not tournament_golfer:
+            tournament_golfer = TournamentGolfer(
+                tournament_id=tournament.id,
+                golfer_id=golfer.id,
+                year=year,
+                is_most_recent=True,
+                is_active=True
+            )
+            entry_by_golfer[golfer.id] = tournament_golfer
+            new_entries.append((tournament_golfer, values))
+            continue
+
+        rows[tournament_golfer.id] = values
+
+    # Missing field entries are created together so their ids are assigned in one flush
+    if new_entries:
+        db.session.add_all([tournament_golfer for tournament_golfer, _ in new_entries])
+        db.session.flush()
+        for tournament_golfer, values in new_entries:
+            rows[tournament_golfer.id] = values
+        print(f"Created {len(new_entries)} missing tournament entries")
+
+    # After processing all results, update the status map file with any new mappings
+    if unknown_statuses:
+        record_status_mappings(unknown_statuses)
+        print(f"Saved {len(unknown_statuses)} new status mappings to file")
+
+    return rows
+
+def apply_result_rows(tournament_id: int, rows: dict) -> dict:
+    """
+    Applies a computed result set to TournamentGolferResult as a set-based diff.
+
+    Existing result ids are kept for every golfer that is still on the leaderboard,
+    so LeagueMemberTournamentScore.tournament_golfer_result_id references stay valid.
+    Changed rows are updated in bulk, new rows bulk inserted and stale rows removed
+    with a single DELETE ... WHERE id IN.
+
+    Args:
+        tournament_id (int): ID of the tournament
+        rows (dict): Result values keyed by tournament_golfer_id, see build_result_rows
+
+    Returns:
+        dict: Counts of inserted, updated, deleted and unchanged rows
+    """
+    existing = (db.session.query(
+            TournamentGolferResult.id,
+            TournamentGolferResult.tournament_golfer_id,
+            TournamentGolferResult.result,
+            TournamentGolferResult.status,
+            TournamentGolferResult.score_to_par
+        )
+        .join(TournamentGolfer, TournamentGolferResult.tournament_golfer_id == TournamentGolfer.id)
+        .filter(TournamentGolfer.tournament_id == tournament_id)
+        .order_by(TournamentGolferResult.id)
+        .all())
+
+    kept = set()
+    to_update = []
+    to_delete = []
+    unchanged = 0
+    for row in existing:
+        values = rows.get(row.tournament_golfer_id)
+        if values is None or row.tournament_golfer_id in kept:
+            # Golfer left the leaderboard, or a duplicate result for the same entry
+            to_delete.append(row.id)
+            continue
+
+        kept.add(row.tournament_golfer_id)
+        if (row.result, row.status, row.score_to_par) == (values['result'], values['status'], values['score_to_par']):
+            unchanged += 1
+        else:
+            to_update.append({'id': row.id, **values})
+
+    to_insert = [
+        {'tournament_golfer_id': tournament_golfer_id, **values}
+        for tournament_golfer_id, values in rows.items()
+        if tournament_golfer_id not in kept
+    ]
+
+    if to_delete:
+        # Detach scores from results that are about to disappear
+        db.session.execute(
+            update(LeagueMemberTournamentScore)
+            .where(LeagueMemberTournamentScore.tournament_golfer_result_id.in_(to_delete))
+            .values(tournament_golfer_result_id=None)
+        )
+        db.session.execute(
+            delete(TournamentGolferResult).where(TournamentGolferResult.id.in_(to_delete))
+        )
+    if to_update:
+        db.session.execute(update(TournamentGolferResult), to_update)
+    if to_insert:
+        db.session.execute(insert(TournamentGolferResult), to_insert)
+
+    return {
+        'inserted': len(to_insert),
+        'updated': len(to_update),
+        'deleted': len(to_delete),
+        'unchanged': unchanged
+    }
+
+def ingest_tournament_results(tournament: Tournament, results: list, interactive: bool = False) -> dict:
+    """
+    Writes a fetched leaderboard to the tournament's entries and results, without committing.
+
+    Args:
+        tournament (Tournament): The tournament being updated
+        results (list): Leaderboard rows from the API
+        interactive (bool): If True, prompts for unknown statuses
+
+    Returns:
+        dict: Counts of inserted, updated, deleted and unchanged rows, see apply_result_rows
+    """
+    # TODO: Improve TOUR Championship detection
+    # Currently using hard-coded tournament ID (19) for TOUR Championship
+    # Need to modify get_tournament_results() to preserve tournament metadata
+    # so we can properly detect tournament type from API response
+    is_tour_championship = tournament.id == 39
+    if is_tour_championship:
+        print("\nProcessing TOUR Championship special scoring...")
+        # Copy the rows so the cached feed isn't rewritten in place
+        results = process_tour_championship_results([dict(result) for result in results])
+
+    rows = build_result_rows(tournament, results, interactive=interactive)
+    return apply_result_rows(tournament.id, rows)
+
+@track_queries('jobs.update_tournament_entries_and_results')
+def update_tournament_entries_and_results(tournament_id: int, interactive: bool = False, force: bool = False):
     """
     Updates tournament entries and results from the API
     
     Args:
         tournament_id (int): ID of the tournament to update
         interactive (bool): If True, prompts for unknown statuses
+        force (bool): If True, ingest the leaderboard even if it hasn't changed since the last run
     """    
     try:
-        # Load existing status mappings at start
-        status_mappings = load_status_map()
-        unknown_statuses = {}  # Track new mappings for this run
-        
-        # Clear existing results for this tournament
-        existing_results = (TournamentGolferResult.query
-            .join(TournamentGolfer)
-            .filter(TournamentGolfer.tournament_id == tournament_id)
-            .all())
-        
-        for result in existing_results:
-            db.session.delete(result)
-        
-        db.session.commit()
-        print("Cleared existing results")
+        with read_replica():
+            tournament = Tournament.query.get(tournament_id)
+        if not tournament:
+            print(f"Tournament {tournament_id} not found in database")
+            return False
 
         # Get fresh results from API
-        results = get_tournament_results(tournament_id)
+        feed = get_tournament_leaderboard_feed(tournament.sportcontent_api_id)
+        results = extract_leaderboard(feed.data) if feed else None
         if not results:
             print("No results available")
             return False
 
-        year = str(datetime.now().year)
-        
-        # TODO: Improve TOUR Championship detection
-        # Currently using hard-coded tournament ID (19) for TOUR Championship
-        # Need to modify get_tournament_results() to preserve tournament metadata
-        # so we can properly detect tournament type from API response
-        is_tour_championship = tournament_id == 39
-        if is_tour_championship:
-            print("\nProcessing TOUR Championship special scoring...")
-            results = process_tour_championship_results(results)
-        
-        for result in results:
-            position = result.get('position', '')
-            raw_status = result.get('status', 'unknown').lower()
-            score_to_par = result.get('total_to_par')
-            
-            # Clean up the status
-            clean_status = 'complete'
-            if raw_status in ['cut', 'mc', 'missed cut']:
-                clean_status = 'cut'
-            elif raw_status in ['wd', 'withdrawn','withdrew']:
-                clean_status = 'wd'
-            elif raw_status in ['dq', 'disqualified','dsq']:
-                clean_status = 'dq'
-            elif raw_status == 'mdf':
-                clean_status = 'mdf'
-            elif raw_status in ['active', 'in progress']:
-                clean_status = 'active'
-            elif raw_status in ['complete', 'finished']:
-                clean_status = 'complete'
-            else:
-                if raw_status in status_mappings:
-                    clean_status = status_mappings[raw_status]
-                    print(f"Using existing mapping for '{raw_status}': {clean_status}")
-                elif raw_status in unknown_statuses:
-                    clean_status = unknown_statuses[raw_status]
-                    print(f"Using new mapping for '{raw_status}': {clean_status}")
-                elif interactive:
-                    print(f"\nUnknown status '{raw_status}'")
-                    print("Known statuses: complete, cut, wd, dq, mdf, active")
-                    clean_status = input("Enter correct status: ").lower().strip()
-                    unknown_statuses[raw_status] = clean_status
-                    print(f"Added new status mapping: {raw_status} -> {clean_status}")
-                else:
-                    print(f"Unknown status '{raw_status}' defaulting to 'complete'")
-                    clean_status = 'complete'
-
-            
-            # Check for team event
-            first_name = result.get('first_name', '').strip()
-            if first_name.endswith('/'):
-                tournament_golfers = process_team_event(tournament_id, result, year)
-                if not tournament_golfers:
-                    print("Failed to process team entry")
-                    continue
-                    
-                # Create result entries for both team members
-                for tournament_golfer in tournament_golfers:
-                    new_result = TournamentGolferResult(
-                        tournament_golfer_id=tournament_golfer.id,
-                        result=position,
-                        status=clean_status,
-                        score_to_par=score_to_par if score_to_par is not None else None
-                    )
-                    db.session.add(new_result)
-                continue
-            
-            # Not a team event - proceed with normal player_id lookup
-            player_id = result.get('player_id')
-            if not player_id:
-                print(f"Missing player_id in result: {result}")
-                continue
-
-
-            # TODO: Create new golfer entry when not found
-            # 1. Extract first_name and last_name from result['player_name']
-            # 2. Create new Golfer with:
-            #    - sportcontent_api_id = player_id
-            #    - first_name, last_name from player_name
-            #    - full_name = result['player_name']
-            #    - Set other fields as nullable for now
-            # 3. Add and commit before continuing
-            # Find golfer entry
-            
-            golfer = Golfer.query.filter_by(sportcontent_api_id=player_id).first()
-            if not golfer:
-                # Fallback to name matching if sportcontent_api_id fails
-                first_name = result.get('first_name', '').strip()
-                last_name = result.get('last_name', '').strip()
-                
-                if first_name and last_name:
-                    # Try exact name match first
-                    golfer = Golfer.query.filter(
-                        Golfer.first_name.ilike(first_name),
-                        Golfer.last_name.ilike(last_name)
-                    ).first()
-                    
-                    if golfer:
-                        print(f"Found golfer by name match: {golfer.full_name} "
-                              f"(API ID: {player_id} -> DB ID: {golfer.sportcontent_api_id})")
-                    else:
-                        print(f"No match found for: {first_name} {last_name} (API ID: {player_id})")
-                        continue
-                else:
-                    print(f"Missing name data for player_id: {player_id}")
-                    continue
-
-            # Get tournament_golfer entry
-            tournament_golfer = TournamentGolfer.query.filter_by(
-                tournament_id=tournament_id,
-                golfer_id=golfer.id,
-                year=year
-            ).first()
-
-            if not tournament_golfer:
-                tournament_golfer = TournamentGolfer(
-                    tournament_id=tournament_id,
-                    golfer_id=golfer.id,
-                    year=year,
-                    is_most_recent=True,
-                    is_active=True
-                )
-                db.session.add(tournament_golfer)
-                db.session.flush()
-
-            # Create new result record
-            new_result = TournamentGolferResult(
-                tournament_golfer_id=tournament_golfer.id,
-                result=position,
-                status=clean_status,
-                score_to_par=score_to_par if score_to_par is not None else None
-            )
-            db.session.add(new_result)
+        if not (force or interactive) and _ingested_leaderboard_hashes.get(tournament_id) == feed.content_hash:
+            print(f"Leaderboard for tournament {tournament_id} unchanged since last update, skipping")
+            return True
 
-        # After processing all results, update the status map file with any new mappings
-        if unknown_statuses:
-            status_mappings.update(unknown_statuses)
-            save_status_map(status_mappings)
-            print(f"Saved {len(unknown_statuses)} new status mappings to file")
+        counts = ingest_tournament_results(tournament, results, interactive=interactive)
 
         db.session.commit()
-        print("Tournament results updated successfully")
+        _ingested_leaderboard_hashes[tournament_id] = feed.content_hash
+        print(f"Tournament results updated successfully: {counts['inserted']} inserted, "
+              f"{counts['updated']} updated, {counts['deleted']} deleted, {counts['unchanged']} unchanged")
         return True
 
     except Exception as e:
@@ -394,18 +559,9 @@ if __name__ == "__main__":
                     print("Invalid tournament ID. Please enter a number.")
                 
             elif choice == "2":
-                # Original logic for updating all tournaments
-                for tournament in tournaments:
-                    print(f"\nProcessing {tournament.tournament_name}...")
-                    success = update_tournament_entries_and_results(tournament.id, interactive=True)
-                    if success:
-                        print(f"✓ Results updated successfully for {tournament.tournament_name}")
-                    else:
-                        print(f"✗ Failed to update results for {tournament.tournament_name}")
-                    
-                    if input("\nContinue to next tournament? (y/n): ").lower() != 'y':
-                        print("Stopping...")
-                        break
+                # Unattended, resumable backfill of every completed tournament
+                from utils.scripts.populate_historical_data import backfill_historical_data
+                backfill_historical_data()
             
             else:
                 print("Invalid choice. Please run the script again and enter 1 or 2.")
@@ -0,0 +1,133 @@
+"""
+Player Status Normalizer
+
+Single source of truth for turning the raw player statuses sent by the data
+providers ('Missed Cut', 'WD', 'Finished', ...) into the statuses stored on
+TournamentGolferResult and understood by scoring:
+
+    complete, active, cut, wd, dq, mdf
+
+The lookup table is built once from the built-in aliases below plus the
+learned mappings in status_map.json, and is frozen so it can be shared
+between threads. It is rebuilt automatically when status_map.json changes
+on disk, so mappings saved by an interactive ingestion run are picked up
+by running workers without a restart.
+"""
+
+import json
+import os
+import threading
+import time
+from types import MappingProxyType
+
+STATUS_MAP_PATH = os.path.join(os.path.dirname(__file__), 'status_map.json')
+
+KNOWN_STATUSES = ('complete', 'active', 'cut', 'wd', 'dq', 'mdf')
+
+# Built-in aliases always win over learned mappings in status_map.json
+BUILT_IN_ALIASES = {
+    'complete': ('complete', 'finished'),
+    'active': ('active', 'in progress'),
+    'cut': ('cut', 'mc', 'missed cut'),
+    'wd': ('wd', 'withdrawn', 'withdrew', 'did not finish'),
+    'dq': ('dq', 'dsq', 'disqualified'),
+    'mdf': ('mdf',),
+}
+
+RELOAD_CHECK_SECONDS = 1.0  # How often to stat status_map.json for changes
+
+_lookup = MappingProxyType({})
+_loaded_mtime = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def load_status_map() -> dict:
+    """Load learned status mappings from status_map.json, empty if the file doesn't exist"""
+    if os.path.exists(STATUS_MAP_PATH):
+        with open(STATUS_MAP_PATH, 'r') as f:
+            return json.load(f)
+    return {}
+
+
+def save_status_map(mappings: dict):
+    """Save learned status mappings to status_map.json"""
+    with open(STATUS_MAP_PATH, 'w') as f:
+        json.dump(mappings, f, indent=4)
+
+
+def record_status_mappings(new_mappings: dict):
+    """
+    Merge newly learned mappings into status_map.json.
+
+    Args:
+        new_mappings (dict): Raw status -> normalized status
+    """
+    mappings = load_status_map()
+    mappings.update({raw.lower().strip(): status for raw, status in new_mappings.items()})
+    save_status_map(mappings)
+    get_status_lookup(force_reload=True)
+
+
+def build_status_lookup(learned: dict) -> MappingProxyType:
+    """
+    Build the frozen raw status -> normalized status table.
+
+    Args:
+        learned (dict): Mappings loaded from status_map.json
+
+    Returns:
+        MappingProxyType: Read-only lookup table keyed by lowercase raw status
+    """
+    lookup = {raw.lower().strip(): status for raw, status in learned.items()}
+    for status, aliases in BUILT_IN_ALIASES.items():
+        for alias in aliases:
+            lookup[alias] = status
+    return MappingProxyType(lookup)
+
+
+def _status_map_mtime():
+    try:
+        return os.stat(STATUS_MAP_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def get_status_lookup(force_reload: bool = False) -> MappingProxyType:
+    """
+    Get the shared status lookup table, rebuilding it if status_map.json changed.
+
+    Args:
+        force_reload (bool): If True, rebuild regardless of the file's mtime
+
+    Returns:
+        MappingProxyType: Read-only lookup table keyed by lowercase raw status
+    """
+    global _lookup, _loaded_mtime, _checked_at
+
+    now = time.monotonic()
+    if not force_reload and _checked_at and now - _checked_at < RELOAD_CHECK_SECONDS:
+        return _lookup
+
+    with _lock:
+        mtime = _status_map_mtime()
+        if force_reload or not _checked_at or mtime != _loaded_mtime:
+            _lookup = build_status_lookup(load_status_map())
+            _loaded_mtime = mtime
+        _checked_at = now
+        return _lookup
+
+
+def normalize_status(raw_status: str):
+    """
+    Normalize a raw provider status with a single dict lookup.
+
+    Args:
+        raw_status (str): Status as sent by the provider, any case
+
+    Returns:
+        str: One of KNOWN_STATUSES, or None if the status is unknown
+    """
+    if not raw_status:
+        return None
+    return get_status_lookup().get(raw_status.lower().strip())
@@ -11,6 +11,8 @@ It provides functionality to:
 The scoring system awards points based on finishing position with penalties for missed picks.
 """
 
+import logging
+
 from flask import Flask
 from utils.db_connector import db, init_db
 from models import (
@@ -18,11 +20,18 @@ from models import (
     User, LeagueMemberTournamentScore, Schedule, ScheduleTournament, Tournament, League
 )
 from datetime import datetime
+from jobs.calculate_points.status_normalizer import normalize_status
+from utils.query_stats import track_queries
+from utils.db_routing import read_replica
+from utils.log import JobProgress, configure_logging
+
+logger = logging.getLogger(__name__)
 
 #------------------------------------------------------------------------------
 # Score Preview Functions
 #------------------------------------------------------------------------------
 
+@read_replica()
 def preview_tournament_scores(tournament_id: int, league_id: int):
     """Preview scores for a tournament without writing to database.
       Args:
@@ -167,13 +176,13 @@ def calculate_position_points(position: int, status: str) -> int:
         Points earned for that position/status combination
     """
     # First check player status - certain statuses override position
-    status = status.lower()
-    if status in ['cut', 'wd', 'dsq','withdrawn','mc','missed cut','did not finish','disqualified']:
+    normalized_status = normalize_status(status)
+    if normalized_status in ('cut', 'wd', 'dq'):
         return 0
-    elif status == 'mdf':
+    elif normalized_status == 'mdf':
         return 5
-    elif status not in ['active', 'complete']:
-        print(f"Unknown status: {status}")
+    elif normalized_status not in ('active', 'complete'):
+        logger.warning("Unknown status: %s", status)
         return 0
 
     # For active/complete players, award points based on position
@@ -204,6 +213,7 @@ def calculate_position_points(position: int, status: str) -> int:
 # Score Calculation and Storage
 #------------------------------------------------------------------------------
 
+@track_queries('jobs.calculate_tournament_scores')
 def calculate_tournament_scores(tournament_id: int, league_id: int):
     """
     Calculate and save scores for a tournament to the database.
@@ -224,7 +234,7 @@ def calculate_tournament_scores(tournament_id: int, league_id: int):
     Returns:
         bool: True if successful, False if error occurred
     """
-    print(f"\nCalculating scores for Tournament {tournament_id}, League {league_id}")
+    logger.info("Calculating scores for tournament %s, league %s", tournament_id, league_id)
     
     # Get the league's schedule with explicit joins
     league_schedule = (db.session.query(Schedule)
@@ -234,11 +244,9 @@ def calculate_tournament_scores(tournament_id: int, league_id: int):
         .first())
     
     if not league_schedule:
-        print(f"Error: Schedule not found for League {league_id}")
+        logger.error("Schedule not found for league %s", league_id)
         return False
     
-    print(f"Schedule ID: {league_schedule.id}")
-    
     # Verify tournament is in the league's schedule
     schedule_tournament = (db.session.query(ScheduleTournament)
         .filter(
@@ -247,11 +255,8 @@ def calculate_tournament_scores(tournament_id: int, league_id: int):
         ).first())
         
     if not schedule_tournament:
-        print(f"Error: Tournament {tournament_id} not found in league's schedule")
+        logger.error("Tournament %s not found in the schedule of league %s", tournament_id, league_id)
         return False
-        
-    print(f"Week Number: {schedule_tournament.week_number}")
-    print(f"Allow Duplicates: {schedule_tournament.allow_duplicate_picks}")
     
     # Check tournament exists and get info
     tournament_info = (db.session.query(Tournament.tournament_name, Tournament.is_major, Tournament.start_date)
@@ -259,22 +264,25 @@ def calculate_tournament_scores(tournament_id: int, league_id: int):
         .first())
     
     if not tournament_info:
-        print(f"Error: Tournament {tournament_id} not found in database")
+        logger.error("Tournament %s not found in database", tournament_id)
         return False
-        
-    print(f"Tournament: {tournament_info.tournament_name}")
-    print(f"Start Date: {tournament_info.start_date}")
-    print(f"Major Tournament: {'Yes (1.25x bonus)' if tournament_info.is_major else 'No'}")
-    
-    # Get all picks for processing, ensuring they are the most recent
-    picks = (db.session.query(Pick, LeagueMember, User.display_name)
-        .join(LeagueMember, Pick.league_member_id == LeagueMember.id)
-        .join(User, LeagueMember.user_id == User.id)
-        .filter(
-            Pick.tournament_id == tournament_id,
-            LeagueMember.league_id == league_id,
-            Pick.is_most_recent == True  # Ensure it's the most recent pick
-        ).all())
+
+    logger.debug("%s (start %s, schedule %s, week %s, major %s, duplicates allowed %s)",
+                 tournament_info.tournament_name, tournament_info.start_date, league_schedule.id,
+                 schedule_tournament.week_number, tournament_info.is_major,
+                 schedule_tournament.allow_duplicate_picks)
+    
+    # Get all picks for processing, ensuring they are the most recent. Picks are
+    # locked once the tournament starts, so the replica is current for them
+    with read_replica():
+        picks = (db.session.query(Pick, LeagueMember, User.display_name)
+            .join(LeagueMember, Pick.league_member_id == LeagueMember.id)
+            .join(User, LeagueMember.user_id == User.id)
+            .filter(
+                Pick.tournament_id == tournament_id,
+                LeagueMember.league_id == league_id,
+                Pick.is_most_recent == True  # Ensure it's the most recent pick
+            ).all())
     
     # Initialize counters
     scores_created = 0
@@ -285,9 +293,6 @@ def calculate_tournament_scores(tournament_id: int, league_id: int):
     is_major = tournament_info.is_major if tournament_info else False
     major_multiplier = 1.25 if is_major else 1.0
     
-    print(f"Tournament: {tournament_info.tournament_name}")
-    print(f"Major Tournament: {'Yes (1.25x bonus)' if is_major else 'No'}")
-    
     # Check tournament settings for duplicate picks
     allow_duplicates = (db.session.query(ScheduleTournament.allow_duplicate_picks)
         .filter(ScheduleTournament.tournament_id == tournament_id)
@@ -305,7 +310,7 @@ def calculate_tournament_scores(tournament_id: int, league_id: int):
         LeagueMemberTournamentScore.league_member_id.in_(league_member_ids)
     ).delete(synchronize_session=False)
     
-    print(f"Cleared {deleted} existing score records")
+    logger.debug("Cleared %d existing score records", deleted)
     
     # Initialize previous_picks
     previous_picks = []
@@ -329,16 +334,19 @@ def calculate_tournament_scores(tournament_id: int, league_id: int):
             member_pick_history[pick.league_member_id] = set()
         member_pick_history[pick.league_member_id].add(pick.golfer_id)
     
-    print(f"\nProcessing {len(picks)} picks for Week {schedule_tournament.week_number}...")
+    progress = JobProgress(logger, f"Week {schedule_tournament.week_number} picks", total=len(picks))
+    debug = logger.isEnabledFor(logging.DEBUG)
     
     # Process each pick
     for pick, league_member, display_name in picks:
+        progress.step()
         # Handle duplicate picks if not allowed
         if not allow_duplicates:
             previous_picks = member_pick_history.get(league_member.id, set())
             
             if pick.golfer_id in previous_picks:
-                print(f"⚠ DUPLICATE FROM PREVIOUS WEEK: {display_name} already picked golfer {pick.golfer_id} earlier this season = 0.00 points")
+                logger.info("Duplicate pick: %s already picked golfer %s earlier this season, 0 points",
+                            display_name, pick.golfer_id)
                 score = LeagueMemberTournamentScore(
                     league_member_id=league_member.id,
                     tournament_id=tournament_id,
@@ -385,9 +393,11 @@ def calculate_tournament_scores(tournament_id: int, league_id: int):
             )
             db.session.add(score)
             scores_created += 1
-            print(f"✓ {display_name}: {result.result} ({result.status}) = {base_points} x {major_multiplier:.2f} = {display_points:.2f} points")
+            if debug:
+                logger.debug("%s: %s (%s) = %s x %.2f = %.2f points", display_name, result.result,
+                             result.status, base_points, major_multiplier, display_points)
         else:
-            print(f"✗ No result found for {display_name}'s pick")
+            logger.warning("No result found for %s's pick (golfer %s)", display_name, pick.golfer_id)
     
     # Process members who didn't make picks
     members_with_picks = {pick.league_member_id for pick, _, _ in picks}
@@ -398,8 +408,6 @@ def calculate_tournament_scores(tournament_id: int, league_id: int):
             ~LeagueMember.id.in_(members_with_picks)
         ).all())
     
-    print(f"\nProcessing {len(no_pick_members)} no-picks...")
-    
     for member, display_name in no_pick_members:
         score = LeagueMemberTournamentScore(
             league_member_id=member.id,
@@ -411,24 +419,13 @@ def calculate_tournament_scores(tournament_id: int, league_id: int):
         )
         db.session.add(score)
         scores_created += 1
-        print(f"✓ {display_name}: NO PICK = -10.00 points")
+        if debug:
+            logger.debug("%s: no pick = -10.00 points", display_name)
     
     # Commit all changes
     db.session.commit()
-    print(f"\nSummary:")
-    print(f"- {deleted} old scores deleted")
-    print(f"- {scores_created} new scores created")
-    print(f"- {len(picks)} total picks processed")
-    print(f"- {duplicate_count} duplicate picks found")
-    print(f"- {len(no_pick_members)} no-picks processed")
-    
-    if duplicate_count > 0:
-        print("\nDuplicate Pick Details:")
-        for member_id, golfers in member_pick_history.items():
-            duplicates = [g for g in golfers if list(golfers).count(g) > 1]
-            if duplicates:
-                member_name = next(p[2] for p in picks if p[1].id == member_id)
-                print(f"- {member_name}: Picked golfer(s) multiple times this season: {', '.join(map(str, duplicates))}")
+    progress.done(deleted=deleted, created=scores_created, duplicates=duplicate_count,
+                  no_picks=len(no_pick_members))
     return True
 
 #------------------------------------------------------------------------------
@@ -485,6 +482,8 @@ def calculate_all_past_tournament_scores(league_id: int = 7, year: int = 2024):
 #------------------------------------------------------------------------------
 
 if __name__ == "__main__":
+    configure_logging()
+
     # Initialize Flask app and database connection
     app = Flask(__name__)
     init_db(app)
@@ -0,0 +1,246 @@
+"""
+Run scheduled jobs once across every worker and instance.
+
+Each gunicorn worker (and each container) that runs a scheduler fires every job.
+run_job makes the copies agree on a single runner through a lease in the
+job_lock table:
+
+- The first instance to take the lease runs the job. The others skip it, and so
+  does everyone while a previous run still holds the lease
+- A heartbeat thread extends the lease while the job runs, so a long run keeps it.
+  If the instance dies, the lease expires after JOB_LEASE_SECONDS and the next
+  attempt takes over
+- Taking the lease is one INSERT (first run) or one conditional UPDATE, both
+  atomic in MySQL and SQLite, so no two instances can win
+- With min_interval the lease is held until a period after the run started, so
+  the other workers, whose schedulers fire moments later, skip that period's run
+
+Every run is recorded in job_run with its duration, status, result and the number
+of rows it inserted, updated or deleted.
+
+    run_job('results:42', update_tournament_entries_and_results, 42)
+"""
+
+import contextvars
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, insert, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+from models import JobLock, JobRun
+from utils.db_connector import db
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', '600'))
+DETAIL_MAX_CHARS = 2000
+
+_rows_written = contextvars.ContextVar('job_rows_written', default=None)
+_listener_installed = False
+_install_lock = threading.Lock()
+
+
+def instance_id() -> str:
+    """Identifies this process in job_lock and job_run."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _count_rows(conn, cursor, statement, parameters, context, executemany):
+    counter = _rows_written.get()
+    # Checks the statement text so raw text() writes count too
+    if counter is not None and cursor.rowcount and cursor.rowcount > 0 \
+            and statement.lstrip()[:6].lower() in ('insert', 'update', 'delete', 'replac'):
+        counter[0] += cursor.rowcount
+
+
+def _install_row_counter():
+    global _listener_installed
+    with _install_lock:
+        if not _listener_installed:
+            event.listen(Engine, 'after_cursor_execute', _count_rows)
+            _listener_installed = True
+
+
+def acquire_lease(job_name: str, lease_seconds: int = DEFAULT_LEASE_SECONDS, engine=None) -> bool:
+    """
+    Take the lease on a job if nobody holds an unexpired one.
+
+    Args:
+        job_name (str): Job to lock
+        lease_seconds (int): How long the lease lasts unless renewed
+        engine: Engine of the primary database, defaults to db.engine
+
+    Returns:
+        bool: True if this instance now holds the lease
+    """
+    engine = engine or db.engine
+    owner = instance_id()
+    now = datetime.utcnow()
+    until = now + timedelta(seconds=lease_seconds)
+    table = JobLock.__table__
+    try:
+        with engine.begin() as connection:
+            connection.execute(insert(table).values(job_name=job_name, owner=owner, leased_until=until,
+                                                    acquired_at=now))
+        return True
+    except IntegrityError:
+        pass  # The job has run before; take the lease if it is free
+
+    with engine.begin() as connection:
+        result = connection.execute(
+            update(table)
+            .where(table.c.job_name == job_name,
+                   (table.c.leased_until.is_(None)) | (table.c.leased_until < now))
+            .values(owner=owner, leased_until=until, acquired_at=now))
+    return result.rowcount == 1
+
+
+def renew_lease(job_name: str, lease_seconds: int = DEFAULT_LEASE_SECONDS, engine=None) -> bool:
+    """
+    Extend a lease held by this instance.
+
+    Returns:
+        bool: False if the lease was lost (expired and taken by another instance)
+    """
+    engine = engine or db.engine
+    table = JobLock.__table__
+    with engine.begin() as connection:
+        result = connection.execute(
+            update(table)
+            .where(table.c.job_name == job_name, table.c.owner == instance_id())
+            .values(leased_until=datetime.utcnow() + timedelta(seconds=lease_seconds)))
+    return result.rowcount == 1
+
+
+def release_lease(job_name: str, engine=None, hold_until: datetime = None):
+    """
+    Give up a lease held by this instance.
+
+    Args:
+        job_name (str): Job to unlock
+        engine: Engine of the primary database, defaults to db.engine
+        hold_until (datetime): Keep other instances from starting the job before
+            this time (UTC); by default the next run can start right away
+    """
+    engine = engine or db.engine
+    table = JobLock.__table__
+    with engine.begin() as connection:
+        connection.execute(
+            update(table)
+            .where(table.c.job_name == job_name, table.c.owner == instance_id())
+            .values(owner=None, leased_until=hold_until))
+
+
+class _Heartbeat:
+    """Renews a lease every third of its length until stopped."""
+
+    def __init__(self, job_name: str, lease_seconds: int, engine):
+        self.job_name = job_name
+        self.lease_seconds = lease_seconds
+        self.engine = engine
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-{job_name}", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.lease_seconds / 3):
+            try:
+                if not renew_lease(self.job_name, self.lease_seconds, self.engine):
+                    logger.error("Lost the lease on job %s while it was running", self.job_name)
+                    return
+            except Exception as e:
+                logger.warning("Error renewing the lease on job %s: %s", self.job_name, e)
+
+
+def _detail(value) -> str:
+    if value is None:
+        return None
+    try:
+        text = json.dumps(value, default=str)
+    except (TypeError, ValueError):
+        text = repr(value)
+    return text[:DETAIL_MAX_CHARS]
+
+
+def run_job(job_name: str, fn, *args, lease_seconds: int = DEFAULT_LEASE_SECONDS, min_interval: float = 0,
+            **kwargs):
+    """
+    Run a job unless another instance holds its lease, recording the run.
+    Needs an app context.
+
+    Args:
+        job_name (str): Lock and history name, e.g. 'results:42'
+        fn (callable): The job
+        *args, **kwargs: Passed to fn
+        lease_seconds (int): Lease length; renewed every third of it while fn runs
+        min_interval (float): Seconds from the start of this run before any instance
+            may run the job again. Set it to the job's period so the other workers'
+            schedulers, which fire a little later, skip it too
+
+    Returns:
+        The job's result, or None if it was skipped
+
+    Raises:
+        Exception: Whatever the job raised, after the run is recorded as failed
+    """
+    engine = db.engine
+    if not acquire_lease(job_name, lease_seconds, engine):
+        logger.info("Skipping job %s, another run holds the lease", job_name)
+        return None
+
+    _install_row_counter()
+    owner = instance_id()
+    started = datetime.utcnow()
+    runs = JobRun.__table__
+    counter = [0]
+    token = None
+    clock = time.perf_counter()
+    run_id, status, result, error = None, 'failed', None, None
+    try:
+        with engine.begin() as connection:
+            run_id = connection.execute(insert(runs).values(
+                job_name=job_name, owner=owner, status='running', started_at=started)).inserted_primary_key[0]
+            connection.execute(update(JobLock.__table__).where(JobLock.__table__.c.job_name == job_name)
+                               .values(run_id=run_id))
+
+        token = _rows_written.set(counter)
+        with _Heartbeat(job_name, lease_seconds, engine):
+            result = fn(*args, **kwargs)
+        status = 'succeeded' if result is not False else 'failed'
+        return result
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        if token is not None:
+            _rows_written.reset(token)
+        duration = time.perf_counter() - clock
+        if run_id is not None:
+            try:
+                with engine.begin() as connection:
+                    connection.execute(update(runs).where(runs.c.id == run_id).values(
+                        status=status, finished_at=datetime.utcnow(), duration_seconds=round(duration, 3),
+                        rows=counter[0], detail=_detail(f"{type(error).__name__}: {error}" if error else result)))
+            except Exception as e:
+                logger.error("Error recording run %s of job %s: %s", run_id, job_name, e)
+        try:
+            # Only hold the lease for min_interval if the job actually ran
+            hold_until = started + timedelta(seconds=min_interval) if min_interval and run_id is not None else None
+            release_lease(job_name, engine, hold_until=hold_until if hold_until and hold_until > datetime.utcnow() else None)
+        except Exception as e:
+            logger.error("Error releasing the lease on job %s: %s", job_name, e)
+        logger.info("Job %s %s in %.2fs, %d rows", job_name, status, duration, counter[0])
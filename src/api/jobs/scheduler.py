@@ -1,37 +1,33 @@
 from models import Tournament
 from datetime import datetime
 from flask import Flask
-from pytz import timezone
 from utils.db_connector import db, init_db
+from utils.log import configure_logging
+from utils.db_routing import read_replica
 
 from jobs.update_field.update_field import update_tournament_entries
 from jobs.calculate_points.calculate_points import update_tournament_entries_and_results
+from jobs.adaptive_poller import AdaptivePoller, PollTask, field_cadence, results_cadence
 
-app = Flask(__name__)
-init_db(app)
+def schedule_updates(scheduler, app):
+    """
+    Schedule all database updates. Field and results polling follow the tournament
+    calendar (see jobs/adaptive_poller.py) instead of fixed weekly crons.
 
-def schedule_updates(scheduler):
-    """Schedule all database updates"""
-    
-    # Schedule field updates (keeping existing schedule)
-    scheduler.add_job(
-        update_tournament_entries,
-        "cron",
-        day_of_week="wed",
-        hour=8,
-        timezone=timezone("America/New_York")
-    )
-    
-    # Schedule results and points calculation
-    scheduler.add_job(
-        update_results_and_points,
-        "cron",
-        day_of_week="mon",
-        hour=8,
-        timezone=timezone("America/New_York")
-    )
+    Args:
+        scheduler: APScheduler scheduler
+        app: Flask app to run the jobs in
+    """
+    poller = AdaptivePoller(scheduler, app, [
+        PollTask('field', ('upcoming',), field_cadence,
+                 lambda tournament: update_tournament_entries(tournament_id=tournament['id'], interactive=False)),
+        PollTask('results', ('live', 'finalizing'), results_cadence,
+                 lambda tournament: update_tournament_entries_and_results(tournament['id'])),
+    ], job_id='database_updates')
+    poller.start()
+    return poller
 
-def update_results_and_points():
+def update_results_and_points(app):
     """Update tournament results and calculate points"""
     print("Updating tournament results and calculating points.")
     with app.app_context():
@@ -45,11 +41,12 @@ def update_results_and_points():
 
 def get_upcoming_tournament():
     # Query the database for the tournament that has the closest start date in the future
-    upcoming_tournament = (
-        Tournament.query.filter(Tournament.start_date > datetime.utcnow())
-        .order_by(Tournament.start_date)
-        .first()
-    )
+    with read_replica():
+        upcoming_tournament = (
+            Tournament.query.filter(Tournament.start_date > datetime.utcnow())
+            .order_by(Tournament.start_date)
+            .first()
+        )
 
     if upcoming_tournament is None:
         return None
@@ -68,14 +65,14 @@ def get_upcoming_tournament():
     }
     
     
-def update_database():
+def update_database(app):
     print("Updating tournament entries.")
     with app.app_context():
         update_tournament_entries()
         # next_tourney = get_upcoming_tournament()
         # print(next_tourney['sportcontent_api_id'])
 
-def force_update():
+def force_update(app):
     """Force immediate update of tournament entries and results"""
     print("Forcing immediate update of tournament entries and results.")
     with app.app_context():
@@ -96,4 +93,7 @@ def force_update():
             print("No upcoming tournament found")
 
 if __name__ == "__main__":
-    force_update()
+    configure_logging()
+    app = Flask(__name__)
+    init_db(app)
+    force_update(app)
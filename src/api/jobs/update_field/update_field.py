@@ -1,17 +1,55 @@
+import re
 from datetime import datetime
 from os import getenv
 from dotenv import load_dotenv
 from flask import Flask
 from utils.db_connector import db, init_db
-from models import TournamentGolfer, Golfer, Schedule, League
+from models import TournamentGolfer, Golfer, Schedule, League, Tournament
 from modules.tournament.functions import get_upcoming_tournament
 from utils.functions.golf_id import generate_golfer_id
+from utils.functions.golfer_index import invalidate_golfer_index
 from sqlalchemy import and_, or_
-import requests
+from data_aggregator.provider_client import fetch_feed
+from utils.query_stats import track_queries
 
 load_dotenv()
 DATAGOLF_KEY = getenv('DATAGOLFAPI_KEY')
-DATAGOLF_FIELD_URL = "https://feeds.datagolf.com/field-updates"
+DATAGOLF_FIELD_PATH = "/field-updates"
+
+# Content hash of the last field feed applied per tournament by this process, to
+# skip resolving an unchanged field again. Applying the same field twice (another
+# worker, a restart) writes nothing either, see update_tournament_entries
+_applied_field_hashes = {}
+
+def _event_words(name: str) -> set:
+    # Significant words of an event name, e.g. 'The Sentry' -> {'sentry'}
+    return set(re.findall(r'[a-z0-9]+', (name or '').lower())) - {'the', 'presented', 'by', 'championship', 'open'}
+
+def field_matches_tournament(data: dict, tournament: Tournament) -> bool:
+    """
+    Whether a DataGolf field feed is for the given tournament.
+
+    DataGolf serves the field of its current event only, which is still the
+    previous event's field for a few days into the next event's week, and the
+    main event's field in a week with an opposite-field event.
+
+    Args:
+        data (dict): Field feed, with 'event_name' (and 'event_id' when DataGolf sends it)
+        tournament (Tournament): The tournament the field would be written to
+
+    Returns:
+        bool: True if the feed's event id or name matches the tournament
+    """
+    event_id = data.get('event_id')
+    if event_id is not None and tournament.datagolf_id is not None:
+        return str(event_id) == str(tournament.datagolf_id)
+
+    event_words = _event_words(data.get('event_name'))
+    tournament_words = _event_words(tournament.tournament_name)
+    if not event_words or not tournament_words:
+        # Names made only of generic words ('The Open Championship'), compare them whole
+        return (data.get('event_name') or '').strip().lower() == (tournament.tournament_name or '').strip().lower()
+    return event_words <= tournament_words or tournament_words <= event_words
 
 def find_similar_golfers(first_name, last_name):
     # Query for golfers with similar first or last names
@@ -41,9 +79,21 @@ def prompt_user_for_golfer(similar_golfers, first_name, last_name):
         create_new = input("Would you like to create a new entry? (y/n): ")
         return None if create_new.lower() == 'y' else False
 
-def update_tournament_entries(league_id: int):
-    """Update tournament entries for upcoming tournament, keeping database clean"""
-    upcoming_tournament = get_upcoming_tournament(league_id)['data']
+@track_queries('jobs.update_tournament_entries')
+def update_tournament_entries(league_id: int = None, tournament_id: int = None, interactive: bool = True):
+    """
+    Update tournament entries for upcoming tournament, keeping database clean
+
+    Args:
+        league_id (int): League whose next tournament to update
+        tournament_id (int): Tournament to update instead (scheduled polling)
+        interactive (bool): If False, unknown golfers are never prompted for: they are
+            created when no similar golfer exists and skipped otherwise
+    """
+    if tournament_id is not None:
+        upcoming_tournament = {'id': tournament_id}
+    else:
+        upcoming_tournament = get_upcoming_tournament(league_id).get('data')
     
     # Debugging: Print the upcoming_tournament to see its structure
     print(f"Upcoming tournament data: {upcoming_tournament}")
@@ -54,39 +104,38 @@ def update_tournament_entries(league_id: int):
 
     try:
         # Make DataGolf API request
-        response = requests.get(
-            DATAGOLF_FIELD_URL,
+        feed = fetch_feed(
+            'datagolf',
+            DATAGOLF_FIELD_PATH,
             params={
                 "tour": "pga",
                 "file_format": "json",
                 "key": DATAGOLF_KEY
             }
         )
-        response.raise_for_status()  # Raise exception for bad status codes
-        data = response.json()
+        data = feed.data
         
         if not data.get("field"):
             print("No field data available")
             return None
 
+        tournament = db.session.get(Tournament, upcoming_tournament["id"])
+        if tournament and not field_matches_tournament(data, tournament):
+            print(f"Field feed is for '{data.get('event_name')}', not '{tournament.tournament_name}', skipping")
+            return None
+
+        if _applied_field_hashes.get(upcoming_tournament["id"]) == feed.content_hash:
+            print("Field unchanged since last update, skipping")
+            return True
+
         year = str(datetime.now().year)
         current_time = datetime.utcnow()
 
-        # First, mark all existing entries as not most recent
-        TournamentGolfer.query.filter(
-            and_(
-                TournamentGolfer.tournament_id == upcoming_tournament["id"],
-                TournamentGolfer.year == year,
-            )
-        ).update({
-            TournamentGolfer.is_most_recent: False,
-            TournamentGolfer.timestamp_utc: current_time
-        })
-
         # Fetch all existing golfer IDs
         existing_golfer_ids = {golfer.id for golfer in Golfer.query.all()}
 
-        # Process each player in the field
+        # Resolve each player in the field to a golfer
+        field_golfer_ids = []
         for player in data["field"]:
             dg_id = player.get("dg_id")
             full_name = player["player_name"]
@@ -102,7 +151,11 @@ def update_tournament_entries(league_id: int):
             
             if not existing_golfer:
                 similar_golfers = find_similar_golfers(first_name, last_name)
-                existing_golfer = prompt_user_for_golfer(similar_golfers, first_name, last_name)
+                if interactive:
+                    existing_golfer = prompt_user_for_golfer(similar_golfers, first_name, last_name)
+                else:
+                    # Unattended: a similar name needs a human to decide, so leave it for an interactive run
+                    existing_golfer = False if similar_golfers else None
 
                 if existing_golfer is None:
                     # Create a new golfer entry
@@ -126,10 +179,36 @@ def update_tournament_entries(league_id: int):
                 db.session.add(existing_golfer)
                 db.session.commit()
 
-            # Create new tournament golfer entry
+            if existing_golfer.id not in field_golfer_ids:
+                field_golfer_ids.append(existing_golfer.id)
+
+        # Compare with the current field and only write the differences, so applying
+        # the same feed again (another worker, a restart) changes nothing
+        current_entries = TournamentGolfer.query.filter(
+            TournamentGolfer.tournament_id == upcoming_tournament["id"],
+            TournamentGolfer.year == year,
+            TournamentGolfer.is_most_recent.is_(True)
+        ).order_by(TournamentGolfer.id).all()
+        kept, withdrawn = set(), []
+        for entry in current_entries:
+            if entry.golfer_id in field_golfer_ids and entry.golfer_id not in kept:
+                kept.add(entry.golfer_id)
+            else:
+                withdrawn.append(entry.id)  # Left the field, or a duplicate current entry
+
+        if withdrawn:
+            TournamentGolfer.query.filter(TournamentGolfer.id.in_(withdrawn)).update({
+                TournamentGolfer.is_most_recent: False,
+                TournamentGolfer.timestamp_utc: current_time
+            }, synchronize_session=False)
+
+        # Create new tournament golfer entries for golfers who joined the field
+        for golfer_id in field_golfer_ids:
+            if golfer_id in kept:
+                continue
             tg = TournamentGolfer(
                 tournament_id=upcoming_tournament["id"],
-                golfer_id=existing_golfer.id,
+                golfer_id=golfer_id,
                 year=year,
                 is_most_recent=True,
                 is_active=True,
@@ -138,8 +217,11 @@ def update_tournament_entries(league_id: int):
                 timestamp_utc=current_time
             )
             db.session.add(tg)
+        print(f"Field changes: {len(field_golfer_ids) - len(kept)} added, {len(withdrawn)} removed")
 
         db.session.commit()
+        invalidate_golfer_index()
+        _applied_field_hashes[upcoming_tournament["id"]] = feed.content_hash
         print("Tournament entries updated successfully")
         return True
         
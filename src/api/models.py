@@ -427,6 +427,48 @@ class GolferRanking(db.Model):
     timestamp_utc = db.Column(DateTime, default=datetime.utcnow)
 
 
+class GolferCurrentRanking(db.Model):
+    """
+    The latest OWGR ranking of a golfer, one row per ranked golfer. GolferRanking
+    keeps the history (a row each time the rank changes); this table is what the
+    pick screen reads, by primary key.
+
+    Attributes:
+        golfer_id (str): The golfer (Primary Key)
+        owgr_player_id (int): The golfer's id at OWGR, used to match the next rankings
+        owgr (int): Current world ranking
+        points_average (float): OWGR average points
+        updated_at (datetime): When the ranking was last ingested (UTC)
+    """
+    __tablename__ = 'golfer_current_ranking'
+
+    golfer_id = db.Column(db.String(9), db.ForeignKey("golfer.id"), primary_key=True)
+    owgr_player_id = db.Column(db.Integer, nullable=True, index=True)
+    owgr = db.Column(db.Integer, nullable=False)
+    points_average = db.Column(db.Float, nullable=True)
+    updated_at = db.Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class GolferPhoto(db.Model):
+    """
+    A golfer's headshot in the image store (utils/image_store.py), one
+    image name per size. Names are content hashes, see utils.image_store.url_for.
+
+    Attributes:
+        golfer_id (str): The golfer (Primary Key)
+        original (str): Full size image
+        small (str): 64px WebP, for dropdowns and lists
+        medium (str): 160px WebP
+        updated_at (datetime): When the headshot last changed (UTC)
+    """
+    __tablename__ = 'golfer_photo'
+
+    golfer_id = db.Column(db.String(9), db.ForeignKey("golfer.id"), primary_key=True)
+    original = db.Column(db.String(70), nullable=False)
+    small = db.Column(db.String(70), nullable=True)
+    medium = db.Column(db.String(70), nullable=True)
+    updated_at = db.Column(DateTime, nullable=False, default=datetime.utcnow)
+
 
 class Schedule(db.Model):
     """
@@ -508,4 +550,52 @@ class InviteCodeUsage(db.Model):
     # Prevent double usage by same user
     __table_args__ = (
         db.UniqueConstraint('invite_code_id', 'user_id', name='uix_invite_code_usage'),
-    )
\ No newline at end of file
+    )
+
+class JobLock(db.Model):
+    """
+    A lease on a scheduled job. Every instance (gunicorn worker, container) tries
+    to take the lease before running the job; only the holder of an unexpired
+    lease runs it. See jobs/job_runner.py.
+
+    Attributes:
+        job_name (str): Name of the job (primary key)
+        owner (str): Instance holding the lease (host:pid), null when released
+        leased_until (datetime): When the lease expires (UTC); extended while the job runs
+        run_id (int): The JobRun of the current or last run
+        acquired_at (datetime): When the lease was taken
+    """
+    __tablename__ = 'job_lock'
+
+    job_name = db.Column(db.String(100), primary_key=True)
+    owner = db.Column(db.String(100), nullable=True)
+    leased_until = db.Column(DateTime, nullable=True)
+    run_id = db.Column(db.Integer, nullable=True)
+    acquired_at = db.Column(DateTime, nullable=True)
+
+class JobRun(db.Model):
+    """
+    One run of a scheduled job.
+
+    Attributes:
+        id (int): The unique identifier for the run
+        job_name (str): Name of the job
+        owner (str): Instance that ran it
+        status (str): 'running', 'succeeded' or 'failed'
+        started_at (datetime): Start (UTC)
+        finished_at (datetime): End (UTC), null while running
+        duration_seconds (float): Wall time of the run
+        rows (int): Rows inserted, updated or deleted by the run
+        detail (str): JSON result of the job, or the error message
+    """
+    __tablename__ = 'job_run'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_name = db.Column(db.String(100), nullable=False, index=True)
+    owner = db.Column(db.String(100), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='running')
+    started_at = db.Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(DateTime, nullable=True)
+    duration_seconds = db.Column(db.Float, nullable=True)
+    rows = db.Column(db.Integer, nullable=True)
+    detail = db.Column(db.Text, nullable=True)
@@ -1,7 +1,9 @@
-from flask import Blueprint
+from flask import Blueprint, Response, jsonify, request
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import text
 from utils.db_connector import db, init_db
+from utils.db_routing import REPLICA_BIND
+from utils import metrics, profiler
 
 health_bp = Blueprint('health', __name__)
 
@@ -18,18 +20,66 @@ def db_health_check():
         # Use text() to properly format the SQL query
         result = db.session.execute(text('SELECT 1'))
         result.fetchone()
-        
-        return {
+
+        status = {
             'status': 'healthy',
             'message': 'Database connection successful',
             'database': 'connected'
-        }, 200
+        }
+        replica = db.engines.get(REPLICA_BIND)
+        if replica is not None:
+            with replica.connect() as connection:
+                connection.execute(text('SELECT 1'))
+            status['replica'] = 'connected'
+        return status, 200
     except Exception as e:
         return {
             'status': 'unhealthy',
             'message': 'Database connection failed',
             'error': str(e)
         }, 500
-    
-    
-    
\ No newline at end of file
+
+
+@health_bp.route('/metrics')
+def metrics_export():
+    # Prometheus scrape endpoint, merged across all workers
+    if not metrics.check_token():
+        return jsonify({'error': 'Not found'}), 404
+    return Response(metrics.render(metrics.collect()), mimetype='text/plain; version=0.0.4')
+
+
+@health_bp.route('/profile/start', methods=['POST'])
+def profile_start():
+    if not profiler.check_token():
+        return jsonify({'error': 'Not found'}), 404
+
+    data = request.get_json(silent=True) or {}
+    route = data.get('route')
+    if not route:
+        return jsonify({'error': 'route is required, e.g. /league/scoreboard/<int:league_id>'}), 400
+
+    settings = profiler.start_profile(route, data.get('seconds', 30), data.get('interval_ms', 5))
+    return jsonify(settings), 200
+
+
+@health_bp.route('/profile/stop', methods=['POST'])
+def profile_stop():
+    if not profiler.check_token():
+        return jsonify({'error': 'Not found'}), 404
+    profiler.stop_profile()
+    return jsonify(profiler.profile_status()), 200
+
+
+@health_bp.route('/profile/status')
+def profile_status():
+    if not profiler.check_token():
+        return jsonify({'error': 'Not found'}), 404
+    return jsonify(profiler.profile_status()), 200
+
+
+@health_bp.route('/profile')
+def profile_download():
+    # Folded stacks, ready for flamegraph.pl or speedscope
+    if not profiler.check_token():
+        return jsonify({'error': 'Not found'}), 404
+    return Response(profiler.read_profile(), mimetype='text/plain')
@@ -1,31 +1,14 @@
 from functools import wraps
-from flask import request, jsonify
-import firebase_admin
-from firebase_admin import auth, credentials
-import os
-import json
-from dotenv import load_dotenv
+from flask import g, request, jsonify
 
-# Get the key string
-key_string = os.getenv('FIREBASE_ADMIN_SDK_KEY')
-
-try:
-
-    
- 
-    key = json.loads(key_string)
-except json.JSONDecodeError as e:
-    print(f"JSON Error at position {e.pos}: {e.msg}")
-    print(f"Near text: {key_string[max(0, e.pos-20):min(len(key_string), e.pos+20)]}")
-    raise
-
-cred = credentials.Certificate(key)
-default_app = firebase_admin.initialize_app(cred)
+from utils.firebase import get_firebase_app
 
 def verify_id_token(id_token):
+    from firebase_admin import auth
+
     try:
         # Verify the ID token and extract the user's UID
-        decoded_token = auth.verify_id_token(id_token)
+        decoded_token = auth.verify_id_token(id_token, app=get_firebase_app())
         uid = decoded_token['uid']
         return uid
     except ValueError:
@@ -64,7 +47,9 @@ def require_auth(f):
         
         if uid is None:
             return jsonify({'error': 'Invalid token'}), 401
-            
+
+        # Lets the database session route this user's reads (see utils.db_routing)
+        g.uid = uid
         return f(uid, *args, **kwargs)
     
     return decorated
\ No newline at end of file
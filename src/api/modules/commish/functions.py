@@ -13,7 +13,7 @@ def validate_and_use_invite_code(code: str, firebase_id: str):
         code (str): The invite code to validate
         firebase_uid (str): Firebase UID of the user
     """
-    logger.info(f"Validating invite code: {code} for Firebase user: {firebase_id}")
+    logger.debug("Validating invite code: %s for Firebase user: %s", code, firebase_id)
     
     try:
         # Convert Firebase UID to database user ID
@@ -23,11 +23,11 @@ def validate_and_use_invite_code(code: str, firebase_id: str):
             return False, "User not found in database", 404
             
         user_id = user.id
-        logger.debug(f"Found database user ID: {user_id}")
+        logger.debug("Found database user ID: %s", user_id)
 
         # Find and validate invite code
         invite = LeagueInviteCode.query.filter_by(code=code).first()
-        logger.debug(f"Found invite code: {invite}")
+        logger.debug("Found invite code: %s", invite)
         
         if not invite:
             logger.warning(f"Invalid invite code: {code}")
@@ -41,7 +41,7 @@ def validate_and_use_invite_code(code: str, firebase_id: str):
         # Check max uses
         if invite.max_uses:
             usage_count = InviteCodeUsage.query.filter_by(invite_code_id=invite.id).count()
-            logger.debug(f"Current usage count: {usage_count} of {invite.max_uses}")
+            logger.debug("Current usage count: %s of %s", usage_count, invite.max_uses)
             if usage_count >= invite.max_uses:
                 return False, "Invite code has reached maximum uses", 400
 
@@ -72,7 +72,7 @@ def validate_and_use_invite_code(code: str, firebase_id: str):
             db.session.add(usage)
             
             db.session.commit()
-            logger.info(f"Successfully added user {user_id} to league {invite.league_id}")
+            logger.debug("Successfully added user %s to league %s", user_id, invite.league_id)
             return True, {"league_id": invite.league_id}, 200
 
         except Exception as e:
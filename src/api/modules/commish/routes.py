@@ -11,23 +11,23 @@ commish_bp = Blueprint('commish', __name__)
 @require_auth
 def join_league(uid):
     """Handle league invite code submission"""
-    logger.info(f"Received join request for user {uid}")
+    logger.debug("Received join request for user %s", uid)
     
     try:
         data = request.get_json()
-        logger.debug(f"Request data: {data}")
+        logger.debug("Request data: %s", data)
         
         user_id = uid
         code = data.get('code')
         
-        logger.info(f"Processing invite code: {code} for user: {user_id}")
+        logger.debug("Processing invite code: %s for user: %s", code, user_id)
 
         if not code:
             logger.warning("No invite code provided")
             return jsonify({'message': 'Invite code is required'}), 400
 
         success, result, status_code = validate_and_use_invite_code(code, user_id)
-        logger.info(f"Validation result: success={success}, status={status_code}, result={result}")
+        logger.debug("Validation result: success=%s, status=%s, result=%s", success, status_code, result)
         
         if success:
             return jsonify(result), status_code
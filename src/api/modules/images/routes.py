@@ -0,0 +1,37 @@
+import logging
+
+from flask import Blueprint, jsonify, send_file
+
+from utils.image_store import MIMETYPES, path_for
+
+logger = logging.getLogger(__name__)
+
+images_bp = Blueprint('images', __name__)
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+@images_bp.route('/<name>', methods=['GET'])
+def get_image(name):
+    """
+    Serve an image from the local image store.
+
+    Names are content hashes, so the response never changes and may be cached
+    forever. Range and conditional (If-None-Match) requests are supported.
+
+    Returns:
+        200 (OK) / 206 (Partial Content) / 304 (Not Modified): The image
+        404 (Not Found): Invalid name or no such image
+    """
+    try:
+        path = path_for(name)
+    except ValueError:
+        return jsonify({'error': 'Image not found'}), 404
+    if not path.is_file():
+        return jsonify({'error': 'Image not found'}), 404
+
+    response = send_file(path, mimetype=MIMETYPES[name.rsplit('.', 1)[1]], conditional=True,
+                         etag=name.split('.', 1)[0], max_age=IMMUTABLE_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
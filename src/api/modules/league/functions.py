@@ -4,12 +4,18 @@ from models import (
 from sqlalchemy import func,select
 from sqlalchemy.sql import case
 from utils.db_connector import db
+from utils.cache import VersionedCache
+from modules.tournament.functions import get_schedule_calendar, tournament_start_utc
+from utils.functions.golfer_index import get_golfer_index
 import logging
 from datetime import datetime
 import pytz
 
 logger = logging.getLogger(__name__)
 
+MEMBER_HISTORY_TTL_SECONDS = 6 * 60 * 60
+_member_history_cache = VersionedCache(maxsize=2048, ttl=MEMBER_HISTORY_TTL_SECONDS, name='member_history')
+
 
 def calculate_leaderboard(leagueID):
     """
@@ -101,16 +107,32 @@ def get_league_member_info(league_member_id: int) -> tuple:
     return member_info, member_query.schedule_id
 
 def get_schedule_picks(league_member_id: int, schedule_id: int) -> list:
-    """Get all tournaments and picks for a schedule"""
-    picks = (db.session.query(
-            Tournament.id,
+    """Get all tournaments and picks for a schedule, exactly one row per scheduled tournament
+
+    The pick/result joins can match several rows per tournament (a golfer can
+    have more than one TournamentGolfer entry), so a ROW_NUMBER() window ranks
+    the candidates in SQL and only the best row per tournament is returned:
+    rows with a score first, then the result the score was calculated from,
+    then the most recent field entry.
+    """
+    row_number = func.row_number().over(
+        partition_by=Tournament.id,
+        order_by=(
+            case((LeagueMemberTournamentScore.id.is_(None), 1), else_=0),
+            case((LeagueMemberTournamentScore.tournament_golfer_result_id == TournamentGolferResult.id, 0), else_=1),
+            case((TournamentGolfer.is_most_recent == True, 0), else_=1),
+            TournamentGolferResult.id.desc()
+        )
+    ).label('row_number')
+
+    ranked = (select(
+            Tournament.id.label('tournament_id'),
             Tournament.tournament_name,
             Tournament.start_date,
             Tournament.start_time,
             Tournament.time_zone,
             Tournament.is_major,
             ScheduleTournament.week_number,
-            Pick,
             Golfer.first_name,
             Golfer.last_name,
             Golfer.id.label('golfer_id'),
@@ -120,12 +142,12 @@ def get_schedule_picks(league_member_id: int, schedule_id: int) -> list:
             TournamentGolferResult.score_to_par,
             LeagueMemberTournamentScore.score,
             LeagueMemberTournamentScore.is_no_pick,
-            LeagueMemberTournamentScore.is_duplicate_pick
+            LeagueMemberTournamentScore.is_duplicate_pick,
+            row_number
         )
         .join(ScheduleTournament, Tournament.id == ScheduleTournament.tournament_id)
-        .filter(ScheduleTournament.schedule_id == schedule_id)
-        .outerjoin(Pick, 
-            (Pick.tournament_id == Tournament.id) & 
+        .outerjoin(Pick,
+            (Pick.tournament_id == Tournament.id) &
             (Pick.league_member_id == league_member_id) &
             (Pick.is_most_recent == True)
         )
@@ -139,46 +161,31 @@ def get_schedule_picks(league_member_id: int, schedule_id: int) -> list:
             (LeagueMemberTournamentScore.tournament_id == Tournament.id) &
             (LeagueMemberTournamentScore.league_member_id == league_member_id)
         )
-        .order_by(Tournament.start_date)
-        .all()
+        .where(ScheduleTournament.schedule_id == schedule_id)
+        .subquery()
     )
 
-    # Create a dictionary to store the best entry for each tournament
-    # this is a shitty, hacky fix, but it works for now, yeah?  TODO: fix this
-    tournament_picks = {}
-    for pick in picks:
-        tournament_id = pick.id
-        if tournament_id not in tournament_picks or (
-            pick.score is not None and tournament_picks[tournament_id].score is None
-        ):
-            tournament_picks[tournament_id] = pick
-
-    # Convert back to list and sort by date
-    deduplicated_picks = sorted(
-        tournament_picks.values(),
-        key=lambda x: x.start_date
-    )
+    return db.session.execute(
+        select(ranked)
+        .where(ranked.c.row_number == 1)
+        .order_by(ranked.c.start_date)
+    ).all()
 
-    # Print debug table header
-    # print("\nSchedule Picks Debug Table:")
-    # print("-" * 100)
-    # print(f"{'Tournament Name':<40} {'Date':<12} {'Golfer':<25} {'Points':<10} {'Status'}")
-    # print("-" * 100)
-
-    # # Print each row
-    # for pick in deduplicated_picks:
-    #     golfer_name = f"{pick.first_name} {pick.last_name}" if pick.first_name else "No Pick"
-    #     points = pick.score/100 if pick.score is not None else 0
-    #     status = "Future" if pick.score is None else pick.status or "Complete"
-        
-    #     print(f"{pick.tournament_name[:38]:<40} "
-    #           f"{pick.start_date.strftime('%Y-%m-%d'):<12} "
-    #           f"{golfer_name[:23]:<25} "
-    #           f"{points:<10.2f} "
-    #           f"{status}")
+def get_member_history_version(league_member_id: int) -> tuple:
+    """Get a version token for a member's pick history
+
+    The newest pick id changes whenever the member submits a pick, and the
+    newest score id changes on every scoring run, because scores are cleared
+    and recreated. Either one changing means a cached history is stale.
+    """
+    latest_pick = (select(func.max(Pick.id))
+        .where(Pick.league_member_id == league_member_id)
+        .scalar_subquery())
+    latest_score = (select(func.max(LeagueMemberTournamentScore.id))
+        .where(LeagueMemberTournamentScore.league_member_id == league_member_id)
+        .scalar_subquery())
 
-    # print("-" * 100)
-    return deduplicated_picks
+    return tuple(db.session.execute(select(latest_pick, latest_score)).one())
 
 def format_pick_data(tournament_data, is_future: bool) -> dict:
     """Format a single tournament/pick into the expected response format"""
@@ -237,25 +244,40 @@ def calculate_summary(picks_data: list) -> dict:
     }
 
 def get_league_member_pick_history(league_member_id: int) -> dict:
-    """Get detailed pick history for a league member"""
+    """Get detailed pick history for a league member
+
+    The schedule rows are cached per member until the member's next pick or
+    the next scoring run. Whether a tournament is in the future is decided
+    per request from the cached schedule calendar.
+    """
     try:
         member_info, schedule_id = get_league_member_info(league_member_id)
         if not member_info:
             return None
 
-        picks_query = get_schedule_picks(league_member_id, schedule_id)
+        cache_key = (league_member_id, schedule_id)
+        version = get_member_history_version(league_member_id)
+        picks_query = _member_history_cache.get(cache_key, version)
+        if picks_query is None:
+            picks_query = _member_history_cache.set(
+                cache_key, get_schedule_picks(league_member_id, schedule_id), version
+            )
+
+        calendar = {entry['tournament_id']: entry for entry in get_schedule_calendar(schedule_id)}
         picks_data = []
         utc_now = datetime.now(pytz.UTC)
 
         for tournament_data in picks_query:
-            # Convert tournament start to UTC for comparison
-            tournament_tz = pytz.timezone(tournament_data.time_zone or 'America/New_York')
-            tournament_local = tournament_tz.localize(
-                datetime.combine(tournament_data.start_date, tournament_data.start_time)
-            )
-            tournament_utc = tournament_local.astimezone(pytz.UTC)
-            
-            is_future = utc_now < tournament_utc
+            calendar_entry = calendar.get(tournament_data.tournament_id)
+            if calendar_entry:
+                start_utc = calendar_entry['start_utc']
+            else:
+                # Tournament was added to the schedule after the calendar was cached
+                start_utc = tournament_start_utc(
+                    tournament_data.start_date, tournament_data.start_time, tournament_data.time_zone
+                )
+
+            is_future = utc_now < start_utc
             picks_data.append(format_pick_data(tournament_data, is_future))
 
         return {
@@ -268,4 +290,213 @@ def get_league_member_pick_history(league_member_id: int) -> dict:
         logger.error(f"Error getting pick history: {e}", exc_info=True)
         return None
 
+# Bit flags used in the pick matrix 'flags' column
+PICK_FLAG_NO_PICK = 1
+PICK_FLAG_DUPLICATE = 2
+PICK_FLAG_WIN = 4
+
+LEAGUE_MATRIX_TTL_SECONDS = 6 * 60 * 60
+_league_matrix_cache = VersionedCache(maxsize=256, ttl=LEAGUE_MATRIX_TTL_SECONDS, name='league_pick_matrix')
+
+def get_league_matrix_version(league_id: int) -> tuple:
+    """Get a version token for a league's pick matrix
+
+    Scores are cleared and recreated on every scoring run, so the newest score
+    id changes with each run. The newest league member id covers members joining.
+    """
+    latest_score = (select(func.max(LeagueMemberTournamentScore.id))
+        .join(LeagueMember, LeagueMemberTournamentScore.league_member_id == LeagueMember.id)
+        .where(LeagueMember.league_id == league_id)
+        .scalar_subquery())
+    latest_member = (select(func.max(LeagueMember.id))
+        .where(LeagueMember.league_id == league_id)
+        .scalar_subquery())
+
+    return tuple(db.session.execute(select(latest_score, latest_member)).one())
+
+def build_league_pick_matrix(league: League, started: list) -> dict:
+    """Build the members x weeks pick matrix for a league from a few bulk queries
+
+    Args:
+        league: The league to build the matrix for
+        started: Calendar entries of the tournaments that have already started
+
+    Returns:
+        dict: Column-encoded matrix, see get_league_pick_matrix
+    """
+    tournament_ids = [entry['tournament_id'] for entry in started]
+    week_index = {tournament_id: i for i, tournament_id in enumerate(tournament_ids)}
+
+    tournaments = {
+        row.id: row for row in db.session.query(
+            Tournament.id, Tournament.tournament_name, Tournament.start_date, Tournament.is_major
+        ).filter(Tournament.id.in_(tournament_ids))
+    } if tournament_ids else {}
+
+    members = (db.session.query(
+            LeagueMember.id,
+            User.display_name,
+            User.first_name,
+            User.last_name,
+            User.avatar_url
+        )
+        .join(User, LeagueMember.user_id == User.id)
+        .filter(LeagueMember.league_id == league.id)
+        .order_by(LeagueMember.id)
+        .all()
+    )
+    member_index = {member.id: i for i, member in enumerate(members)}
+
+    width = len(tournament_ids)
+    golfer_rows = [[None] * width for _ in members]
+    result_rows = [[None] * width for _ in members]
+    points_rows = [[None] * width for _ in members]
+    flag_rows = [[0] * width for _ in members]
+
+    if width and members:
+        picks = (db.session.query(Pick.league_member_id, Pick.tournament_id, Pick.golfer_id)
+            .join(LeagueMember, Pick.league_member_id == LeagueMember.id)
+            .filter(
+                LeagueMember.league_id == league.id,
+                Pick.is_most_recent == True,
+                Pick.tournament_id.in_(tournament_ids)
+            )
+            .all()
+        )
+
+        scores = (db.session.query(
+                LeagueMemberTournamentScore.league_member_id,
+                LeagueMemberTournamentScore.tournament_id,
+                LeagueMemberTournamentScore.tournament_golfer_result_id,
+                LeagueMemberTournamentScore.score,
+                LeagueMemberTournamentScore.is_no_pick,
+                LeagueMemberTournamentScore.is_duplicate_pick
+            )
+            .join(LeagueMember, LeagueMemberTournamentScore.league_member_id == LeagueMember.id)
+            .filter(
+                LeagueMember.league_id == league.id,
+                LeagueMemberTournamentScore.tournament_id.in_(tournament_ids)
+            )
+            .all()
+        )
 
+        # Results of every picked golfer, keyed by result id and by (tournament, golfer)
+        picked_golfers = {pick.golfer_id for pick in picks}
+        results_by_id = {}
+        results_by_pick = {}
+        if picked_golfers:
+            results = (db.session.query(
+                    TournamentGolferResult.id,
+                    TournamentGolferResult.result,
+                    TournamentGolfer.tournament_id,
+                    TournamentGolfer.golfer_id
+                )
+                .join(TournamentGolfer, TournamentGolferResult.tournament_golfer_id == TournamentGolfer.id)
+                .filter(
+                    TournamentGolfer.tournament_id.in_(tournament_ids),
+                    TournamentGolfer.golfer_id.in_(picked_golfers)
+                )
+                .order_by(TournamentGolfer.is_most_recent, TournamentGolferResult.id)
+                .all()
+            )
+            for result in results:
+                results_by_id[result.id] = result.result
+                # Ordered so the most recent field entry wins
+                results_by_pick[(result.tournament_id, result.golfer_id)] = result.result
+
+        for pick in picks:
+            row, col = member_index[pick.league_member_id], week_index[pick.tournament_id]
+            golfer_rows[row][col] = pick.golfer_id
+            result_rows[row][col] = results_by_pick.get((pick.tournament_id, pick.golfer_id))
+
+        for score in scores:
+            row, col = member_index[score.league_member_id], week_index[score.tournament_id]
+            if score.tournament_golfer_result_id in results_by_id:
+                result_rows[row][col] = results_by_id[score.tournament_golfer_result_id]
+            points_rows[row][col] = round(score.score / 100, 2) if score.score is not None else None
+            flag_rows[row][col] = (
+                (PICK_FLAG_NO_PICK if score.is_no_pick else 0) |
+                (PICK_FLAG_DUPLICATE if score.is_duplicate_pick else 0)
+            )
+
+        for row in range(len(members)):
+            for col in range(width):
+                if result_rows[row][col] == '1':
+                    flag_rows[row][col] |= PICK_FLAG_WIN
+
+    index = get_golfer_index()
+    golfers = {}
+    for row in golfer_rows:
+        for golfer_id in row:
+            if golfer_id is not None and golfer_id not in golfers:
+                golfer = index.get(golfer_id) or {}
+                golfers[golfer_id] = {
+                    'name': golfer.get('full_name'),
+                    'datagolf_id': golfer.get('datagolf_id'),
+                }
+
+    return {
+        'league': {'id': league.id, 'name': league.name},
+        'weeks': {
+            'tournament_id': tournament_ids,
+            'week_number': [entry['week_number'] for entry in started],
+            'name': [tournaments[t].tournament_name for t in tournament_ids],
+            'date': [tournaments[t].start_date.strftime('%Y-%m-%d') for t in tournament_ids],
+            'is_major': [tournaments[t].is_major for t in tournament_ids],
+        },
+        'members': {
+            'league_member_id': [member.id for member in members],
+            'name': [member.display_name for member in members],
+            'first_name': [member.first_name for member in members],
+            'last_name': [member.last_name for member in members],
+            'avatar_url': [member.avatar_url for member in members],
+        },
+        'golfers': golfers,
+        'flag_bits': {
+            'no_pick': PICK_FLAG_NO_PICK,
+            'duplicate_pick': PICK_FLAG_DUPLICATE,
+            'win': PICK_FLAG_WIN,
+        },
+        'golfer': golfer_rows,
+        'result': result_rows,
+        'points': points_rows,
+        'flags': flag_rows,
+    }
+
+def get_league_pick_matrix(league_id: int) -> dict:
+    """Get every member's picks for the season so far as a members x weeks matrix
+
+    Only tournaments that have started are included, so upcoming picks stay
+    hidden. Matrix cells are row-major lists aligned with 'members' (rows) and
+    'weeks' (columns); golfer cells hold golfer ids that resolve through the
+    'golfers' dictionary. The matrix is cached per league until the next
+    scoring run, a new member, or the next tournament start.
+
+    Args:
+        league_id: ID of the league
+
+    Returns:
+        dict: Column-encoded pick matrix, or None if the league is not found
+
+    Raises:
+        Exception: Database and other errors, after logging them, so callers can
+            tell them apart from a missing league
+    """
+    try:
+        league = League.query.get(league_id)
+        if not league or not league.schedule_id:
+            return None
+
+        utc_now = datetime.now(pytz.UTC)
+        started = [entry for entry in get_schedule_calendar(league.schedule_id) if entry['start_utc'] <= utc_now]
+
+        version = (get_league_matrix_version(league_id), len(started))
+        matrix = _league_matrix_cache.get(league_id, version)
+        if matrix is None:
+            matrix = _league_matrix_cache.set(league_id, build_league_pick_matrix(league, started), version)
+
+        return matrix
+
+    except Exception as e:
+        logger.error("Error building league pick matrix for league %s: %s", league_id, e, exc_info=True)
+        raise
@@ -1,7 +1,7 @@
 from flask import Blueprint, jsonify
 from modules.authentication.auth import require_auth
 from modules.user.functions import get_league_member_ids
-from .functions import calculate_leaderboard, get_league_member_pick_history
+from .functions import calculate_leaderboard, get_league_member_pick_history, get_league_pick_matrix
 import logging
 
 logger = logging.getLogger(__name__)
@@ -42,13 +42,13 @@ def scoreboard(uid, league_id):
         500 (Server Error): Unexpected error
     """
     try:
-        logging.info(f"Fetching scoreboard for league {league_id}")
+        logger.debug("Fetching scoreboard for league %s", league_id)
         
         # Get user's league memberships to verify access
         league_memberships = get_league_member_ids(uid)
         
         if not league_memberships:
-            logging.warning(f"No leagues found for user {uid}")
+            logger.warning("No leagues found for user %s", uid)
             return jsonify({
                 "status": "error",
                 "message": "User not found in any leagues"
@@ -61,16 +61,14 @@ def scoreboard(uid, league_id):
         )
         
         if not is_member:
-            logging.warning(f"User {uid} attempted to access unauthorized league {league_id}")
+            logger.warning("User %s attempted to access unauthorized league %s", uid, league_id)
             return jsonify({
                 "status": "error",
                 "message": "Not authorized to view this league"
             }), 403
             
         # Get leaderboard data
-        logging.info(f"Calculating leaderboard for league {league_id}")
         leaderboard_data = calculate_leaderboard(league_id)
-        logging.info(f"Leaderboard data: {leaderboard_data}")
         
         if not leaderboard_data:
             return jsonify({
@@ -93,8 +91,6 @@ def scoreboard(uid, league_id):
                 "missedPicks": entry["missed_picks"]
             })
         
-        logging.info(f"Formatted leaderboard: {formatted_leaderboard}")
-        
         return jsonify({
             "status": "success",
             "data": {
@@ -104,7 +100,7 @@ def scoreboard(uid, league_id):
         })
         
     except Exception as e:
-        logging.error(f"Error in scoreboard route: {str(e)}", exc_info=True)
+        logger.error("Error in scoreboard route: %s", e, exc_info=True)
         return jsonify({
             "status": "error",
             "message": f"Server error: {str(e)}"
@@ -116,11 +112,11 @@ def scoreboard(uid, league_id):
 @require_auth
 def check_membership(uid):
     try:
-        logging.info(f"Checking league membership for user {uid}")
+        logger.debug("Checking league membership for user %s", uid)
         league_member_ids = get_league_member_ids(uid)
         
         has_league = bool(league_member_ids)  # Convert to boolean
-        logging.info(f"User {uid} has league: {has_league}")
+        logger.debug("User %s has league: %s", uid, has_league)
         
         return jsonify({
             "hasLeague": has_league
@@ -144,7 +140,7 @@ def get_member_picks(league_member_id):
         JSON response with pick history or error
     """
     try:
-        print('Getting pick history for league member', league_member_id)
+        logger.debug("Getting pick history for league member %s", league_member_id)
         picks = get_league_member_pick_history(league_member_id)
         
         if picks is None:
@@ -159,4 +155,49 @@ def get_member_picks(league_member_id):
         return jsonify({
             'error': f'Internal server error fetching pick history: {str(e)}'
         }), 500
-        
+
+
+@league_bp.route('/<int:league_id>/pick-matrix', methods=['GET'])
+@require_auth
+def pick_matrix(uid, league_id):
+    """Get every member's season of picks for a league in a single response
+
+    Replaces one /user/history call per member. See get_league_pick_matrix
+    for the column encoding.
+
+    Args:
+        uid (str): Firebase user ID from auth token
+        league_id (int): ID of the league to get the matrix for
+
+    Returns:
+        200 (OK): Pick matrix for the league
+        403 (Forbidden): User is not a member of the league
+        404 (Not Found): League not found
+        500 (Server Error): Unexpected error
+    """
+    try:
+        league_memberships = get_league_member_ids(uid) or []
+        if not any(league['league_id'] == league_id for league in league_memberships):
+            return jsonify({
+                "status": "error",
+                "message": "Not authorized to view this league"
+            }), 403
+
+        matrix = get_league_pick_matrix(league_id)
+        if matrix is None:
+            return jsonify({
+                "status": "error",
+                "message": "League not found"
+            }), 404
+
+        return jsonify({
+            "status": "success",
+            "data": matrix
+        }), 200
+
+    except Exception as e:
+        logger.error("Error in pick matrix route: %s", e, exc_info=True)
+        return jsonify({
+            "status": "error",
+            "message": f"Server error: {str(e)}"
+        }), 500
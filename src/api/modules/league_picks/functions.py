@@ -50,7 +50,7 @@ def get_current_week_picks(league_id: int) -> dict:
         # Get league's schedule
         league = League.query.get(league_id)
         if not league:
-            logger.debug(f"No league found with ID: {league_id}")
+            logger.debug("No league found with ID: %s", league_id)
             return None
             
         # Get current time in UTC
@@ -85,7 +85,8 @@ def get_current_week_picks(league_id: int) -> dict:
             # Check if the tournament has started
             if utc_now >= tournament_start_utc:
                 is_ongoing = tournament.end_date >= utc_now.date()
-                logger.debug(f"Most recent started tournament: {tournament.tournament_name} (ID: {tournament.id}, Ongoing: {is_ongoing})")
+                logger.debug("Most recent started tournament: %s (ID: %s, Ongoing: %s)",
+                             tournament.tournament_name, tournament.id, is_ongoing)
                 
                 # Get all league members, their picks, and scores
                 picks_query = (
@@ -120,11 +121,14 @@ def get_current_week_picks(league_id: int) -> dict:
 
                 # Create a dictionary to store unique member picks
                 member_picks = {}
+                debug = logger.isEnabledFor(logging.DEBUG)
                 for member, user, pick, golfer, result, score in picks_query:
-                    # Debugging output to check the data
-                    logger.debug(f"Processing pick for member: {member.id}, golfer: {golfer.id if golfer else 'None'}")
-                    logger.debug(f"Tournament Golfer ID: {result.tournament_golfer_id if result else 'None'}")
-                    logger.debug(f"Result: {result}, Score to Par: {result.score_to_par if result else 'None'}, Position: {result.result if result else 'None'}")
+                    if debug:
+                        logger.debug("Pick for member %s: golfer %s, tournament golfer %s, result %s, to par %s",
+                                     member.id, golfer.id if golfer else None,
+                                     result.tournament_golfer_id if result else None,
+                                     result.result if result else None,
+                                     result.score_to_par if result else None)
 
                     # If we haven't seen this member or this entry has a score and the previous didn't
                     if member.id not in member_picks or (
@@ -182,5 +186,5 @@ def get_current_week_picks(league_id: int) -> dict:
         return None
         
     except Exception as e:
-        logger.error(f"Error getting league picks: {e}", exc_info=True)
+        logger.error("Error getting league picks: %s", e, exc_info=True)
         return None
\ No newline at end of file
@@ -1,18 +1,23 @@
-import requests
 import os
 import asyncio
 from data_aggregator.datagolf.live_results.live_results_cache import load_cache, save_cache, is_cache_stale
 from datetime import datetime
 from data_aggregator.datagolf.live_results.aggregator import fetch_combined_data as big_fetch
 
+from data_aggregator.provider_client import fetch_feed
+
 DATAGOLF_API_KEY = os.getenv('DATAGOLFAPI_KEY')
-DATAGOLF_API_URL = f"https://feeds.datagolf.com/preds/live-tournament-stats?stats=sg_putt,sg_arg,sg_app,sg_ott,sg_t2g,sg_bs,sg_total,distance,accuracy,gir,prox_fw,prox_rgh,scrambling&round=event_avg&display=value&key={DATAGOLF_API_KEY}"
+DATAGOLF_LIVE_STATS_PATH = "/preds/live-tournament-stats"
+LIVE_STATS = 'sg_putt,sg_arg,sg_app,sg_ott,sg_t2g,sg_bs,sg_total,distance,accuracy,gir,prox_fw,prox_rgh,scrambling'
 
 def fetch_tournament_state():
     """Fetch the latest tournament state from the DataGolf API."""
-    response = requests.get(DATAGOLF_API_URL)
-    response.raise_for_status()
-    return response.json()
+    return fetch_feed('datagolf', DATAGOLF_LIVE_STATS_PATH, params={
+        'stats': LIVE_STATS,
+        'round': 'event_avg',
+        'display': 'value',
+        'key': DATAGOLF_API_KEY
+    }).data
 
 def get_latest_tournament_state():
     """Get the latest tournament state, updating if necessary."""
@@ -31,8 +36,48 @@ def get_latest_tournament_state():
     return tournament_state
 
 def a_big_fetch():
-    print("passing big fetch to aggregator")
     return big_fetch()
 
 def sync_big_fetch():
-    return asyncio.run(a_big_fetch())
\ No newline at end of file
+    return asyncio.run(a_big_fetch())
+
+def get_golfer_history(dg_id: int, table: str = 'live_stats', tournament: str = None, columns: list = None,
+                       start: str = None, end: str = None):
+    """
+    A golfer's time series for a tournament from the live history store.
+
+    Args:
+        dg_id (int): DataGolf player ID
+        table (str): 'live_stats' or 'model_predictions'
+        tournament (str): Tournament key, defaults to the most recently updated one
+        columns (list): Columns to return, defaults to all
+        start (str): ISO start time (UTC), defaults to the beginning
+        end (str): ISO end time (UTC), defaults to the latest
+
+    Returns:
+        dict: Tournament key and column name -> list of values (NaN as None),
+            or None if nothing has been recorded
+
+    Raises:
+        KeyError: If the table is unknown
+        ValueError: If a column or time is invalid
+    """
+    from data_aggregator.datagolf.live_results.history import LiveHistoryStore, timestamp_ms
+
+    store = LiveHistoryStore()
+    tournament = tournament or next(iter(store.tournaments()), None)
+    if tournament is None:
+        return None
+    data = store.read(tournament, table, dg_ids=[dg_id], columns=columns,
+                      start_ms=timestamp_ms(start) if start else None,
+                      end_ms=timestamp_ms(end) if end else None)
+
+    series = {}
+    for name, values in data.items():
+        if values.dtype.kind == 'S':
+            series[name] = [value.decode() for value in values.tolist()]
+        elif values.dtype.kind == 'f':
+            series[name] = [None if value != value else round(value, 4) for value in values.tolist()]
+        else:
+            series[name] = values.tolist()
+    return {'tournament': tournament, 'table': table, 'dg_id': dg_id, 'points': len(data['ts']), 'columns': series}
@@ -1,9 +1,13 @@
-from flask import Blueprint, jsonify
+import logging
+
+from flask import Blueprint, jsonify, request
 from modules.live_tournament.functions import get_latest_tournament_state
 from modules.authentication.auth import require_auth
 
 
-from modules.live_tournament.functions import get_latest_tournament_state, a_big_fetch
+from modules.live_tournament.functions import get_latest_tournament_state, a_big_fetch, get_golfer_history
+
+logger = logging.getLogger(__name__)
 
 live_tournament_bp = Blueprint('live_results', __name__)
 
@@ -24,9 +28,45 @@ def tournament_state():
 def the_big_fetch(uid):
     """API endpoint to get the current tournament state."""
     try:
-        print("Starting big fetch")
         out = a_big_fetch()
-        print("Big fetch complete")
         return jsonify(out), 200
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+
+@live_tournament_bp.route('/history/<int:dg_id>', methods=['GET'])
+@require_auth
+def golfer_history(uid, dg_id):
+    """
+    A golfer's live stats or win probabilities over a tournament, for charts.
+
+    Query params:
+        table: 'live_stats' (default) or 'model_predictions'
+        columns: Comma separated columns, e.g. 'position_num,sg_total' (default all)
+        tournament: Tournament key (default the current one)
+        start, end: ISO times (UTC) bounding the range
+
+    Returns:
+        200 (OK): {'tournament', 'table', 'dg_id', 'points', 'columns': {name: [values...]}}
+        400 (Bad Request): Unknown table or column, or invalid time
+        404 (Not Found): No history recorded yet
+    """
+    columns = request.args.get('columns')
+    try:
+        history = get_golfer_history(
+            dg_id,
+            table=request.args.get('table', 'live_stats'),
+            tournament=request.args.get('tournament'),
+            columns=columns.split(',') if columns else None,
+            start=request.args.get('start'),
+            end=request.args.get('end'),
+        )
+    except (KeyError, ValueError) as e:
+        return jsonify({'error': f"Invalid request: {e}"}), 400
+    except Exception as e:
+        logger.error("Error reading golfer history: %s", e, exc_info=True)
+        return jsonify({'error': str(e)}), 500
+
+    if history is None:
+        return jsonify({'error': 'No live history recorded'}), 404
+    return jsonify(history), 200
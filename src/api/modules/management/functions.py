@@ -37,7 +37,7 @@ def create_user_in_db(uid: str, data: dict) -> tuple[dict, int]:
         # Check if user already exists
         existing_user = User.query.filter_by(firebase_id=uid).first()
         if existing_user:
-            logger.info(f"User already exists with Firebase ID: {uid}")
+            logger.debug("User already exists with Firebase ID: %s", uid)
             return {
                 'message': 'User already exists',
                 'user_id': existing_user.id
@@ -56,7 +56,7 @@ def create_user_in_db(uid: str, data: dict) -> tuple[dict, int]:
         db.session.add(new_user)
         db.session.commit()
         
-        logger.info(f"Created new user with ID: {new_user.id}")
+        logger.debug("Created new user with ID: %s", new_user.id)
         return {
             'message': 'User created successfully',
             'user_id': new_user.id
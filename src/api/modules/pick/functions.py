@@ -2,10 +2,13 @@ from models import Pick, Tournament, Golfer
 from sqlalchemy import desc, select, text
 from datetime import datetime
 import pytz
+import logging
 from utils.db_connector import db
 #TODO:Find new gf who isn't mean to her boyfriend when he has tni
 from modules.user.functions import get_league_member_ids
 
+logger = logging.getLogger(__name__)
+
 
 def submit_pick(uid, tournament_id, golfer_id, league_member_id):
     league_member_ids = get_league_member_ids(uid)
@@ -124,5 +127,5 @@ def get_most_recent_pick(uid, tournament_id, league_member_id):
         }
 
     except Exception as e:
-        print(f"Error in get_most_recent_pick: {str(e)}")
+        logger.error("Error in get_most_recent_pick: %s", e)
         raise
\ No newline at end of file
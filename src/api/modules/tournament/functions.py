@@ -1,4 +1,4 @@
-from models import Tournament, TournamentGolfer, Golfer, Pick, User, LeagueMember, Schedule, ScheduleTournament, League
+from models import Tournament, TournamentGolfer, Golfer, Pick, User, LeagueMember, Schedule, ScheduleTournament, League, GolferCurrentRanking, GolferPhoto
 from datetime import datetime
 from sqlalchemy import text, case, desc, and_
 from utils.db_connector import db
@@ -6,6 +6,80 @@ import logging
 import pytz
 
 from modules.user.functions import get_league_member_ids
+from utils.functions.golfer_index import get_golfer_index
+from utils.cache import VersionedCache
+from utils.image_store import url_for
+
+logger = logging.getLogger(__name__)
+
+GOLFER_PAGE_SIZE = 50
+GOLFER_PAGE_SIZE_MAX = 200
+GOLFER_SCOPES = ('field', 'off_field', 'all')
+
+CALENDAR_TTL_SECONDS = 60 * 60  # Schedules rarely change, rebuild hourly
+_calendar_cache = VersionedCache(maxsize=64, ttl=CALENDAR_TTL_SECONDS, name='schedule_calendar')
+
+
+def tournament_start_utc(start_date, start_time, time_zone) -> datetime:
+    """
+    Convert a tournament's local start date and time to a UTC datetime.
+
+    Args:
+        start_date (date): Local start date of the tournament
+        start_time (time): Local start time, defaults to midnight if missing
+        time_zone (str): Time zone name, defaults to America/New_York if missing
+
+    Returns:
+        datetime: Timezone-aware start datetime in UTC
+    """
+    tournament_tz = pytz.timezone(time_zone or 'America/New_York')
+    tournament_local = tournament_tz.localize(
+        datetime.combine(start_date, start_time or datetime.min.time())
+    )
+    return tournament_local.astimezone(pytz.UTC)
+
+
+def get_schedule_calendar(schedule_id: int) -> list:
+    """
+    Get the tournament calendar for a schedule with start times resolved to UTC.
+
+    The calendar is cached per schedule, so callers can decide whether a
+    tournament is in the future without re-localizing time zones per request.
+
+    Args:
+        schedule_id (int): The ID of the schedule.
+
+    Returns:
+        list[dict]: Tournaments ordered by start, each with tournament_id,
+            week_number, start_utc and end_date.
+    """
+    calendar = _calendar_cache.get(schedule_id)
+    if calendar is not None:
+        return calendar
+
+    rows = (db.session.query(
+            Tournament.id,
+            Tournament.start_date,
+            Tournament.start_time,
+            Tournament.time_zone,
+            Tournament.end_date,
+            ScheduleTournament.week_number
+        )
+        .join(ScheduleTournament, ScheduleTournament.tournament_id == Tournament.id)
+        .filter(ScheduleTournament.schedule_id == schedule_id)
+        .all()
+    )
+
+    calendar = sorted((
+        {
+            'tournament_id': row.id,
+            'week_number': row.week_number,
+            'start_utc': tournament_start_utc(row.start_date, row.start_time, row.time_zone),
+            'end_date': row.end_date,
+        } for row in rows
+    ), key=lambda entry: entry['start_utc'])
+
+    return _calendar_cache.set(schedule_id, calendar)
 
 
 def get_most_recent_tournament(league_id):
@@ -24,7 +98,7 @@ def get_most_recent_tournament(league_id):
         # Get the league
         league = League.query.get(league_id)
         if not league or not league.schedule_id:
-            logging.warning(f"No schedule found for league {league_id}")
+            logger.warning("No schedule found for league %s", league_id)
             return None
 
         # Get tournaments that might be current or recent
@@ -65,11 +139,11 @@ def get_most_recent_tournament(league_id):
                 "location_raw": tournament.location_raw,
             }
             
-        logging.warning("No recent tournaments found")
+        logger.warning("No recent tournaments found")
         return None
         
     except Exception as e:
-        logging.error(f"Error in get_most_recent_tournament: {str(e)}")
+        logger.error("Error in get_most_recent_tournament: %s", e)
         raise
 
 
@@ -145,7 +219,7 @@ def get_upcoming_tournament(league_id):
             }
         }
     except Exception as e:
-        logging.error(f"Error in get_upcoming_tournament: {str(e)}")
+        logger.error("Error in get_upcoming_tournament: %s", e)
         return {"status": "error", "message": str(e)}
 
 
@@ -193,7 +267,7 @@ def populate_drop_down(uid):
 
 
 # TODO: Ger rid of shortcut for first league_member_id
-        # TODO: Implement lazy loading for the golfers not on the upcoming roster
+# NOTE: Ships every golfer in the table, prefer get_golfer_catalogue_page for the pick screen
 def get_golfers_with_roster_and_picks(tournament_id: int, uid: str,league_member_id: int):
     """
     Retrieves golfers with roster and picks information for a specific tournament.
@@ -224,9 +298,11 @@ def get_golfers_with_roster_and_picks(tournament_id: int, uid: str,league_member
                     Pick.tournament_id != tournament_id
                 )
             )
+            .outerjoin(GolferPhoto, Golfer.id == GolferPhoto.golfer_id)
             .add_columns(
                 TournamentGolfer.tournament_id.isnot(None).label('is_playing_in_tournament'),
-                Pick.id.isnot(None).label('has_been_picked')
+                Pick.id.isnot(None).label('has_been_picked'),
+                GolferPhoto.small
             )
             .order_by(
                 desc('is_playing_in_tournament'),
@@ -241,14 +317,92 @@ def get_golfers_with_roster_and_picks(tournament_id: int, uid: str,league_member
                 'full_name': golfer.full_name,
                 'first_name': golfer.first_name,
                 'last_name': golfer.last_name,
-                'photo_url': golfer.photo_url,
+                'photo_url': url_for(small_photo) or golfer.photo_url,
                 'datagolf_id': golfer.datagolf_id,
                 'has_been_picked': bool(has_been_picked),
                 'is_playing_in_tournament': bool(is_playing_in_tournament)
-            } for golfer, is_playing_in_tournament, has_been_picked in golfers]
+            } for golfer, is_playing_in_tournament, has_been_picked, small_photo in golfers]
         }
         
     except Exception as e:
-        print(f"Error fetching golfer data: {str(e)}")
+        logger.error("Error fetching golfer data: %s", e)
         return None
 
+
+def get_golfer_catalogue_page(tournament_id: int, league_member_id: int, scope: str = 'field',
+                              query: str = '', cursor: str = None, limit: int = GOLFER_PAGE_SIZE):
+    """
+    Retrieves one page of the golfer catalogue for the pick screen.
+
+    Golfers are served from the in-memory golfer index, so the cost of a page
+    depends on the page size and the tournament field, not on the size of the
+    golfer table. Only the field and the member's previous picks are queried.
+
+    Args:
+        tournament_id (int): ID of the tournament being picked for
+        league_member_id (int): ID of the league member making the pick
+        scope (str): 'field' for golfers in the tournament field, 'off_field' for
+            everyone else, 'all' for both
+        query (str): Optional name prefix, matched against full and last names
+        cursor (str): Golfer ID of the last golfer on the previous page
+        limit (int): Maximum number of golfers to return
+
+    Returns:
+        dict: Page of golfers in the same shape as the dropdown endpoint, plus
+            the cursor for the next page (None when there are no more golfers)
+    """
+    if scope not in GOLFER_SCOPES:
+        raise ValueError(f"Invalid scope '{scope}', expected one of {', '.join(GOLFER_SCOPES)}")
+
+    limit = max(1, min(int(limit), GOLFER_PAGE_SIZE_MAX))
+    index = get_golfer_index()
+
+    field_ids = {
+        golfer_id for (golfer_id,) in db.session.query(TournamentGolfer.golfer_id)
+        .filter(
+            TournamentGolfer.tournament_id == tournament_id,
+            TournamentGolfer.is_most_recent == True
+        )
+    }
+
+    if scope == 'field':
+        golfer_ids, next_cursor = index.search(query, cursor, limit, include=field_ids)
+    elif scope == 'off_field':
+        golfer_ids, next_cursor = index.search(query, cursor, limit, exclude=field_ids)
+    else:
+        golfer_ids, next_cursor = index.search(query, cursor, limit)
+
+    picked_ids = set()
+    rankings = {}
+    if golfer_ids:
+        # Primary key reads of the page's golfers
+        rankings = dict(
+            db.session.query(GolferCurrentRanking.golfer_id, GolferCurrentRanking.owgr)
+            .filter(GolferCurrentRanking.golfer_id.in_(golfer_ids))
+        )
+        picked_ids = {
+            golfer_id for (golfer_id,) in db.session.query(Pick.golfer_id)
+            .filter(
+                Pick.league_member_id == league_member_id,
+                Pick.is_most_recent == True,
+                Pick.tournament_id != tournament_id,
+                Pick.golfer_id.in_(golfer_ids)
+            )
+        }
+
+    golfers = []
+    for golfer_id in golfer_ids:
+        golfer = index.get(golfer_id)
+        golfers.append({
+            **golfer,
+            'owgr': rankings.get(golfer_id),
+            'has_been_picked': golfer_id in picked_ids,
+            'is_playing_in_tournament': golfer_id in field_ids
+        })
+
+    return {
+        "ids": {"tournament_id": tournament_id},
+        "scope": scope,
+        "golfers": golfers,
+        "next_cursor": next_cursor
+    }
@@ -1,7 +1,12 @@
 from flask import Blueprint, jsonify, request
 from modules.authentication.auth import require_auth
+from modules.user.functions import get_league_member_ids
 from .functions import (get_golfers_with_roster_and_picks, get_upcoming_roster,
-    get_upcoming_tournament, get_most_recent_tournament)
+    get_upcoming_tournament, get_most_recent_tournament, get_golfer_catalogue_page,
+    GOLFER_PAGE_SIZE)
+import logging
+
+logger = logging.getLogger(__name__)
 
 tournament_bp = Blueprint('tournament', __name__)
 
@@ -72,4 +77,51 @@ def get_dd_data(uid, league_member_id):
     if dd is None:
         return jsonify({'error': 'No upcoming roster found'}), 404
 
-    return dd, 200
\ No newline at end of file
+    return dd, 200
+
+
+@tournament_bp.route('/golfers/<int:league_member_id>', methods=['GET'])
+@require_auth
+def get_golfer_catalogue(uid, league_member_id):
+    """
+    Endpoint to page through the golfer catalogue for golfer selection.
+
+    Query Args:
+        tournament_id (int): ID of the tournament being picked for (required)
+        scope (str): 'field' (default), 'off_field' or 'all'
+        q (str): Optional name prefix to search for
+        cursor (str): Value of next_cursor from the previous page
+        limit (int): Page size, defaults to 50 (max 200)
+
+    Returns:
+        200 (OK): Page of golfers and the cursor for the next page
+        400 (Bad Request): Missing or invalid arguments
+        403 (Forbidden): League member does not belong to the user
+        500 (Server Error): Unexpected error
+    """
+    tournament_id = request.args.get('tournament_id', type=int)
+    if tournament_id is None:
+        return jsonify({'error': 'tournament_id is required'}), 400
+
+    limit = request.args.get('limit', GOLFER_PAGE_SIZE, type=int)
+
+    league_memberships = get_league_member_ids(uid) or []
+    if not any(m['league_member_id'] == league_member_id for m in league_memberships):
+        return jsonify({'error': 'Not authorized for this league member'}), 403
+
+    try:
+        page = get_golfer_catalogue_page(
+            tournament_id,
+            league_member_id,
+            scope=request.args.get('scope', 'field'),
+            query=request.args.get('q', ''),
+            cursor=request.args.get('cursor'),
+            limit=limit
+        )
+        return jsonify(page), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error fetching golfer catalogue: {e}", exc_info=True)
+        return jsonify({'error': 'Internal server error'}), 500
@@ -201,14 +201,14 @@ def get_detailed_pick_history_by_member(league_member_id: int):
 
 def get_db_user_id(firebase_id: str) -> int:
     """Convert Firebase UID to database user ID"""
-    logger.debug(f"Looking up database ID for Firebase UID: {firebase_id}")
+    logger.debug("Looking up database ID for Firebase UID: %s", firebase_id)
     
     user = User.query.filter_by(firebase_uid=firebase_id).first()
     if not user:
         logger.error(f"No database user found for Firebase UID: {firebase_id}")
         raise ValueError("User not found in database")
         
-    logger.debug(f"Found database user ID: {user.id}")
+    logger.debug("Found database user ID: %s", user.id)
     return user.id
 
 # TODO: Move this to the tournament module
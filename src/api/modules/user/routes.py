@@ -1,7 +1,6 @@
 from flask import Blueprint, jsonify
 from modules.authentication.auth import require_auth
 from modules.user.functions import get_most_recent_pick, pick_history, submit_pick, get_league_member_ids
-from modules.authentication.auth import default_app
 from modules.league.functions import get_league_member_pick_history
 import logging
 
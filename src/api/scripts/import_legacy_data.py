@@ -1,7 +1,13 @@
-import pandas as pd
+import argparse
+import csv
 from flask import Flask
+from sqlalchemy import insert
 from utils.db_connector import db, init_db
-from models import League, LegacyMember, LegacyMemberPick, Tournament, Golfer
+from utils.functions.golfer_index import GolferIndex, get_golfer_index, normalize_name
+from models import League, LegacyMember, LegacyMemberPick, Tournament
+
+CHUNK_SIZE = 1000
+NO_PICK_VALUES = {'', 'no pick', 'n/a', 'nan'}
 
 def normalize_word(word: str) -> str:
     """Normalize a single word for comparison"""
@@ -10,127 +16,186 @@ def normalize_word(word: str) -> str:
 def find_best_tournament_match(target_name: str, tournaments: list[Tournament]) -> Tournament:
     """Find tournament with most words in common"""
     target_words = set(normalize_word(word) for word in target_name.split())
-    
+
     best_match = None
     most_matches = 0
-    
+
     for tournament in tournaments:
         tournament_words = set(normalize_word(word) for word in tournament.tournament_name.split())
         matching_words = len(target_words.intersection(tournament_words))
-        
+
         if matching_words > most_matches:
             most_matches = matching_words
             best_match = tournament
-            
+
     if best_match:
         print(f"Matched '{target_name}' to '{best_match.tournament_name}' with {most_matches} matching words")
     else:
         print(f"No match found for '{target_name}'")
-        
+
     return best_match
 
-def find_golfer_by_name(pick_name: str) -> Golfer:
+def find_golfer_by_name(pick_name: str, index: GolferIndex = None) -> dict:
     """
     Find golfer, handling team events and matching by last name if needed.
+    Looks names up in the in-memory golfer index instead of querying the golfer table.
+
+    Args:
+        pick_name (str): Name as written in the sheet, e.g. 'Rory McIlroy' or 'McIlroy / Lowry'
+        index (GolferIndex): Golfer index, defaults to the shared one
+
+    Returns:
+        dict: Golfer from the index, or None
     """
+    index = index or get_golfer_index()
+
     # Handle team events (e.g., "McIlroy / Lowry")
     if '/' in pick_name:
         pick_name = pick_name.split('/')[0].strip()
-    
-    # Try exact match first
-    golfer = Golfer.query.filter(
-        Golfer.full_name.ilike(f"%{pick_name}%")
-    ).first()
-    
-    if not golfer:
+
+    # Try exact match first, then names starting with the pick
+    golfer_id = index.find_by_name(pick_name)
+    if golfer_id is None:
+        matches, _ = index.search(pick_name, limit=1)
+        golfer_id = matches[0] if matches else None
+
+    if golfer_id is None and pick_name.split():
         # Try matching by last name
-        last_name = pick_name.split()[-1]
-        golfer = Golfer.query.filter(
-            Golfer.last_name.ilike(last_name)
-        ).first()
-        
-        if golfer:
-            print(f"Matched '{pick_name}' to '{golfer.full_name}' by last name")
-    
-    return golfer
-
-def import_picks_for_existing_league(csv_path: str, league_id: int = 7):
-    """Import picks for existing league and members"""
+        last_name = normalize_name(pick_name.split()[-1])
+        candidates, _ = index.search(last_name, limit=50)
+        golfer_id = next((candidate for candidate in candidates
+                          if normalize_name(index.get(candidate)['last_name']) == last_name), None)
+        if golfer_id:
+            print(f"Matched '{pick_name}' to '{index.get(golfer_id)['full_name']}' by last name")
+
+    return index.get(golfer_id) if golfer_id else None
+
+def legacy_user_name(user_name: str) -> str:
+    """LegacyMember.user_name for a name in the sheet"""
+    return user_name.lower().replace(' ', '_').replace("'", "")
+
+def import_picks_for_existing_league(csv_path: str, league_id: int = 7, year: int = 2024,
+                                     chunk_size: int = CHUNK_SIZE) -> dict:
+    """
+    Import picks for existing league and members.
+
+    The sheet is read row by row. Tournament columns are matched once, from the
+    header; golfer names are looked up in the golfer index and remembered;
+    members, and the picks already imported, are loaded with one query each.
+    Picks are inserted in chunks, and picks that already exist are skipped, so
+    importing a file twice is harmless.
+
+    Args:
+        csv_path (str): Sheet with two header rows (tournament names on the second),
+            one row per member: name, number of no picks, then a pick per tournament
+        league_id (int): League the members belong to
+        year (int): Season of the sheet
+        chunk_size (int): Picks per insert
+
+    Returns:
+        dict: Counts of 'inserted', 'existing' and 'unmatched_golfers' picks, None if
+            the league doesn't exist
+    """
     # Get existing league
-    league = League.query.get(league_id)
+    league = db.session.get(League, league_id)
     if not league:
         print(f"League with id {league_id} not found")
-        return
-    
-    print(f"Importing picks for league: {league.name}")
-    
-    # Read the CSV file
-    df = pd.read_csv(csv_path, header=[0,1])
-    df.set_index(df.columns[0], inplace=True)
-    df = df.drop(df.columns[0], axis=1)  # Drop "number of no picks"
-    
-    tournament_names = df.columns.get_level_values(1)
-    print(f"Found {len(tournament_names)} tournaments in CSV")
-    
-    # Get all 2024 tournaments once
+        return None
+
+    print(f"Importing {year} picks for league: {league.name}")
+
+    # Everything the rows are resolved against, loaded once
     tournaments = Tournament.query.filter(
-        Tournament.start_date.between('2024-01-01', '2024-12-31')
+        Tournament.start_date.between(f'{year}-01-01', f'{year}-12-31')
     ).all()
-    
-    # Process each user's picks
-    for user_name in df.index:
-        member = LegacyMember.query.filter_by(
-            league_id=league_id,
-            user_name=user_name.lower().replace(' ', '_').replace("'", "")
-        ).first()
-        
-        if not member:
-            print(f"Member not found for {user_name}")
-            continue
-            
-        print(f"\nProcessing picks for {member.display_name}")
-        
-        # Process each tournament pick
-        for tournament_name, pick_name in zip(tournament_names, df.loc[user_name]):
-            # Find tournament with word matching
+    member_ids = dict(db.session.query(LegacyMember.user_name, LegacyMember.id).filter_by(league_id=league_id))
+    existing = set(
+        db.session.query(LegacyMemberPick.legacy_member_id, LegacyMemberPick.tournament_id)
+        .join(LegacyMember, LegacyMember.id == LegacyMemberPick.legacy_member_id)
+        .filter(LegacyMember.league_id == league_id)
+    )
+    index = get_golfer_index()
+    golfers = {}
+
+    counts = {'inserted': 0, 'existing': 0, 'unmatched_golfers': 0}
+    chunk = []
+
+    def flush():
+        # Core insert: one executemany, whichever columns are null
+        db.session.execute(insert(LegacyMemberPick.__table__), chunk)
+        db.session.commit()
+        counts['inserted'] += len(chunk)
+        chunk.clear()
+
+    with open(csv_path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        next(reader)  # Top header row
+        tournament_names = next(reader)[2:]  # Skip the member and "number of no picks" columns
+        print(f"Found {len(tournament_names)} tournaments in CSV")
+        columns = []
+        for tournament_name in tournament_names:
             matched_tournament = find_best_tournament_match(tournament_name, tournaments)
-            
             if not matched_tournament:
                 print(f"Tournament not found: {tournament_name}")
+            columns.append(matched_tournament.id if matched_tournament else None)
+
+        # Process each user's picks
+        for row in reader:
+            if not row or not row[0].strip():
                 continue
-                
-            # Handle no picks
-            if pd.isna(pick_name) or pick_name.lower() in ['no pick', 'n/a']:
-                no_pick = True
-                golfer_id = None
-                golfer_name = None
-            else:
-                no_pick = False
-                golfer_name = pick_name
-                
-                # Find golfer with enhanced matching
-                golfer = find_golfer_by_name(pick_name)
-                golfer_id = golfer.id if golfer else None
-                
-                if not golfer:
-                    print(f"Golfer not found: {pick_name}")
-            
-            # Create pick
-            pick = LegacyMemberPick(
-                legacy_member_id=member.id,
-                tournament_id=matched_tournament.id,
-                golfer_name=golfer_name,
-                golfer_id=golfer_id,
-                no_pick=no_pick
-            )
-            db.session.add(pick)
-            
-        # Commit after each member's picks
-        db.session.commit()
-        print(f"Added picks for {member.display_name}")
+            user_name = row[0].strip()
+            member_id = member_ids.get(legacy_user_name(user_name))
+            if not member_id:
+                print(f"Member not found for {user_name}")
+                continue
+
+            for tournament_id, pick_name in zip(columns, row[2:]):
+                if tournament_id is None:
+                    continue
+                key = (member_id, tournament_id)
+                if key in existing:
+                    counts['existing'] += 1
+                    continue
+                existing.add(key)
+
+                # Handle no picks
+                pick_name = pick_name.strip()
+                if pick_name.lower() in NO_PICK_VALUES:
+                    no_pick, golfer_name, golfer_id = True, None, None
+                else:
+                    no_pick, golfer_name = False, pick_name
+                    if pick_name not in golfers:
+                        golfer = find_golfer_by_name(pick_name, index)
+                        golfers[pick_name] = golfer['id'] if golfer else None
+                        if not golfer:
+                            print(f"Golfer not found: {pick_name}")
+                    golfer_id = golfers[pick_name]
+                    counts['unmatched_golfers'] += golfer_id is None
+
+                chunk.append({
+                    'legacy_member_id': member_id,
+                    'tournament_id': tournament_id,
+                    'golfer_name': golfer_name,
+                    'golfer_id': golfer_id,
+                    'no_pick': no_pick,
+                })
+                if len(chunk) >= chunk_size:
+                    flush()
+    if chunk:
+        flush()
+
+    print(f"Imported picks for {league.name}: {counts}")
+    return counts
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import legacy pick sheets into existing leagues")
+    parser.add_argument('csv_paths', nargs='*', default=["src/api/data/legacy_imports/2024_squilliam.csv"])
+    parser.add_argument('--league-id', type=int, default=7)
+    parser.add_argument('--year', type=int, default=2024)
+    args = parser.parse_args()
+
     app = Flask(__name__)
     init_db(app)
     with app.app_context():
-        import_picks_for_existing_league("src/api/data/legacy_imports/2024_squilliam.csv")
+        for csv_path in args.csv_paths:
+            import_picks_for_existing_league(csv_path, args.league_id, args.year)
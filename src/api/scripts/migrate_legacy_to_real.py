@@ -1,19 +1,26 @@
+from collections import defaultdict
 from flask import Flask
+from sqlalchemy import extract, insert
 from utils.db_connector import db, init_db
-from models import League, LegacyMember, LegacyMemberPick, LeagueMember, Pick, User
+from models import League, LegacyMember, LegacyMemberPick, LeagueMember, Pick, Tournament, User
+
+CHUNK_SIZE = 1000
 
 def get_role_id(first_name: str, last_name: str) -> int:
     """Determine role ID based on user name"""
     # for now, all legacy members are just members. 
     return 3  # Member
 
-def migrate_legacy_to_real(legacy_league_id: int = 7):
+def migrate_legacy_to_real(legacy_league_id: int = 7, chunk_size: int = CHUNK_SIZE):
     """
     Migrate legacy members and their picks to real league members and picks.
     Creates Users without Firebase auth for historical data.
+
+    Legacy picks, the members' existing picks and the tournament years are each
+    loaded with one query; picks are deduped against a set and inserted in chunks.
     """
     # Get legacy league
-    legacy_league = League.query.get(legacy_league_id)
+    legacy_league = db.session.get(League, legacy_league_id)
     if not legacy_league:
         print(f"Legacy league {legacy_league_id} not found")
         return
@@ -24,12 +31,31 @@ def migrate_legacy_to_real(legacy_league_id: int = 7):
     legacy_members = LegacyMember.query.filter_by(league_id=legacy_league_id).all()
     print(f"Found {len(legacy_members)} legacy members")
 
+    legacy_picks_by_member = defaultdict(list)
+    for legacy_pick in (LegacyMemberPick.query
+                        .join(LegacyMember, LegacyMember.id == LegacyMemberPick.legacy_member_id)
+                        .filter(LegacyMember.league_id == legacy_league_id,
+                                LegacyMemberPick.no_pick == False,
+                                LegacyMemberPick.golfer_id.isnot(None))):
+        legacy_picks_by_member[legacy_pick.legacy_member_id].append(legacy_pick)
+    tournament_years = dict(
+        db.session.query(Tournament.id, extract('year', Tournament.start_date))
+        .filter(Tournament.id.in_({pick.tournament_id for picks in legacy_picks_by_member.values() for pick in picks}))
+    )
+    existing_picks = set(
+        db.session.query(Pick.league_member_id, Pick.tournament_id, Pick.year)
+        .join(LeagueMember, LeagueMember.id == Pick.league_member_id)
+        .filter(LeagueMember.league_id == legacy_league.id)
+    )
+    users = {}
+    for user in User.query.filter(User.last_name.in_({member.last_name for member in legacy_members})):
+        users.setdefault((user.first_name, user.last_name), user)
+    league_members = {member.user_id: member for member in LeagueMember.query.filter_by(league_id=legacy_league.id)}
+    new_picks = []
+
     for legacy_member in legacy_members:
         # Create or get User
-        user = User.query.filter_by(
-            first_name=legacy_member.first_name,
-            last_name=legacy_member.last_name
-        ).first()
+        user = users.get((legacy_member.first_name, legacy_member.last_name))
         
         if not user:
             print(f"Creating new user for {legacy_member.display_name}")
@@ -42,16 +68,14 @@ def migrate_legacy_to_real(legacy_league_id: int = 7):
             )
             db.session.add(user)
             db.session.flush()
+            users[(user.first_name, user.last_name)] = user
             print(f"Created user with ID: {user.id}")
 
         # Get appropriate role ID
         role_id = get_role_id(legacy_member.first_name, legacy_member.last_name)
 
         # Check if LeagueMember already exists
-        league_member = LeagueMember.query.filter_by(
-            league_id=legacy_league.id,
-            user_id=user.id
-        ).first()
+        league_member = league_members.get(user.id)
 
         if not league_member:
             league_member = LeagueMember(
@@ -61,40 +85,37 @@ def migrate_legacy_to_real(legacy_league_id: int = 7):
             )
             db.session.add(league_member)
             db.session.flush()
+            league_members[user.id] = league_member
             print(f"Created league member for {user.display_name} with role {role_id}")
 
-        # Get all picks for this legacy member
-        legacy_picks = LegacyMemberPick.query.filter_by(
-            legacy_member_id=legacy_member.id
-        ).all()
-
+        legacy_picks = legacy_picks_by_member[legacy_member.id]
         print(f"Migrating {len(legacy_picks)} picks for {legacy_member.display_name}")
 
-        # Create real picks
-        # TODO: undo the hardcoded year here, it should be dynamic based on information in the file, but this is a start
+        # Create real picks, in the season of their tournament
         picks_created = 0
         for legacy_pick in legacy_picks:
-            if not legacy_pick.no_pick and legacy_pick.golfer_id:
-                # Check if pick already exists
-                existing_pick = Pick.query.filter_by(
-                    league_member_id=league_member.id,  # Changed from member_id to league_member_id
-                    tournament_id=legacy_pick.tournament_id,
-                    year="2024"
-                ).first()
-
-                if not existing_pick:
-                    pick = Pick(
-                        league_member_id=league_member.id,  # Changed from member_id to league_member_id
-                        tournament_id=legacy_pick.tournament_id,
-                        golfer_id=legacy_pick.golfer_id,
-                        year="2024"
-                    )
-                    db.session.add(pick)
-                    picks_created += 1
-
-        db.session.commit()
+            year = int(tournament_years.get(legacy_pick.tournament_id) or 2024)
+            key = (league_member.id, legacy_pick.tournament_id, year)
+            if key in existing_picks:
+                continue
+            existing_picks.add(key)
+            new_picks.append({
+                'league_member_id': league_member.id,
+                'tournament_id': legacy_pick.tournament_id,
+                'golfer_id': legacy_pick.golfer_id,
+                'year': year,
+            })
+            picks_created += 1
+
+        if len(new_picks) >= chunk_size:
+            db.session.execute(insert(Pick), new_picks)
+            new_picks.clear()
         print(f"Created {picks_created} picks for {legacy_member.display_name}")
 
+    if new_picks:
+        db.session.execute(insert(Pick), new_picks)
+    db.session.commit()
+
     print("\nMigration complete!")
     print("Remember: These users are historical only and cannot log in")
 
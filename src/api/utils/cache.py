@@ -0,0 +1,48 @@
+import threading
+from cachetools import TTLCache
+
+from utils.metrics import count_cache
+
+
+class VersionedCache:
+    """
+    Thread-safe, in-process TTL cache whose entries are tagged with a version.
+
+    A cached value is only returned when the caller asks for the same version
+    it was stored with. Versions are cheap tokens read from the database (for
+    example the newest pick or score id), so a write made by another worker or
+    by a job process invalidates the entry without any cross-process messaging.
+
+    Args:
+        maxsize (int): Maximum number of keys to keep
+        ttl (float): Maximum age of an entry in seconds, regardless of version
+        name (str): Name reported in the cache hit rate metrics
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600, name: str = 'default'):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self.name = name
+
+    def get(self, key, version=None):
+        """Return the value cached for key at this version, or None."""
+        with self._lock:
+            entry = self._cache.get(key)
+        if entry is None or entry[0] != version:
+            count_cache(self.name, hit=False)
+            return None
+        count_cache(self.name, hit=True)
+        return entry[1]
+
+    def set(self, key, value, version=None):
+        with self._lock:
+            self._cache[key] = (version, value)
+        return value
+
+    def invalidate(self, key=None):
+        """Drop a single key, or every key when no key is given."""
+        with self._lock:
+            if key is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(key, None)
@@ -1,12 +1,18 @@
 from flask_sqlalchemy import SQLAlchemy
 from dotenv import load_dotenv
-from google.cloud.sql.connector import Connector, IPTypes
-from google.cloud import firestore
 import os
-import sqlalchemy
 import json
 import tempfile
+import threading
 import logging
+import functools
+
+import sqlalchemy
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import StaticPool
+
+from utils.db_routing import REPLICA_BIND, RoutingSession, init_replica_routing
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -44,10 +50,6 @@ def setup_credentials():
             logger.error(f"Credentials file not found at: {creds_env}")
             return None
 
-# Initialize credentials before anything else
-creds_path = setup_credentials()
-logger.info(f"Using credentials from: {'temporary file' if creds_path else 'default'}")
-
 load_dotenv()
 
 def clean_env(var_name,default=None):
@@ -55,54 +57,43 @@ def clean_env(var_name,default=None):
     return value.strip('"').strip("'").strip() if value else None
 
 username = clean_env('DB_USER')
-password = clean_env('DB_PASS')
 database_name = clean_env('DB_NAME')
 
 instance_connection_prefix = clean_env('INSTANCE_CONNECTION_PREFIX')
 db2_name = clean_env('DB2_NAME')
 db2_password = clean_env('DB2_PASS')
 
-
 password = db2_password
 # instance_connection_name = f"{instance_connection_prefix}{db2_name}".strip("'")
 
 instance_connection_name = clean_env('INSTANCE_CONNECTION_STRING_FULL')
+replica_instance_connection_name = clean_env('INSTANCE_CONNECTION_STRING_REPLICA')
 
-print("=== Database Connection Debug Info ===")
-print(f"Instance Connection Name FULL: {instance_connection_name}")
-print(f"Database Name: {database_name}")
-print(f"Username: {username}")
-print(f"Connection Prefix: {instance_connection_prefix}")
-print(f"DB2 Name: {db2_name}")
-print("===================================")
-
-if not all([instance_connection_prefix, db2_name, username, password, database_name]):
-    print("WARNING: Some required environment variables are missing!")
-    print("Make sure your .env file contains all required variables.")
-    
-    
-# Add this debug section before the connector initialization
-print("\n=== Google Cloud Credentials Debug ===")
-# print(f"GOOGLE_APPLICATION_CREDENTIALS: {os.getenv('GOOGLE_APPLICATION_CREDENTIALS')}")
-# if os.getenv('GOOGLE_APPLICATION_CREDENTIALS'):
-#     print(f"File exists: {os.path.exists(os.getenv('GOOGLE_APPLICATION_CREDENTIALS'))}")
-#     try:
-#         with open(os.getenv('GOOGLE_APPLICATION_CREDENTIALS'), 'r') as f:
-#             print("Successfully opened credentials file")
-#             # Print first few characters to verify it's JSON (but not the whole thing)
-#             content = f.read(50)
-#             print(f"File starts with: {content}...")
-#     except Exception as e:
-#         print(f"Error reading credentials file: {str(e)}")
-print("===================================\n")
-
-# Initialize the global connector
-connector = Connector()
-
-def getconn():
+# Credentials and the Cloud SQL connector are set up on the first connection,
+# not at import, so importing the app (and every cold start) stays cheap
+creds_path = None
+connector = None
+_connector_lock = threading.Lock()
+
+def get_connector():
+    """The process-wide Cloud SQL connector, created on first use."""
+    global connector, creds_path
+    if connector is not None:
+        return connector
+    with _connector_lock:
+        if connector is None:
+            creds_path = setup_credentials()
+            logger.info(f"Using credentials from: {'temporary file' if creds_path else 'default'}")
+            logger.debug("Cloud SQL instance %s, database %s, user %s",
+                         instance_connection_name, database_name, username)
+            from google.cloud.sql.connector import Connector
+            connector = Connector()
+    return connector
+
+def getconn(instance: str = None):
     try:
-        conn = connector.connect(
-            instance_connection_name,
+        conn = get_connector().connect(
+            instance or instance_connection_name,
             
             "pymysql",
             user=username,
@@ -111,35 +102,191 @@ def getconn():
         )
         return conn
     except Exception as e:
-        print(f"Error connecting to database: {e}")
+        logger.error("Error connecting to database: %s", e)
         raise
 
-db = SQLAlchemy()
-firestore_db = firestore.Client()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+# Pool settings for server databases (Cloud SQL, MySQL, PostgreSQL). The default
+# pool matches the default GUNICORN_THREADS, so every request thread of a worker
+# can hold a connection without waiting.
+POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '8'))
+MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '2'))
+POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))  # Below MySQL's wait_timeout
+POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', '1') == '1'
+SQLITE_BUSY_TIMEOUT_MS = 30000
+
+def database_url():
+    """
+    The database to use instead of Cloud SQL, from DATABASE_URL.
+
+    Returns:
+        str: A SQLAlchemy URL such as 'mysql+pymysql://user:pw@127.0.0.1/golf' or
+            'sqlite:///golf.db', or None to use Cloud SQL
+    """
+    return clean_env('DATABASE_URL')
+
+def replica_database_url():
+    """
+    The read replica to use with DATABASE_URL, from DATABASE_REPLICA_URL.
+
+    Returns:
+        str: A SQLAlchemy URL, or None for no replica
+    """
+    return clean_env('DATABASE_REPLICA_URL')
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers in other workers proceed while one writes
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+def engine_options(url: str = None, instance: str = None) -> dict:
+    """
+    Engine options tuned for the backend of a database URL.
+
+    Args:
+        url (str): SQLAlchemy URL, or None for Cloud SQL
+        instance (str): Cloud SQL instance connection name when url is None,
+            defaults to INSTANCE_CONNECTION_STRING_FULL
+
+    Returns:
+        dict: Keyword arguments for create_engine / SQLALCHEMY_ENGINE_OPTIONS
+    """
+    if url is None:
+        return {
+            'creator': functools.partial(getconn, instance) if instance else getconn,
+            'pool_pre_ping': POOL_PRE_PING,
+            'pool_size': POOL_SIZE,
+            'max_overflow': MAX_OVERFLOW,
+            'pool_timeout': POOL_TIMEOUT,
+            'pool_recycle': POOL_RECYCLE,
+        }
+
+    if make_url(url).get_backend_name() == 'sqlite':
+        if not _is_sqlite_file(url):
+            # One shared connection, otherwise every pooled connection gets its own empty database
+            return {'poolclass': StaticPool, 'connect_args': {'check_same_thread': False}}
+        return {'connect_args': {'check_same_thread': False}}
+
+    return {
+        'pool_pre_ping': POOL_PRE_PING,
+        'pool_size': POOL_SIZE,
+        'max_overflow': MAX_OVERFLOW,
+        'pool_timeout': POOL_TIMEOUT,
+        'pool_recycle': POOL_RECYCLE,
+    }
+
+def create_db_engine(url: str = None):
+    """
+    Create a standalone engine (scripts, benchmarks) with the same tuning the app uses.
+
+    Args:
+        url (str): SQLAlchemy URL, defaults to DATABASE_URL, else Cloud SQL
+
+    Returns:
+        sqlalchemy.engine.Engine: The engine
+    """
+    url = url or database_url()
+    engine = sqlalchemy.create_engine(url or "mysql+pymysql://", **engine_options(url))
+    _register_backend_events(engine)
+    return engine
+
+def _is_sqlite_file(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == 'sqlite' and parsed.database not in (None, '', ':memory:')
+
+def _register_backend_events(engine):
+    if _is_sqlite_file(engine.url):
+        event.listen(engine, 'connect', _set_sqlite_pragmas)
 
 def init_db(app):
-    pool = sqlalchemy.create_engine(
-        "mysql+pymysql://",
-        creator=getconn,
-        pool_size=5,
-        max_overflow=2,
-        pool_timeout=30,
-        pool_recycle=1800
-    )
-    
-    app.config['SQLALCHEMY_DATABASE_URI'] = "mysql+pymysql://"
+    """
+    Configure the app's database. Uses, in order: SQLALCHEMY_DATABASE_URI already
+    set in the app config, DATABASE_URL, or Cloud SQL through the connector.
+
+    Args:
+        app: Flask app
+    """
+    url = app.config.get('SQLALCHEMY_DATABASE_URI') or database_url()
+
+    if url is None and not all([instance_connection_name, username, password, database_name]):
+        logger.warning("Cloud SQL settings are incomplete, check INSTANCE_CONNECTION_STRING_FULL, "
+                       "DB_USER, DB2_PASS and DB_NAME (or set DATABASE_URL)")
+
+    app.config['SQLALCHEMY_DATABASE_URI'] = url or "mysql+pymysql://"
     app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-        'creator': getconn,
-        'pool_pre_ping': True,
-        'pool_size': 5,
-        'max_overflow': 2,
-        'pool_timeout': 30,
-        'pool_recycle': 1800
+        **engine_options(url),
+        **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}),
     }
+    _configure_replica(app, url)
     db.init_app(app)
+    if REPLICA_BIND in app.config['SQLALCHEMY_BINDS']:
+        init_replica_routing(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            _register_backend_events(engine)
+    logger.info("Database backend: %s", _describe(url))
+
+def _describe(url: str = None, instance: str = None) -> str:
+    return make_url(url).render_as_string(hide_password=True) if url else f"Cloud SQL {instance or ''}".strip()
+
+def _configure_replica(app, primary_url: str = None):
+    """
+    Add the 'replica' bind that utils.db_routing sends reads to: DATABASE_REPLICA_URL,
+    or INSTANCE_CONNECTION_STRING_REPLICA when the primary is Cloud SQL. A 'replica'
+    entry already in SQLALCHEMY_BINDS is left as is.
+    """
+    binds = app.config.setdefault('SQLALCHEMY_BINDS', {})
+    if REPLICA_BIND in binds:
+        return
+    url = replica_database_url()
+    if url:
+        binds[REPLICA_BIND] = {'url': url, **engine_options(url)}
+    elif primary_url is None and replica_instance_connection_name:
+        binds[REPLICA_BIND] = {'url': "mysql+pymysql://",
+                               **engine_options(None, replica_instance_connection_name)}
+    else:
+        return
+    logger.info("Read replica: %s", _describe(url, replica_instance_connection_name))
+
+def upsert_statement(table, dialect_name: str, key_columns: list, update_columns: list):
+    """
+    A multi-row INSERT that updates rows whose key already exists: ON DUPLICATE KEY
+    UPDATE on MySQL, ON CONFLICT DO UPDATE on SQLite and PostgreSQL. Execute it
+    with a list of row dicts.
+
+    Args:
+        table: Table (or model.__table__)
+        dialect_name (str): e.g. connection.dialect.name
+        key_columns (list): Primary key or unique columns that identify a row
+        update_columns (list): Columns to overwrite when the row exists
+
+    Returns:
+        The insert statement
+
+    Raises:
+        NotImplementedError: For other backends
+    """
+    if dialect_name in ('mysql', 'mariadb'):
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table)
+        return stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in update_columns})
+    if dialect_name in ('sqlite', 'postgresql'):
+        if dialect_name == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table)
+        return stmt.on_conflict_do_update(index_elements=key_columns,
+                                          set_={column: stmt.excluded[column] for column in update_columns})
+    raise NotImplementedError(f"No upsert for {dialect_name}")
 
 def cleanup():
-    connector.close()
+    if connector is not None:
+        connector.close()
     # Clean up temporary credentials file if it exists
     if creds_path and creds_path.startswith(tempfile.gettempdir()):
         try:
@@ -0,0 +1,163 @@
+"""
+Read-replica routing for the Flask-SQLAlchemy session.
+
+When a 'replica' bind is configured (see init_db), SELECTs go to the replica and
+everything else to the primary:
+
+- GET/HEAD/OPTIONS requests read from the replica, other methods use the primary
+- Job code opts in for its read phase with `with read_replica():` (or as a decorator)
+- Once a session has written (flush or DML), it stays on the primary, so a job or
+  request always sees its own writes
+- After a signed-in user commits a write, their requests read from the primary for
+  REPLICA_STICKY_SECONDS (read-your-writes across requests, e.g. the pick page
+  reloading right after submit_pick). The response carries a signed marker saying
+  so, in the X-Primary-Reads header and a cookie, which any worker or instance
+  honours when the client sends either back; the key is REPLICA_STICKY_SECRET, or
+  the app's SECRET_KEY. Cross-origin clients should echo the header, since they
+  don't send the cookie. Without a key, or for clients that send neither back,
+  this only holds for requests that reach the same process
+
+Without a replica bind everything uses the primary, as before.
+"""
+
+import contextvars
+import logging
+import math
+import os
+import threading
+from contextlib import contextmanager
+
+from cachetools import TTLCache
+from flask import current_app, g, has_request_context, request
+from itsdangerous import BadSignature, TimestampSigner
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql.expression import CompoundSelect, Select
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND = 'replica'
+READ_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+STICKY_SECONDS = float(os.getenv('REPLICA_STICKY_SECONDS', '15'))
+STICKY_COOKIE = 'primary_reads'
+STICKY_HEADER = 'X-Primary-Reads'
+
+# None: decide from the request method; True/False: forced by read_replica()
+_use_replica = contextvars.ContextVar('use_replica', default=None)
+
+_recent_writers = TTLCache(maxsize=10000, ttl=STICKY_SECONDS)
+_recent_writers_lock = threading.Lock()
+
+
+def mark_recent_writer(uid: str):
+    """
+    Send the user's reads to the primary for the next REPLICA_STICKY_SECONDS.
+
+    Args:
+        uid (str): Firebase user ID
+    """
+    with _recent_writers_lock:
+        _recent_writers[uid] = True
+
+
+def is_recent_writer(uid: str) -> bool:
+    """Whether the user wrote within the last REPLICA_STICKY_SECONDS, in this process or (by marker) another."""
+    with _recent_writers_lock:
+        if uid in _recent_writers:
+            return True
+    signer = current_app.extensions.get('replica_sticky_signer') if has_request_context() else None
+    if not signer:
+        return False
+    for marker in (request.headers.get(STICKY_HEADER), request.cookies.get(STICKY_COOKIE)):
+        if not marker:
+            continue
+        try:
+            if signer.unsign(marker, max_age=STICKY_SECONDS).decode() == uid:
+                return True
+        except BadSignature:
+            pass
+    return False
+
+
+def init_replica_routing(app):
+    """
+    Carry read-your-writes across processes: after a request in which the signed-in
+    user wrote, return a marker signed with their uid, in the X-Primary-Reads header
+    and a cookie, that routes their reads to the primary for REPLICA_STICKY_SECONDS
+    wherever the next request carrying it back lands.
+
+    Args:
+        app: Flask app
+    """
+    secret = (app.config.get('REPLICA_STICKY_SECRET') or os.getenv('REPLICA_STICKY_SECRET')
+              or os.getenv('SECRET_KEY') or app.secret_key)
+    if not secret:
+        logger.info("No REPLICA_STICKY_SECRET or SECRET_KEY, read-your-writes only holds within a process")
+        return
+    app.extensions['replica_sticky_signer'] = TimestampSigner(secret, salt='replica-sticky')
+
+    @app.after_request
+    def _set_sticky_marker(response):
+        uid = g.pop('_sticky_uid', None)
+        if uid:
+            marker = app.extensions['replica_sticky_signer'].sign(uid).decode()
+            response.headers[STICKY_HEADER] = marker
+            if 'Access-Control-Allow-Origin' in response.headers:
+                response.headers.add('Access-Control-Expose-Headers', STICKY_HEADER)
+            # is_secure relies on ProxyFix behind a TLS-terminating proxy (see create_app)
+            response.set_cookie(STICKY_COOKIE, marker, max_age=math.ceil(STICKY_SECONDS),
+                                secure=request.is_secure, httponly=True, samesite='Lax')
+        return response
+
+
+@contextmanager
+def read_replica(enabled: bool = True):
+    """
+    Route the SELECTs inside the block to the replica (or, with enabled=False, to
+    the primary) regardless of the request method. Writes still go to the primary.
+
+        with read_replica():
+            picks = Pick.query.filter_by(tournament_id=tournament_id).all()
+
+    Args:
+        enabled (bool): False forces the primary instead
+    """
+    token = _use_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def _replica_allowed() -> bool:
+    forced = _use_replica.get()
+    if forced is not None:
+        return forced
+    if not has_request_context() or request.method not in READ_METHODS:
+        return False
+    uid = g.get('uid')
+    return not (uid and is_recent_writer(uid))
+
+
+class RoutingSession(Session):
+    """Session that sends reads to the 'replica' bind when one is configured."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not self.info.get('wrote') \
+                and isinstance(clause, (Select, CompoundSelect)):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None and _replica_allowed():
+                return replica
+
+        if self._flushing or (clause is not None and clause.is_dml):
+            self.info['wrote'] = True
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _remember_writer(session):
+    if session.info.get('wrote') and has_request_context():
+        uid = g.get('uid')
+        if uid:
+            mark_recent_writer(uid)
+            g._sticky_uid = uid
@@ -0,0 +1,72 @@
+"""
+Lazily initialized Firebase Admin app and Firestore client.
+
+firebase_admin and its gRPC dependencies are slow to import, so nothing here is
+imported or initialized until the first token verification or Firestore write.
+Every module that needs Firebase goes through these helpers, so the Admin SDK is
+initialized exactly once per process.
+"""
+
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_app = None
+_firestore = None
+
+
+def get_firebase_app():
+    """
+    The Firebase Admin app, initialized from FIREBASE_ADMIN_SDK_KEY on first use.
+
+    Returns:
+        firebase_admin.App: The default app
+
+    Raises:
+        ValueError: If FIREBASE_ADMIN_SDK_KEY is missing or not valid JSON
+    """
+    global _app
+    if _app is not None:
+        return _app
+    with _lock:
+        if _app is None:
+            import firebase_admin
+            from firebase_admin import credentials
+
+            key_string = os.getenv('FIREBASE_ADMIN_SDK_KEY')
+            if not key_string:
+                raise ValueError("FIREBASE_ADMIN_SDK_KEY is not set")
+            try:
+                key = json.loads(key_string)
+            except json.JSONDecodeError as e:
+                logger.error("FIREBASE_ADMIN_SDK_KEY is not valid JSON: %s at position %d", e.msg, e.pos)
+                raise ValueError("FIREBASE_ADMIN_SDK_KEY is not valid JSON") from e
+
+            if firebase_admin._apps:
+                _app = firebase_admin.get_app()
+            else:
+                _app = firebase_admin.initialize_app(credentials.Certificate(key))
+            logger.info("Initialized Firebase Admin app")
+    return _app
+
+
+def get_firestore():
+    """
+    The Firestore client of the Firebase Admin app, created on first use.
+
+    Returns:
+        google.cloud.firestore.Client: Firestore client
+    """
+    global _firestore
+    if _firestore is not None:
+        return _firestore
+    app = get_firebase_app()
+    with _lock:
+        if _firestore is None:
+            from firebase_admin import firestore
+            _firestore = firestore.client(app)
+    return _firestore
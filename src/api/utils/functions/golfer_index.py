@@ -0,0 +1,193 @@
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from unidecode import unidecode
+
+from models import Golfer, GolferPhoto
+from utils.db_connector import db
+from utils.image_store import url_for
+from utils.metrics import count_cache
+
+INDEX_TTL_SECONDS = 15 * 60  # Rebuild the index at most every 15 minutes
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a golfer name for prefix matching.
+    Example: 'Ludvig Åberg' -> 'ludvig aberg'
+
+    Args:
+        name (str): Name to normalize
+
+    Returns:
+        str: Lowercase ASCII name with single spaces and no punctuation
+    """
+    if not name:
+        return ''
+    name = unidecode(name).lower()
+    name = re.sub('[^a-z ]', '', name)
+    return ' '.join(name.split())
+
+
+class GolferIndex:
+    """
+    In-memory, sorted index over every golfer in the database.
+
+    Golfers are kept in two sorted key lists so a prefix can be matched against
+    either the full name ('scottie sch...') or the last name ('sch...') with a
+    binary search instead of a LIKE scan over the golfer table.
+
+    Attributes:
+        golfers (dict): Golfer rows keyed by golfer id
+        built_at (float): Monotonic timestamp of when the index was built
+    """
+
+    def __init__(self, rows):
+        self.golfers = {}
+        full_entries = []
+        last_entries = []
+
+        for row in rows:
+            self.golfers[row.id] = {
+                'id': row.id,
+                'full_name': row.full_name,
+                'first_name': row.first_name,
+                'last_name': row.last_name,
+                # The small stored headshot when there is one, for lists and dropdowns
+                'photo_url': url_for(row.photo_small) or row.photo_url,
+                'datagolf_id': row.datagolf_id,
+            }
+            full_entries.append((normalize_name(row.full_name), row.id))
+            last_entries.append((normalize_name(row.last_name), row.id))
+
+        full_entries.sort()
+        last_entries.sort()
+
+        # Sort key of each golfer, used for ordering and cursor positioning
+        self._sort_keys = {golfer_id: (key, golfer_id) for key, golfer_id in full_entries}
+        self._full_entries = full_entries
+        self._last_entries = last_entries
+        self.built_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.golfers)
+
+    def get(self, golfer_id):
+        return self.golfers.get(golfer_id)
+
+    def sort_key(self, golfer_id):
+        return self._sort_keys.get(golfer_id)
+
+    def find_by_name(self, name: str):
+        """
+        The golfer with exactly this full name, after normalization.
+
+        Args:
+            name (str): Full name, e.g. 'Ludvig Åberg'
+
+        Returns:
+            str: Golfer id, or None if no golfer or several golfers have the name
+        """
+        key = normalize_name(name)
+        if not key:
+            return None
+        start = bisect_left(self._full_entries, (key, ''))
+        matches = self._full_entries[start:start + 2]
+        if not matches or matches[0][0] != key or (len(matches) == 2 and matches[1][0] == key):
+            return None
+        return matches[0][1]
+
+    def _prefix_ids(self, entries, prefix):
+        start = bisect_left(entries, (prefix, ''))
+        end = bisect_right(entries, (prefix + '\uffff', ''))
+        return [golfer_id for _, golfer_id in entries[start:end]]
+
+    def search(self, prefix: str = '', cursor: str = None, limit: int = 50, include=None, exclude=None):
+        """
+        Return one page of golfer ids ordered by normalized full name.
+
+        Args:
+            prefix (str): Raw search text, matched against full and last names
+            cursor (str): Golfer id of the last item on the previous page
+            limit (int): Maximum number of ids to return
+            include (set): If given, only golfer ids in this set are returned
+            exclude (set): Golfer ids that should be skipped
+
+        Returns:
+            tuple: (list of golfer ids, next cursor or None)
+        """
+        prefix = normalize_name(prefix)
+        after = self.sort_key(cursor) if cursor else None
+
+        if include is not None or prefix:
+            # Candidate set is small (the field, or a prefix range), so sort it directly
+            if prefix:
+                candidates = set(self._prefix_ids(self._full_entries, prefix))
+                candidates.update(self._prefix_ids(self._last_entries, prefix))
+                if include is not None:
+                    candidates &= include
+            else:
+                candidates = {golfer_id for golfer_id in include if golfer_id in self.golfers}
+
+            keys = sorted(self._sort_keys[golfer_id] for golfer_id in candidates)
+            ordered = keys[bisect_right(keys, after):] if after else keys
+            entries = iter(ordered)
+        else:
+            start = bisect_right(self._full_entries, after) if after else 0
+            entries = iter(self._full_entries[start:])
+
+        page = []
+        for _, golfer_id in entries:
+            if exclude and golfer_id in exclude:
+                continue
+            if len(page) == limit:
+                return page, page[-1]
+            page.append(golfer_id)
+
+        return page, None
+
+
+def get_golfer_index(force_refresh: bool = False) -> GolferIndex:
+    """
+    Get the shared golfer index, rebuilding it if it is missing or stale.
+
+    Args:
+        force_refresh (bool): If True, rebuild the index regardless of age
+
+    Returns:
+        GolferIndex: The current golfer index
+    """
+    global _index
+
+    index = _index
+    if not force_refresh and index is not None and time.monotonic() - index.built_at < INDEX_TTL_SECONDS:
+        count_cache('golfer_index', hit=True)
+        return index
+    count_cache('golfer_index', hit=False)
+
+    with _index_lock:
+        # Another thread may have rebuilt the index while we waited
+        if not force_refresh and _index is not None and _index is not index:
+            return _index
+
+        rows = db.session.query(
+            Golfer.id,
+            Golfer.full_name,
+            Golfer.first_name,
+            Golfer.last_name,
+            Golfer.photo_url,
+            Golfer.datagolf_id,
+            GolferPhoto.small.label('photo_small')
+        ).outerjoin(GolferPhoto, Golfer.id == GolferPhoto.golfer_id).all()
+        _index = GolferIndex(rows)
+        return _index
+
+
+def invalidate_golfer_index():
+    """Drop the cached golfer index so the next lookup rebuilds it."""
+    global _index
+    _index = None
@@ -0,0 +1,188 @@
+"""
+Content-addressed image store.
+
+Images are stored by the SHA-256 of their bytes, so a name always refers to the
+same bytes: storing an image twice is free, and clients can cache an image URL
+forever. Headshots are stored with pre-generated sizes (see store_image).
+
+With IMAGE_STORE_BUCKET set, images go to that Google Cloud Storage bucket under
+IMAGE_STORE_PREFIX and are served from it, so every instance can serve every
+image. Otherwise they are kept on local disk under IMAGE_STORE_DIR (ab/abcdef...png)
+and served by modules/images; that disk belongs to one instance, so url_for only
+returns a URL for images this instance actually has.
+
+    variants = store_image(content)        # {'original': '3f2a....png', 'small': '9c1e....webp', ...}
+    url_for(variants['small'])             # '/images/9c1e....webp'
+"""
+
+import hashlib
+import io
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+IMAGE_STORE_DIR = Path(os.getenv('IMAGE_STORE_DIR', Path(__file__).parents[1] / 'image_store'))
+IMAGE_STORE_BUCKET = os.getenv('IMAGE_STORE_BUCKET')  # e.g. 'golf-pickem.appspot.com', shared by all instances
+IMAGE_STORE_PREFIX = os.getenv('IMAGE_STORE_PREFIX', 'images')
+# Public URL of the stored images: the bucket, or the images blueprint
+IMAGE_BASE_URL = os.getenv('IMAGE_BASE_URL') or (
+    f"https://storage.googleapis.com/{IMAGE_STORE_BUCKET}/{IMAGE_STORE_PREFIX}" if IMAGE_STORE_BUCKET else '/images')
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+THUMBNAIL_SIZES = {'small': 64, 'medium': 160}  # Longest side in pixels
+
+NAME_PATTERN = re.compile(r'^[0-9a-f]{64}\.(png|jpg|webp|gif)$')
+MIMETYPES = {'png': 'image/png', 'jpg': 'image/jpeg', 'webp': 'image/webp', 'gif': 'image/gif'}
+
+_pillow_warned = False
+_bucket = None
+_bucket_lock = threading.Lock()
+_available = set()  # Names known to be stored, they never change or go away while the process runs
+
+
+def image_extension(content: bytes) -> str:
+    """Extension for image bytes, from their signature (png if unknown)."""
+    if content[:3] == b'\xff\xd8\xff':
+        return 'jpg'
+    if content[:4] == b'RIFF' and content[8:12] == b'WEBP':
+        return 'webp'
+    if content[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    return 'png'
+
+
+def path_for(name: str, root: Path = None) -> Path:
+    """
+    Where a stored image lives.
+
+    Raises:
+        ValueError: If name is not a content-addressed image name
+    """
+    if not NAME_PATTERN.match(name or ''):
+        raise ValueError(f"Invalid image name '{name}'")
+    return Path(root or IMAGE_STORE_DIR) / name[:2] / name
+
+
+def url_for(name: str) -> str:
+    """
+    Public URL of a stored image.
+
+    Returns:
+        str: The URL, or None for no image, or for a locally stored image this
+            instance doesn't have (callers then fall back to another photo URL)
+    """
+    if not name:
+        return None
+    if not IMAGE_STORE_BUCKET and name not in _available:
+        try:
+            if not path_for(name).is_file():
+                return None
+        except ValueError:
+            return None
+        _available.add(name)
+    return f"{IMAGE_BASE_URL.rstrip('/')}/{name}"
+
+
+def _get_bucket():
+    global _bucket
+    with _bucket_lock:
+        if _bucket is None:
+            from google.cloud import storage
+            _bucket = storage.Client().bucket(IMAGE_STORE_BUCKET)
+        return _bucket
+
+
+def _upload(name: str, content: bytes):
+    from google.api_core.exceptions import PreconditionFailed
+
+    blob = _get_bucket().blob(f"{IMAGE_STORE_PREFIX}/{name}")
+    blob.cache_control = CACHE_CONTROL
+    try:
+        # Only create: an existing object with this name already has these bytes
+        blob.upload_from_string(content, content_type=MIMETYPES[name.rsplit('.', 1)[1]], if_generation_match=0)
+    except PreconditionFailed:
+        pass
+
+
+def put(content: bytes, root: Path = None) -> str:
+    """
+    Store image bytes.
+
+    Args:
+        content (bytes): Image file
+        root (Path): Local store directory. Defaults to the bucket when
+            IMAGE_STORE_BUCKET is set, IMAGE_STORE_DIR otherwise
+
+    Returns:
+        str: Name of the image, '<sha256>.<ext>'
+    """
+    name = f"{hashlib.sha256(content).hexdigest()}.{image_extension(content)}"
+    if root is None and IMAGE_STORE_BUCKET:
+        if name not in _available:
+            _upload(name, content)
+            _available.add(name)
+        return name
+
+    path = path_for(name, root)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{name}.{os.getpid()}.tmp")
+        with open(tmp, 'wb') as f:
+            f.write(content)
+        os.replace(tmp, path)
+    return name
+
+
+def make_thumbnails(content: bytes) -> dict:
+    """
+    Resize an image to every size in THUMBNAIL_SIZES.
+
+    Args:
+        content (bytes): Image file
+
+    Returns:
+        dict: variant -> WebP bytes; empty if Pillow is not installed
+    """
+    global _pillow_warned
+    try:
+        from PIL import Image
+    except ImportError:
+        if not _pillow_warned:
+            logger.warning("Pillow is not installed, skipping thumbnails")
+            _pillow_warned = True
+        return {}
+
+    variants = {}
+    with Image.open(io.BytesIO(content)) as image:
+        image = image.convert('RGBA')
+        for variant, size in THUMBNAIL_SIZES.items():
+            thumbnail = image.copy()
+            thumbnail.thumbnail((size, size), Image.LANCZOS)
+            buffer = io.BytesIO()
+            thumbnail.save(buffer, 'WEBP', quality=85, method=4)
+            variants[variant] = buffer.getvalue()
+    return variants
+
+
+def store_image(content: bytes, root: Path = None) -> dict:
+    """
+    Store an image and its resized variants.
+
+    Args:
+        content (bytes): Image file
+        root (Path): Local store directory, see put()
+
+    Returns:
+        dict: 'original' and each THUMBNAIL_SIZES variant -> image name. Variants
+            are missing if they could not be made
+    """
+    names = {'original': put(content, root)}
+    try:
+        for variant, data in make_thumbnails(content).items():
+            names[variant] = put(data, root)
+    except Exception as e:
+        logger.warning("Could not resize image %s: %s", names['original'], e)
+    return names
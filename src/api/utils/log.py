@@ -0,0 +1,137 @@
+"""
+Logging setup and a sampled progress reporter for long jobs.
+
+Log through module loggers with %-style arguments so nothing is formatted
+unless the level is enabled:
+
+    logger = logging.getLogger(__name__)
+    logger.debug("Pick %s scored %.2f", pick_id, points)
+
+Levels come from the environment:
+
+    LOG_LEVEL=INFO                                    Root level
+    LOG_LEVELS=jobs=DEBUG,data_aggregator=WARNING     Per-module overrides (logger name prefixes)
+    LOG_FORMAT                                        Optional logging format string
+
+Request handlers should log per-request details at DEBUG only, so the default
+level never formats or writes anything on the request path.
+"""
+
+import logging
+import os
+import sys
+import time
+
+DEFAULT_FORMAT = '%(asctime)s %(levelname)s [%(process)d] %(name)s: %(message)s'
+
+_configured = False
+
+
+def parse_levels(spec: str) -> dict:
+    """
+    Parse a LOG_LEVELS string.
+
+    Args:
+        spec (str): Comma separated 'logger=LEVEL' pairs, e.g. 'jobs=DEBUG,urllib3=WARNING'
+
+    Returns:
+        dict: Logger name -> numeric level. Malformed entries are ignored
+    """
+    levels = {}
+    for item in (spec or '').split(','):
+        name, _, level = item.partition('=')
+        level = logging.getLevelName(level.strip().upper())
+        if name.strip() and isinstance(level, int):
+            levels[name.strip()] = level
+    return levels
+
+
+def configure_logging(force: bool = False):
+    """
+    Configure the root handler and levels from the environment. Safe to call more
+    than once; only the first call (or a forced one) has an effect.
+
+    Args:
+        force (bool): Reconfigure even if already configured
+    """
+    global _configured
+    if _configured and not force:
+        return
+    _configured = True
+
+    root = logging.getLogger()
+    level = logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').upper())
+    root.setLevel(level if isinstance(level, int) else logging.INFO)
+
+    # Gunicorn and the Flask dev server install their own handlers; only add one if nothing has
+    if not root.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter(os.getenv('LOG_FORMAT', DEFAULT_FORMAT)))
+        root.addHandler(handler)
+
+    for name, module_level in parse_levels(os.getenv('LOG_LEVELS', '')).items():
+        logging.getLogger(name).setLevel(module_level)
+
+
+class JobProgress:
+    """
+    Sampled progress reporting for loops in long jobs. Counting is a couple of
+    integer operations; a progress line is logged at most every `every` items or
+    `interval` seconds, whichever comes first.
+
+        progress = JobProgress(logger, 'Scoring picks', total=len(picks))
+        for pick in picks:
+            ...
+            progress.step()
+        progress.done(duplicates=duplicate_count)
+
+    Args:
+        logger (logging.Logger): Logger to report to
+        label (str): What is being processed
+        total (int): Expected number of items, if known
+        every (int): Log after this many items
+        interval (float): Log after this many seconds
+        level (int): Level of the progress lines
+    """
+
+    def __init__(self, logger: logging.Logger, label: str, total: int = None, every: int = 500,
+                 interval: float = 10.0, level: int = logging.INFO):
+        self.logger = logger
+        self.label = label
+        self.total = total
+        self.every = max(int(every), 1)
+        self.interval = interval
+        self.level = level
+        self.count = 0
+        self.started = time.monotonic()
+        self._next_count = self.every
+        self._next_time = self.started + interval
+        self._enabled = logger.isEnabledFor(level)
+
+    def step(self, n: int = 1):
+        """Count n processed items, logging progress when due."""
+        self.count += n
+        if not self._enabled or self.count < self._next_count and time.monotonic() < self._next_time:
+            return
+        self._next_count = self.count + self.every
+        self._next_time = time.monotonic() + self.interval
+        elapsed = time.monotonic() - self.started
+        rate = self.count / elapsed if elapsed else 0.0
+        if self.total:
+            self.logger.log(self.level, "%s: %d/%d (%.0f%%, %.1f/s)", self.label, self.count, self.total,
+                            100.0 * self.count / self.total, rate)
+        else:
+            self.logger.log(self.level, "%s: %d (%.1f/s)", self.label, self.count, rate)
+
+    def done(self, **counts):
+        """
+        Log the final summary line.
+
+        Args:
+            **counts: Extra counters to include, e.g. created=12, skipped=3
+        """
+        if not self._enabled:
+            return
+        extra = ''.join(f", {key}={value}" for key, value in counts.items())
+        self.logger.log(self.level, "%s: done, %d items in %.2fs%s", self.label, self.count,
+                        time.monotonic() - self.started, extra)
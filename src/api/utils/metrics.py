@@ -0,0 +1,315 @@
+"""
+Process metrics exported in Prometheus text format.
+
+Records per-route request latency, the database and provider time spent inside
+each request, provider call latency and cache hit rates. Each process keeps its
+own registry, and a background thread writes a snapshot of it to
+METRICS_DIR/metrics-<pid>.json every few seconds; /health/metrics merges the
+snapshots of every gunicorn worker, so a scrape sees the whole server no matter
+which worker answers it. The gunicorn master removes a worker's snapshot when
+the worker exits.
+
+    METRICS_ENABLED=0          Disable collection (on by default)
+    METRICS_DIR                Directory for per-process snapshots (default: <tmp>/golf_pickem_metrics)
+    METRICS_FLUSH_SECONDS=5    Time between snapshot writes per process
+    METRICS_TOKEN              Bearer token /health/metrics requires; the endpoint is off without it
+"""
+
+import contextvars
+import glob
+import hmac
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') == '1'
+METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'golf_pickem_metrics'))
+FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', '5'))
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    'http_request_duration_seconds': ('histogram', 'Request latency by route'),
+    'http_request_db_seconds': ('histogram', 'Database time spent in a request by route'),
+    'http_request_provider_seconds': ('histogram', 'Data provider time spent in a request by route'),
+    'provider_request_duration_seconds': ('histogram', 'Data provider call latency'),
+    'cache_requests_total': ('counter', 'Cache lookups by cache and result'),
+}
+
+# Time spent in the database and in provider calls during the current request
+_request_timers = contextvars.ContextVar('request_timers', default=None)
+
+
+class Registry:
+    """Thread-safe store of histograms and counters for one process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}  # (name, labels) -> [bucket counts..., sum, count]
+        self.counters = {}  # (name, labels) -> value
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            series = self.histograms.get(key)
+            if series is None:
+                series = self.histograms[key] = [0] * len(BUCKETS) + [0.0, 0]
+            for i, bound in enumerate(BUCKETS):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'histograms': [[name, list(labels), list(series)] for (name, labels), series in self.histograms.items()],
+                'counters': [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+            }
+
+
+registry = Registry()
+_flush_lock = threading.Lock()
+_flusher_pid = None  # Process the flusher thread runs in; a forked worker starts its own
+_listeners_installed = False
+
+
+def observe(name: str, value: float, **labels):
+    """Record a value in a histogram."""
+    if METRICS_ENABLED:
+        registry.observe(name, value, **labels)
+
+
+def inc(name: str, amount: float = 1, **labels):
+    """Increment a counter."""
+    if METRICS_ENABLED:
+        registry.inc(name, amount, **labels)
+
+
+def count_cache(cache: str, hit: bool):
+    """Record a cache lookup."""
+    inc('cache_requests_total', cache=cache, result='hit' if hit else 'miss')
+
+
+def observe_provider(provider: str, elapsed: float, status):
+    """Record a provider call, and add its time to the current request."""
+    observe('provider_request_duration_seconds', elapsed, provider=provider, status=str(status))
+    timers = _request_timers.get()
+    if timers is not None:
+        timers['provider'] += elapsed
+
+
+def _snapshot_path(pid: int = None) -> str:
+    return os.path.join(METRICS_DIR, f"metrics-{pid or os.getpid()}.json")
+
+
+def flush():
+    """Write this process's snapshot."""
+    if not METRICS_ENABLED:
+        return
+    with _flush_lock:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        path = _snapshot_path()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(registry.snapshot(), f)
+        os.replace(tmp_path, path)
+
+
+def _flush_loop():
+    while True:
+        time.sleep(FLUSH_SECONDS)
+        try:
+            flush()
+        except Exception as e:
+            logger.warning("Could not write the metrics snapshot: %s", e)
+
+
+def _start_flusher():
+    """Start the snapshot thread of this process, once per process."""
+    global _flusher_pid
+    if _flusher_pid == os.getpid():
+        return
+    with _flush_lock:
+        if _flusher_pid != os.getpid():
+            threading.Thread(target=_flush_loop, name='metrics-flush', daemon=True).start()
+            _flusher_pid = os.getpid()
+
+
+def clear_snapshots():
+    """Remove snapshots of previous runs. Called by the gunicorn master on start."""
+    for path in glob.glob(os.path.join(METRICS_DIR, 'metrics-*.json')):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def remove_snapshot(pid: int):
+    """Remove the snapshot of an exited worker. Called by the gunicorn master."""
+    try:
+        os.remove(_snapshot_path(pid))
+    except OSError:
+        pass
+
+
+def check_token() -> bool:
+    """True if the metrics endpoint is enabled and the request carries its bearer token."""
+    auth_header = request.headers.get('Authorization', '')
+    scheme, _, token = auth_header.partition(' ')
+    return bool(METRICS_TOKEN) and scheme.lower() == 'bearer' and hmac.compare_digest(
+        token.strip().encode(), METRICS_TOKEN.encode())
+
+
+def _merge_snapshot(merged: Registry, snapshot: dict):
+    for name, labels, series in snapshot.get('histograms', []):
+        key = (name, tuple(tuple(label) for label in labels))
+        current = merged.histograms.setdefault(key, [0] * len(BUCKETS) + [0.0, 0])
+        merged.histograms[key] = [a + b for a, b in zip(current, series)]
+    for name, labels, value in snapshot.get('counters', []):
+        key = (name, tuple(tuple(label) for label in labels))
+        merged.counters[key] = merged.counters.get(key, 0) + value
+
+
+def collect() -> Registry:
+    """
+    Merge the snapshots of every worker into one registry. Reads only: this
+    process contributes its live registry rather than writing its snapshot.
+
+    Returns:
+        Registry: Summed histograms and counters across processes
+    """
+    merged = Registry()
+    own_path = _snapshot_path()
+    for path in glob.glob(os.path.join(METRICS_DIR, 'metrics-*.json')):
+        if path == own_path:
+            continue
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue  # Being replaced by its worker right now
+        _merge_snapshot(merged, snapshot)
+    if METRICS_ENABLED:
+        _merge_snapshot(merged, registry.snapshot())
+    return merged
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def render(merged: Registry) -> str:
+    """
+    Render a registry in the Prometheus text exposition format.
+
+    Args:
+        merged (Registry): Registry to render, usually from collect()
+
+    Returns:
+        str: Exposition text
+    """
+    lines = []
+    for name, (kind, help_text) in HELP.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == 'histogram':
+            for (series_name, labels), series in sorted(merged.histograms.items()):
+                if series_name != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(BUCKETS, series):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', bound))} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {series[-1]}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {series[-2]:.6f}")
+                lines.append(f"{name}_count{_format_labels(labels)} {series[-1]}")
+        else:
+            for (series_name, labels), value in sorted(merged.counters.items()):
+                if series_name == name:
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+    return '\n'.join(lines) + '\n'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _request_timers.get() is not None:
+        conn.info.setdefault('metrics_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timers = _request_timers.get()
+    if timers is None:
+        return
+    started = conn.info.get('metrics_started')
+    if started:
+        timers['db'] += time.perf_counter() - started.pop()
+
+
+def init_metrics(app):
+    """
+    Record latency, DB and provider time for every request to the app.
+
+    Args:
+        app: Flask app
+    """
+    global _listeners_installed
+    if not METRICS_ENABLED:
+        return
+
+    if not _listeners_installed:
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        _listeners_installed = True
+
+    @app.before_request
+    def _start_request_metrics():
+        _start_flusher()
+        timers = {'db': 0.0, 'provider': 0.0}
+        g._metrics = (time.perf_counter(), timers, _request_timers.set(timers))
+
+    def _record(status_code):
+        entry = g.pop('_metrics', None)
+        if entry is None:
+            return
+        started, timers, token = entry
+        _request_timers.reset(token)
+
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        labels = {'route': route, 'method': request.method}
+        observe('http_request_duration_seconds', time.perf_counter() - started,
+                status=str(status_code), **labels)
+        observe('http_request_db_seconds', timers['db'], **labels)
+        observe('http_request_provider_seconds', timers['provider'], **labels)
+
+    @app.after_request
+    def _record_request_metrics(response):
+        _record(response.status_code)
+        return response
+
+    @app.teardown_request
+    def _record_failed_request_metrics(exc):
+        # Only still pending if the view raised before a response was made
+        _record(500)
@@ -0,0 +1,245 @@
+"""
+On-demand sampling profiler for a single route.
+
+When started, every worker samples the stacks of the threads currently serving
+the chosen route every few milliseconds and counts identical stacks. The result
+is in the folded format ('frame;frame;frame count' per line) that flamegraph.pl,
+speedscope and inferno read directly.
+
+The toggle is a small file in METRICS_DIR, so starting the profiler through any
+worker starts it on all of them, and the samples of every worker are merged
+when read. Profiling stops by itself after the requested duration.
+
+Under the gevent worker class the requests are greenlets, which
+sys._current_frames() does not list: the profiler then samples the frame of
+each profiled greenlet from a native OS thread, so CPU-bound code is sampled
+even though it never yields to the hub.
+
+Disabled unless PROFILER_TOKEN is set; the profile endpoints require it in the
+X-Profiler-Token header.
+"""
+
+import glob
+import hmac
+import json
+import os
+import sys
+import _thread
+import threading
+import time
+from collections import Counter
+
+from flask import g, request
+
+from utils.metrics import METRICS_DIR
+
+try:
+    from gevent import getcurrent as _current_greenlet
+    from gevent.monkey import get_original, is_module_patched
+    _GEVENT = is_module_patched('threading')
+except ImportError:
+    _GEVENT = False
+
+PROFILER_TOKEN = os.getenv('PROFILER_TOKEN')
+TOGGLE_PATH = os.path.join(METRICS_DIR, 'profile.json')
+TOGGLE_CHECK_SECONDS = 1.0
+MAX_DURATION_SECONDS = 300
+MAX_STACK_DEPTH = 128
+
+if _GEVENT:
+    # The sampler is a native thread, which must not block on gevent's locks or sleep
+    _lock = get_original('_thread', 'allocate_lock')()
+    _sleep = get_original('time', 'sleep')
+    _native_ident = get_original('_thread', 'get_ident')
+else:
+    _lock = threading.Lock()
+    _sleep = time.sleep
+    _native_ident = _thread.get_ident
+_active_tasks = {}  # Thread ident or greenlet serving the profiled route -> its native thread ident
+_samples = Counter()
+_settings = None  # Toggle file contents while profiling
+_sampling = False
+_checked_at = 0.0
+
+
+def _read_toggle():
+    try:
+        with open(TOGGLE_PATH) as f:
+            settings = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return settings if settings.get('until', 0) > time.time() else None
+
+
+def start_profile(route: str, seconds: float = 30, interval_ms: float = 5) -> dict:
+    """
+    Start profiling a route on every worker.
+
+    Args:
+        route (str): URL rule to profile, e.g. '/league/scoreboard/<int:league_id>'
+        seconds (float): How long to profile, capped at MAX_DURATION_SECONDS
+        interval_ms (float): Sampling interval
+
+    Returns:
+        dict: The profiling settings
+    """
+    settings = {
+        'route': route,
+        'until': time.time() + min(float(seconds), MAX_DURATION_SECONDS),
+        'interval_ms': max(float(interval_ms), 1.0),
+        'started': time.time(),
+    }
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    for path in glob.glob(os.path.join(METRICS_DIR, 'profile-*.folded')):
+        os.remove(path)
+    with _lock:
+        _samples.clear()
+    with open(TOGGLE_PATH, 'w') as f:
+        json.dump(settings, f)
+    _refresh(force=True)
+    return settings
+
+
+def stop_profile():
+    """Stop profiling on every worker."""
+    try:
+        os.remove(TOGGLE_PATH)
+    except FileNotFoundError:
+        pass
+    _refresh(force=True)
+
+
+def _refresh(force: bool = False):
+    """Pick up profiler start/stop from the toggle file, at most once a second."""
+    global _settings, _sampling, _checked_at
+    now = time.monotonic()
+    if not force and now - _checked_at < TOGGLE_CHECK_SECONDS:
+        return
+    _checked_at = now
+    settings = _read_toggle()
+    with _lock:
+        if settings and (_settings is None or _settings['started'] != settings['started']):
+            _samples.clear()  # New profiling session
+        _settings = settings
+        if settings and not _sampling:
+            _sampling = True
+            if _GEVENT:
+                get_original('_thread', 'start_new_thread')(_sample_loop, ())
+            else:
+                threading.Thread(target=_sample_loop, name='route-profiler', daemon=True).start()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    for marker in ('/site-packages/', '/src/api/', '/app/'):
+        if marker in filename:
+            filename = filename.split(marker, 1)[1]
+            break
+    return f"{code.co_name} ({filename}:{frame.f_lineno})"
+
+
+def _folded_stack(frame) -> str:
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+def _current_task():
+    return _current_greenlet() if _GEVENT else threading.get_ident()
+
+
+def _task_frame(task, native_ident, frames):
+    if _GEVENT and task.gr_frame is not None:
+        return task.gr_frame  # Suspended greenlet
+    return frames.get(native_ident)  # Running thread or greenlet
+
+
+def _sample_loop():
+    global _sampling
+    while True:
+        with _lock:
+            settings = _settings
+            if settings is None or settings['until'] <= time.time():
+                _sampling = False
+                break
+            tasks = list(_active_tasks.items())
+        if tasks:
+            frames = sys._current_frames()
+            stacks = [_folded_stack(frame) for frame in (_task_frame(task, ident, frames) for task, ident in tasks)
+                      if frame is not None]
+            with _lock:
+                _samples.update(stacks)
+        _sleep(settings['interval_ms'] / 1000.0)
+    _write_samples()
+
+
+def _write_samples():
+    with _lock:
+        lines = [f"{stack} {count}" for stack, count in _samples.items()]
+    if not lines:
+        return
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    path = os.path.join(METRICS_DIR, f"profile-{os.getpid()}.folded")
+    with open(f"{path}.tmp", 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(f"{path}.tmp", path)
+
+
+def read_profile() -> str:
+    """
+    Merged folded stacks of every worker.
+
+    Returns:
+        str: One 'stack count' line per distinct stack, most frequent first
+    """
+    _write_samples()
+    merged = Counter()
+    for path in glob.glob(os.path.join(METRICS_DIR, 'profile-*.folded')):
+        with open(path) as f:
+            for line in f:
+                stack, _, count = line.rstrip('\n').rpartition(' ')
+                if stack:
+                    merged[stack] += int(count)
+    return ''.join(f"{stack} {count}\n" for stack, count in merged.most_common())
+
+
+def profile_status() -> dict:
+    settings = _read_toggle()
+    with _lock:
+        samples = sum(_samples.values())
+    return {'active': settings is not None, 'settings': settings, 'samples_this_worker': samples}
+
+
+def check_token() -> bool:
+    """True if profiling is enabled and the request carries the profiler token."""
+    return bool(PROFILER_TOKEN) and hmac.compare_digest(
+        request.headers.get('X-Profiler-Token', '').encode(), PROFILER_TOKEN.encode())
+
+
+def init_profiler(app):
+    """
+    Mark threads (or greenlets) serving the profiled route so the sampler can find them.
+
+    Args:
+        app: Flask app
+    """
+    if not PROFILER_TOKEN:
+        return
+
+    @app.before_request
+    def _profile_route():
+        _refresh()
+        settings = _settings
+        if settings and request.url_rule is not None and request.url_rule.rule == settings['route']:
+            with _lock:
+                _active_tasks[_current_task()] = _native_ident()
+            g._profiled = True
+
+    @app.teardown_request
+    def _unprofile_route(exc):
+        if g.pop('_profiled', False):
+            with _lock:
+                _active_tasks.pop(_current_task(), None)
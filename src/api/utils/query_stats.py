@@ -0,0 +1,206 @@
+"""
+SQL query instrumentation.
+
+Counts the statements each request or job sends to the database, their total
+time, and how often the same statement shape repeats. A shape that repeats more
+than QUERY_STATS_N_PLUS_ONE times in one request or job is logged as a likely
+N+1 (a query issued per row inside a loop).
+
+Opt-in, and free when disabled: the engine listeners are only registered when
+QUERY_STATS=1.
+
+    QUERY_STATS=1                Enable instrumentation
+    QUERY_STATS_HEADERS=1        Add X-Query-* headers to responses (also on in debug mode)
+    QUERY_STATS_N_PLUS_ONE=10    Repeats of one statement shape that count as N+1
+
+Requests are tracked automatically once init_query_stats(app) is called. Jobs
+wrap their work in track_queries():
+
+    with track_queries('jobs.calculate_tournament_scores'):
+        ...
+"""
+
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+QUERY_STATS_ENABLED = os.getenv('QUERY_STATS', '0') == '1'
+QUERY_STATS_HEADERS = os.getenv('QUERY_STATS_HEADERS', '0') == '1'
+N_PLUS_ONE_THRESHOLD = int(os.getenv('QUERY_STATS_N_PLUS_ONE', '10'))
+
+_current = contextvars.ContextVar('query_stats', default=None)
+_installed = False
+_install_lock = threading.Lock()
+
+_WHITESPACE = re.compile(r'\s+')
+_PARAM_LIST = re.compile(r'\(\s*(?:\?|%s|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|%\(\w+\)s))*\s*\)')
+_NUMBER = re.compile(r'\b\d+\b')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalize a SQL statement so repeats of the same query compare equal.
+    Collapses whitespace, literals and expanded IN (...) parameter lists.
+
+    Args:
+        statement (str): SQL as sent to the driver
+
+    Returns:
+        str: Normalized statement
+    """
+    shape = _WHITESPACE.sub(' ', statement).strip()
+    shape = _STRING.sub('?', shape)
+    shape = _NUMBER.sub('?', shape)
+    return _PARAM_LIST.sub('(?)', shape)
+
+
+class QueryStats:
+    """
+    Queries recorded for one request or job.
+
+    Args:
+        label (str): Request route or job name
+    """
+
+    def __init__(self, label: str):
+        self.label = label
+        self.count = 0
+        self.db_time = 0.0
+        self.shapes = Counter()
+        self.started = time.perf_counter()
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.db_time += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> list:
+        """Statement shapes issued at least threshold times, most frequent first."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    def to_dict(self) -> dict:
+        return {
+            'label': self.label,
+            'queries': self.count,
+            'db_ms': round(self.db_time * 1000, 3),
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 3),
+            'distinct_statements': len(self.shapes),
+            'max_repeats': max(self.shapes.values(), default=0),
+        }
+
+
+def current_stats():
+    """The QueryStats being recorded in this context, or None."""
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault('query_stats_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    started = conn.info.get('query_stats_started')
+    elapsed = time.perf_counter() - started.pop() if started else 0.0
+    stats.record(statement, elapsed)
+
+
+def install():
+    """Register the engine listeners (once per process). Called automatically when enabled."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        _installed = True
+
+
+def report(stats: QueryStats):
+    """Log a structured summary line, and a warning for every likely N+1 pattern."""
+    logger.info("query_stats %s", json.dumps(stats.to_dict()))
+    for shape, count in stats.repeated():
+        logger.warning("Possible N+1 in %s: %d x %s", stats.label, count, shape[:300])
+
+
+@contextlib.contextmanager
+def track_queries(label: str, enabled: bool = None):
+    """
+    Record the queries issued inside the block and report them when it exits.
+    Nested blocks are counted in the outermost one.
+
+    Args:
+        label (str): Name reported for the block, e.g. the job name
+        enabled (bool): Overrides QUERY_STATS, e.g. for benchmarks
+
+    Yields:
+        QueryStats: The stats being recorded, or None when disabled
+    """
+    enabled = QUERY_STATS_ENABLED if enabled is None else enabled
+    if not enabled or _current.get() is not None:
+        yield _current.get()
+        return
+
+    install()
+    stats = QueryStats(label)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+        report(stats)
+
+
+def init_query_stats(app):
+    """
+    Track the queries of every request to the app, if QUERY_STATS is enabled.
+
+    Args:
+        app: Flask app
+    """
+    if not QUERY_STATS_ENABLED:
+        return
+    install()
+    add_headers = QUERY_STATS_HEADERS or app.debug
+
+    @app.before_request
+    def _start_query_stats():
+        label = f"{request.method} {request.url_rule.rule if request.url_rule else request.path}"
+        stats = QueryStats(label)
+        g._query_stats = (stats, _current.set(stats))
+
+    @app.after_request
+    def _query_stats_headers(response):
+        entry = g.get('_query_stats')
+        if entry and add_headers:
+            stats = entry[0]
+            response.headers['X-Query-Count'] = str(stats.count)
+            response.headers['X-Query-Time-Ms'] = f"{stats.db_time * 1000:.3f}"
+            repeated = stats.repeated()
+            if repeated:
+                response.headers['X-Query-Max-Repeats'] = str(repeated[0][1])
+        return response
+
+    @app.teardown_request
+    def _finish_query_stats(exc):
+        entry = g.pop('_query_stats', None)
+        if entry:
+            stats, token = entry
+            _current.reset(token)
+            report(stats)
@@ -4,45 +4,48 @@ import os
 # Add the project root directory to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
 
+from pathlib import Path
+
 from models import Golfer
-from utils.db_connector import db
+from data_aggregator.datagolf.headshots import HEADSHOT_DIR, record_golfer_photos, update_photo_urls
+from utils.image_store import store_image
 
-def update_golfer_photos():
+def update_golfer_photos(headshot_dir=None):
     """
-    Updates all golfer photo URLs to point to their Google Cloud Storage headshots
+    Puts every downloaded headshot ({dg_id}_headshot.png, see data_aggregator/datagolf/headshots.py)
+    in the image store with its thumbnails, records them in golfer_photo, and updates
+    golfer photo URLs to point to their Google Cloud Storage headshots
+
+    Args:
+        headshot_dir (str): Where the headshots are, defaults to HEADSHOT_DIR
+
+    Returns:
+        int: Number of golfers whose photo URL changed
     """
-    try:
-        print("Starting golfer photo URL update...")
-        base_url = "https://storage.googleapis.com/golf-pickem.appspot.com/headshots"
-        
-        # Update all golfers with datagolf_ids in one query
-        update_query = """
-            UPDATE golfer 
-            SET photo_url = CONCAT(:base_url, '/', datagolf_id, '_headshot.png')
-            WHERE datagolf_id IS NOT NULL
-        """
-        
-        result = db.session.execute(
-            update_query,
-            {"base_url": base_url}
-        )
-        
-        db.session.commit()
-        updated_count = result.rowcount
-        print(f"Successfully updated {updated_count} golfer photos")
-        
-        # Verify a few random golfers
-        sample_golfers = Golfer.query.filter(Golfer.datagolf_id.isnot(None)).limit(3).all()
-        print("\nSample of updated golfers:")
-        for golfer in sample_golfers:
-            print(f"{golfer.full_name}: {golfer.photo_url}")
-            
-        return updated_count
-        
-    except Exception as e:
-        db.session.rollback()
-        print(f"Error updating golfer photos: {str(e)}")
-        raise
+    print("Starting golfer photo update...")
+    variants = {}
+    for path in sorted(Path(headshot_dir or HEADSHOT_DIR).glob('*_headshot.png')):
+        dg_id = path.name.split('_', 1)[0]
+        if dg_id.isdigit():
+            variants[int(dg_id)] = store_image(path.read_bytes())
+    print(f"Stored {len(variants)} headshots")
+
+    recorded = record_golfer_photos(variants)
+    print(f"Updated {recorded} golfer photos in the image store")
+
+    updated_count = update_photo_urls(variants)
+    print(f"Successfully updated {updated_count} golfer photo URLs")
+
+    # Verify a few random golfers
+    sample_golfers = Golfer.query.filter(Golfer.datagolf_id.isnot(None)).limit(3).all()
+    print("\nSample of updated golfers:")
+    for golfer in sample_golfers:
+        print(f"{golfer.full_name}: {golfer.photo_url}")
+
+    return updated_count
 
 if __name__ == "__main__":
-    update_golfer_photos()
+    from app import create_app
+
+    with create_app().app_context():
+        update_golfer_photos()
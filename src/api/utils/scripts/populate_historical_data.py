@@ -1,159 +1,203 @@
-import sys
+import argparse
+import json
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 from flask import Flask
-from models import Tournament, TournamentGolfer, Golfer
+from models import Tournament
 from utils.db_connector import db, init_db
 from data_aggregator.sportcontentapi.entries import get_entry_list
-from data_aggregator.sportcontentapi.leaderboard import get_tournament_leaderboard_clean
-from jobs.calculate_points.calculate_points import update_tournament_entries_and_results
+from data_aggregator.sportcontentapi.leaderboard import get_tournament_leaderboard_feed, extract_leaderboard
+from jobs.calculate_points.calculate_points import add_entry_list, ingest_tournament_results
+from utils.query_stats import track_queries
 
-app = Flask(__name__)
-init_db(app)
+BACKFILL_WORKERS = int(os.getenv('BACKFILL_WORKERS', 4))
+CHECKPOINT_PATH = os.getenv('BACKFILL_CHECKPOINT', 'historical_backfill.json')
 
+@track_queries('scripts.populate_single_tournament_entries')
 def populate_single_tournament_entries(tournament_id: int):
     """
     Populates entry list data for a single tournament given its ID.
-    
+
     Args:
         tournament_id (int): Internal database ID of the tournament
     """
-    with app.app_context():
-        # Get tournament to get its SportContent API ID
-        tournament = Tournament.query.get(tournament_id)
-        if not tournament:
-            print(f"Tournament with ID {tournament_id} not found")
+    # Get tournament to get its SportContent API ID
+    tournament = db.session.get(Tournament, tournament_id)
+    if not tournament:
+        print(f"Tournament with ID {tournament_id} not found")
+        return False
+
+    print(f"\nProcessing entries for tournament: {tournament.tournament_name}")
+
+    # Use the tournament's SportContent API ID to get entries
+    print("Fetching entry list...")
+    try:
+        entries = get_entry_list(tournament.sportcontent_api_id)
+        if not entries or 'results' not in entries:
+            print("No entry data found")
             return False
-            
-        print(f"\nProcessing entries for tournament: {tournament.tournament_name}")
-        
-        # Use the tournament's SportContent API ID to get entries
-        print("Fetching entry list...")
+
+        entry_list = entries['results']['entry_list']
+        print(f"Found {len(entry_list)} entries")
+
+        added = add_entry_list(tournament, entry_list)
+        db.session.commit()
+        print(f"\nSuccessfully processed {len(entry_list)} entries, added {added}")
+        return True
+
+    except Exception as e:
+        print(f"Error processing entries: {e}")
+        db.session.rollback()
+        return False
+
+def fetch_tournament_data(sportcontent_api_id: int) -> dict:
+    """
+    Fetches the entry list and leaderboard of a tournament. Makes no database
+    queries, so it can run in a worker thread.
+
+    Args:
+        sportcontent_api_id (int): SportContent API ID of the tournament
+
+    Returns:
+        dict: 'entries' and 'results' lists, None where the API had no data
+    """
+    entries = get_entry_list(sportcontent_api_id)
+    feed = get_tournament_leaderboard_feed(sportcontent_api_id)
+    return {
+        'entries': entries['results'].get('entry_list') if entries and 'results' in entries else None,
+        'results': extract_leaderboard(feed.data) if feed else None
+    }
+
+def load_checkpoint(path: str) -> set:
+    """IDs of the tournaments a previous backfill completed, empty if there is no checkpoint."""
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        return set(json.load(f).get('completed', []))
+
+def save_checkpoint(path: str, completed: set):
+    """Writes the completed tournament IDs, replacing the checkpoint atomically."""
+    if not path:
+        return
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump({'completed': sorted(completed), 'updated_at': datetime.now().isoformat()}, f)
+    os.replace(tmp, path)
+
+def _prefetch(tournaments: list, workers: int):
+    """
+    Yields (tournament, future) in order, keeping at most 2 * workers fetches in
+    flight so feeds are never downloaded far ahead of the writes.
+    """
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='backfill') as executor:
+        remaining = iter(tournaments)
+        pending = deque(
+            (tournament, executor.submit(fetch_tournament_data, tournament['sportcontent_api_id']))
+            for tournament in islice(remaining, workers * 2)
+        )
         try:
-            entries = get_entry_list(tournament.sportcontent_api_id)
-            if not entries or 'results' not in entries:
-                print("No entry data found")
-                return False
-                
-            entry_count = len(entries['results']['entry_list'])
-            print(f"Found {entry_count} entries")
-            
-            # Process each entry
-            for entry in entries['results']['entry_list']:
-                golfer_id = entry.get('player_id')
-                if not golfer_id:
-                    print(f"Missing player_id in entry: {entry}")
-                    continue
-                    
-                # Check if golfer exists by sportcontent_api_id
-                golfer = Golfer.query.filter_by(sportcontent_api_id=golfer_id).first()
-                
-                if not golfer:
-                    # Fallback to name matching if sportcontent_api_id fails
-                    first_name = entry.get('first_name', '').strip()
-                    last_name = entry.get('last_name', '').strip()
-                    
-                    if first_name and last_name:
-                        # Try exact name match first
-                        golfer = Golfer.query.filter(
-                            Golfer.first_name.ilike(first_name),
-                            Golfer.last_name.ilike(last_name)
-                        ).first()
-                        
-                        if golfer:
-                            print(f"Found golfer by name match: {golfer.full_name} "
-                                  f"(API ID: {golfer_id} -> DB ID: {golfer.sportcontent_api_id})")
-                        else:
-                            print(f"No match found for: {first_name} {last_name} (API ID: {golfer_id})")
-                            continue
-                    else:
-                        print(f"Missing name data for player_id: {golfer_id}")
-                        continue
-                
-                # Check if entry already exists
-                existing_entry = TournamentGolfer.query.filter_by(
-                    tournament_id=tournament.id,
-                    golfer_id=golfer.id,
-                    year=str(tournament.year)
-                ).first()
-                
-                if not existing_entry:
-                    # Create new entry
-                    new_entry = TournamentGolfer(
-                        tournament_id=tournament.id,
-                        golfer_id=golfer.id,
-                        year=str(tournament.year),
-                        is_active=True,
-                        is_most_recent=True
-                    )
-                    db.session.add(new_entry)
-                    print(f"Added entry for {golfer.full_name}")
-            
-            db.session.commit()
-            print(f"\nSuccessfully processed {entry_count} entries")
-            return True
-            
-        except Exception as e:
-            print(f"Error processing entries: {e}")
-            db.session.rollback()
-            return False
+            while pending:
+                tournament, future = pending.popleft()
+                upcoming = next(remaining, None)
+                if upcoming:
+                    pending.append((upcoming, executor.submit(fetch_tournament_data, upcoming['sportcontent_api_id'])))
+                yield tournament, future
+        finally:
+            for _, future in pending:
+                future.cancel()
 
-def populate_historical_data():
+@track_queries('scripts.backfill_tournament')
+def backfill_tournament(tournament_id: int, data: dict) -> dict:
     """
-    Populates historical tournament data for the current year.
-    Gets both field and results data for each tournament.
+    Writes the fetched entry list and results of one tournament in a single transaction.
+
+    Args:
+        tournament_id (int): ID of the tournament
+        data (dict): Output of fetch_tournament_data
+
+    Returns:
+        dict: Number of entries added and result row counts (see apply_result_rows)
     """
-    current_year = datetime.now().year
-    
-    with app.app_context():
-        # Get all tournaments for current year that have already finished
-        tournaments = Tournament.query.filter(
-            Tournament.year == current_year,
-            Tournament.end_date < datetime.now().date()
-        ).order_by(Tournament.start_date).all()
-        
-        print(f"Found {len(tournaments)} completed tournaments for {current_year}")
-        
-        for tournament in tournaments:
-            print(f"\nProcessing tournament: {tournament.tournament_name}")
-            
-            # Get and process entry list
-            print("Fetching entry list...")
-            try:
-                entries = get_entry_list(tournament.sportcontent_api_id)
-                if entries and 'results' in entries:
-                    print(f"Found {len(entries['results'])} entries")
-                else:
-                    print("No entry data found")
-            except Exception as e:
-                print(f"Error fetching entries: {e}")
-                continue
-            
-            # Get and process results
-            print("Fetching results...")
-            try:
-                success = update_tournament_entries_and_results(tournament.id)
-                if success:
-                    print("Successfully updated results")
-                else:
-                    print("Failed to update results")
-            except Exception as e:
-                print(f"Error updating results: {e}")
-                continue
-            
-            print(f"Completed processing for {tournament.tournament_name}")
-
-# if __name__ == "__main__":
-#     populate_historical_data()
+    tournament = db.session.get(Tournament, tournament_id)
+    try:
+        counts = {'entries': add_entry_list(tournament, data['entries']) if data['entries'] else 0}
+        if data['results']:
+            counts.update(ingest_tournament_results(tournament, data['results']))
+        db.session.commit()
+        return counts
+    except Exception:
+        db.session.rollback()
+        raise
+
+def backfill_historical_data(years: list = None, workers: int = BACKFILL_WORKERS,
+                             checkpoint_path: str = CHECKPOINT_PATH, force: bool = False) -> dict:
+    """
+    Populates entries and results for every completed tournament of the given years.
 
+    Runs unattended: entry lists and leaderboards are fetched by a pool of worker
+    threads (the provider client's rate limit applies across all of them) while
+    the calling thread writes each tournament, in calendar order, as its data
+    arrives. Completed tournaments are recorded in a checkpoint file, so an
+    interrupted backfill picks up where it stopped when it is run again.
 
-if __name__ == "__main__":
-    if len(sys.argv) > 1:
+    Args:
+        years (list): Seasons to backfill, all seasons if None
+        workers (int): Number of concurrent fetches
+        checkpoint_path (str): Checkpoint file, None to disable checkpointing
+        force (bool): If True, ignore the checkpoint and backfill every tournament again
+
+    Returns:
+        dict: Number of tournaments completed, failed and skipped (already in the checkpoint)
+    """
+    query = db.session.query(Tournament.id, Tournament.sportcontent_api_id, Tournament.tournament_name).filter(
+        Tournament.end_date < datetime.now().date(),
+        Tournament.sportcontent_api_id.isnot(None)
+    )
+    if years:
+        query = query.filter(Tournament.year.in_(years))
+    tournaments = [row._asdict() for row in query.order_by(Tournament.start_date, Tournament.id)]
+
+    completed = set() if force else load_checkpoint(checkpoint_path)
+    todo = [tournament for tournament in tournaments if tournament['id'] not in completed]
+    summary = {'completed': 0, 'failed': 0, 'skipped': len(tournaments) - len(todo)}
+    print(f"Found {len(tournaments)} completed tournaments, {len(todo)} to backfill "
+          f"with {workers} workers ({summary['skipped']} already done)")
+
+    for tournament, future in _prefetch(todo, workers):
+        name = tournament['tournament_name']
         try:
-            tournament_id = int(sys.argv[1])
-            print(f"Populating entries for tournament ID: {tournament_id}")
-            populate_single_tournament_entries(tournament_id)
-        except ValueError:
-            print("Please provide a valid tournament ID number")
-    else:
-        print("Please provide a tournament ID as an argument")
-        print("Usage: python populate_historical_data.py <tournament_id>")
\ No newline at end of file
+            counts = backfill_tournament(tournament['id'], future.result())
+        except Exception as e:
+            summary['failed'] += 1
+            print(f"✗ Failed to backfill {name}: {e}")
+            continue
+
+        completed.add(tournament['id'])
+        save_checkpoint(checkpoint_path, completed)
+        summary['completed'] += 1
+        print(f"✓ {name}: {counts}")
+
+    print(f"Backfill finished: {summary}")
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill entries and results of completed tournaments")
+    parser.add_argument('--tournament-id', type=int,
+                        help="Only populate the entry list of this tournament")
+    parser.add_argument('--years', type=int, nargs='*', default=[datetime.now().year],
+                        help="Seasons to backfill (default: current season, none given: all seasons)")
+    parser.add_argument('--workers', type=int, default=BACKFILL_WORKERS)
+    parser.add_argument('--checkpoint', default=CHECKPOINT_PATH)
+    parser.add_argument('--force', action='store_true', help="Ignore the checkpoint")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    init_db(app)
+    with app.app_context():
+        if args.tournament_id:
+            populate_single_tournament_entries(args.tournament_id)
+        else:
+            backfill_historical_data(args.years or None, args.workers, args.checkpoint, args.force)